@@ -0,0 +1,4 @@
+"""
+EVA benchmarks - latency harnesses for the voice pipeline
+Run a suite with: python -m benchmarks <suite> (or python -m benchmarks.<suite>); list them with python -m benchmarks
+"""
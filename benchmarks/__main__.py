@@ -0,0 +1,50 @@
+"""
+Benchmark entry point
+
+Usage:
+    python -m benchmarks                    # list suites
+    python -m benchmarks <suite> [args...]  # same as python -m benchmarks.<suite> [args...]
+"""
+import importlib
+import pkgutil
+import sys
+from pathlib import Path
+
+HELPERS = {'stats', 'fake_ollama'}  # shared modules, not suites
+
+
+def suites():
+    """Names of the benchmark modules in this package"""
+    return sorted(module.name for module in pkgutil.iter_modules([str(Path(__file__).parent)])
+                  if not module.name.startswith('_') and module.name not in HELPERS)
+
+
+def describe(name):
+    """First docstring line of a suite"""
+    try:
+        module = importlib.import_module(f"benchmarks.{name}")
+    except Exception as e:  # a suite whose optional dependencies are missing
+        return f"(unavailable: {e})"
+    return (module.__doc__ or '').strip().split('\n')[0]
+
+
+def main():
+    available = suites()
+    if len(sys.argv) < 2 or sys.argv[1] in ('-h', '--help'):
+        print(__doc__.strip())
+        print("\nSuites:")
+        for name in available:
+            print(f"  {name:<20} {describe(name)}")
+        return
+
+    name = sys.argv[1].replace('-', '_')
+    if name not in available:
+        print(f"Unknown suite '{sys.argv[1]}' (run python -m benchmarks for the list)")
+        sys.exit(2)
+    module = importlib.import_module(f"benchmarks.{name}")
+    sys.argv = [f"benchmarks.{name}"] + sys.argv[2:]
+    module.main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Model artifact load-time benchmark
+retrain      = what startup did when the file names didn't match (fit Model 1 in-process)
+pickle       = legacy command_classifier.pkl
+store        = ArtifactStore as pickle (small arrays) or joblib, with/without hash check and mmap
+The intent index shows an array-heavy artifact, where memory mapping pays off
+Everything is written to a temporary directory; the real model_weights are untouched
+
+Usage:
+    python -m benchmarks.artifact_load [--repeat 20]
+"""
+import argparse
+import os
+import pickle
+import tempfile
+import time
+from models.artifact_store import ArtifactStore
+from models.intent_matcher import IntentMatcher
+from train_models_complete import MODEL1_TRAINING_DATA, MODEL2_TRAINING_DATA, create_model1_pipeline
+from benchmarks.stats import summarize, format_ms
+
+
+def retrain():
+    pipeline = create_model1_pipeline()
+    pipeline.fit([text for text, _ in MODEL1_TRAINING_DATA], [label for _, label in MODEL1_TRAINING_DATA])
+    return pipeline
+
+
+def measure(load, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        load()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark model artifact load time")
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    pipeline = retrain()
+    probe = [text for text, _ in MODEL1_TRAINING_DATA[:50]]
+    expected = list(pipeline.predict(probe))
+
+    with tempfile.TemporaryDirectory() as root:
+        pickle_path = os.path.join(root, 'command_classifier.pkl')
+        with open(pickle_path, 'wb') as f:
+            pickle.dump(pipeline, f)
+
+        pickled = ArtifactStore(root=os.path.join(root, 'auto'))  # small arrays -> plain pickle
+        forced = ArtifactStore(root=os.path.join(root, 'joblib'), mmap_min_bytes=0)
+        for store in (pickled, forced):
+            store.save('command_classifier', pipeline)
+            store.save('step_rules', MODEL2_TRAINING_DATA)
+
+        def load_pickle():
+            with open(pickle_path, 'rb') as f:
+                return pickle.load(f)
+
+        stores = {
+            'store pickle': ArtifactStore(root=pickled.root),
+            'store pickle -hash': ArtifactStore(root=pickled.root, verify=False),
+            'store joblib mmap': ArtifactStore(root=forced.root),
+            'store joblib': ArtifactStore(root=forced.root, mmap_mode=None),
+        }
+        for label, store in stores.items():
+            if list(store.load('command_classifier').predict(probe)) != expected:
+                print(f"⚠️ {label}: predictions differ from the trained pipeline")
+
+        print(f"Model 1 ({os.path.getsize(pickle_path) / 1024:.0f} KB pickled), {args.repeat} loads each")
+        print(f"{'retrain':<20} {format_ms(summarize(measure(retrain, max(1, args.repeat // 4))))}")
+        print(f"{'legacy pickle':<20} {format_ms(summarize(measure(load_pickle, args.repeat)))}")
+        for label, store in stores.items():
+            print(f"{label:<20} {format_ms(summarize(measure(lambda: store.load('command_classifier'), args.repeat)))}")
+
+        print("\nStep rules")
+        for label, store in stores.items():
+            print(f"{label:<20} {format_ms(summarize(measure(lambda: store.load('step_rules'), args.repeat)))}")
+
+        # Array-heavy artifact: the nearest-phrase index (stored with joblib, memory-mapped)
+        start = time.perf_counter()
+        matcher = IntentMatcher.from_training_data()
+        build_seconds = time.perf_counter() - start
+        index = {'matrix': matcher.matrix[:matcher.size], 'idf': matcher.idf,
+                 'texts': matcher.texts, 'categories': matcher.categories, 'actions': matcher.actions}
+        large = ArtifactStore(root=os.path.join(root, 'large'))
+        large.save('intent_index', index)
+        entry = large.entry('intent_index')
+        print(f"\nIntent index ({entry['array_bytes'] / 1e6:.1f} MB arrays, stored as {entry['format']}), "
+              f"rebuilt in {build_seconds * 1000:.1f}ms")
+        variants = {
+            'mmap': ArtifactStore(root=large.root, verify=False),
+            'mmap+hash': ArtifactStore(root=large.root),
+            'in-memory': ArtifactStore(root=large.root, mmap_mode=None, verify=False),
+        }
+        for label, store in variants.items():
+            print(f"{label:<20} {format_ms(summarize(measure(lambda: store.load('intent_index'), args.repeat)))}")
+
+
+if __name__ == "__main__":
+    main()
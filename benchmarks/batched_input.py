@@ -0,0 +1,102 @@
+"""
+Batched input benchmark - SendInput calls and wall time for typing and chords
+Runs against the recording stub (non-Windows build of executor.c), which logs events
+instead of injecting them; build it first with `make -C execution/c_executors`
+paced 20ms = the old keyboard_type_string (Sleep(20) after every key down and up)
+batched    = keyboard_type_string_paced(text, 0), one SendInput for the whole string
+The repo has no test suite, so the event checks live here and exit non-zero on failure
+
+Usage:
+    python -m benchmarks.batched_input [--repeat 20]
+"""
+import argparse
+import sys
+import time
+from execution.executor_bridge import ExecutorBridge
+from execution.input_backends import CtypesBackend, KEYEVENTF_KEYUP, KEYEVENTF_UNICODE
+from benchmarks.stats import summarize, format_ms, format_us
+
+QUERY = "python asyncio tutorial for beginners 2024"  # 40+ characters
+KEYBOARD = 1
+
+
+def typed(events):
+    """Text produced by recorded KEYEVENTF_UNICODE key downs"""
+    units = b''.join(code.to_bytes(2, 'little') for kind, code, flags in events
+                     if kind == KEYBOARD and flags & KEYEVENTF_UNICODE and not flags & KEYEVENTF_KEYUP)
+    return units.decode('utf-16-le')
+
+
+def check(bridge, backend):
+    failures = 0
+
+    def expect(label, ok, detail):
+        nonlocal failures
+        if not ok:
+            print(f"FAIL {label}: {detail}")
+            failures += 1
+
+    text = "héllo wörld 🎉"
+    backend.reset_recording()
+    bridge.type_text(text, pace_ms=0)
+    events = backend.recorded_events()
+    expect("unicode string", typed(events) == text, f"typed {typed(events)!r}")
+    expect("string in one call", backend.recorded_calls() == 1,
+           f"{backend.recorded_calls()} SendInput calls")
+
+    backend.reset_recording()
+    bridge.press_keys('ctrl+l')
+    events = [(code, flags & KEYEVENTF_KEYUP) for _, code, flags in backend.recorded_events()]
+    expect("ctrl+l chord", events == [(0x11, 0), (0x4C, 0), (0x4C, KEYEVENTF_KEYUP), (0x11, KEYEVENTF_KEYUP)],
+           f"events {events}")
+
+    backend.reset_recording()
+    result = bridge.press_keys('ctrl+nosuchkey')
+    expect("unknown key", not result['success'] and not backend.recorded_events(), f"{result}")
+
+    backend.reset_recording()
+    bridge.execute_batch([('PRESS_KEY', {}, {'key': 'ctrl+l'}), ('TYPE_TEXT', {}, {'text': 'github.com'}),
+                          ('PRESS_KEY', {}, {'key': 'enter'})])
+    events = backend.recorded_events()
+    expect("plan batch in one call", backend.recorded_calls() == 1,
+           f"{backend.recorded_calls()} SendInput calls")
+    expect("plan batch events", len(events) == 4 + 2 * len('github.com') + 2 and typed(events) == 'github.com',
+           f"{len(events)} events, typed {typed(events)!r}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched SendInput typing")
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    try:
+        backend = CtypesBackend()
+    except OSError as e:
+        backend = None
+        print(f"{e}")
+    if backend is None or not backend.batched or not backend.recording:
+        print("Needs the recording build of executor.c: make -C execution/c_executors")
+        sys.exit(1)
+    bridge = ExecutorBridge(backend=backend)
+
+    failures = check(bridge, backend)
+    print(f"event checks: {'OK' if not failures else f'{failures} failures'}\n")
+
+    print(f"typing {len(QUERY)} characters")
+    for label, pace_ms, repeat in (('paced 20ms (old)', 20, 1), ('paced 1ms', 1, 3), ('batched', 0, args.repeat)):
+        samples = []
+        for _ in range(repeat):
+            backend.reset_recording()
+            start = time.perf_counter()
+            bridge.type_text(QUERY, pace_ms=pace_ms)
+            samples.append(time.perf_counter() - start)
+        calls = backend.recorded_calls()
+        summary = summarize(samples)
+        print(f"{label:<18} {calls:>4} SendInput calls  {(format_ms if pace_ms else format_us)(summary)}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Classifier evaluation - accuracy, confusion matrix and latency over MODEL1_TRAINING_DATA
+Uses classify_batch (bounded concurrency, results in input order). Model 1 is trained on
+this same data, so tiered accuracy is optimistic - see classifier_tiers for a held-out split
+
+Usage:
+    python -m benchmarks.classifier_eval                      # tiered classifier, real Ollama
+    python -m benchmarks.classifier_eval --mode llm --workers 4
+    python -m benchmarks.classifier_eval --fake --limit 100   # fake Ollama server
+"""
+import argparse
+import time
+from collections import Counter
+import config
+from models.semantic_classifier import SemanticClassifier
+from models.tiered_classifier import TieredClassifier
+from train_models_complete import MODEL1_TRAINING_DATA
+from benchmarks.fake_ollama import FakeOllamaServer
+from benchmarks.stats import summarize, format_ms
+
+CATEGORIES = ['APP_LAUNCH', 'SYSTEM_ACTION', 'IN_APP_ACTION', 'WEB_ACTION']
+
+
+def confusion_matrix(labels, predictions):
+    """Counter keyed by (actual, predicted); unknown predictions map to OTHER"""
+    return Counter((actual, predicted if predicted in CATEGORIES else 'OTHER')
+                   for actual, predicted in zip(labels, predictions))
+
+
+def print_confusion(matrix):
+    columns = CATEGORIES + (['OTHER'] if any(predicted == 'OTHER' for _, predicted in matrix) else [])
+    width = max(len(name) for name in CATEGORIES) + 2
+    print("actual \\ predicted".ljust(width) + "".join(name[:13].rjust(15) for name in columns))
+    for actual in CATEGORIES:
+        print(actual.ljust(width) + "".join(str(matrix[(actual, predicted)]).rjust(15) for predicted in columns))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate the command classifier on MODEL1_TRAINING_DATA")
+    parser.add_argument('--mode', choices=['tiered', 'llm'], default='tiered')
+    parser.add_argument('--workers', type=int, default=config.CLASSIFIER_BATCH_WORKERS)
+    parser.add_argument('--limit', type=int, default=0, help="Evaluate only the first N examples")
+    parser.add_argument('--host', default=config.OLLAMA_HOST)
+    parser.add_argument('--fake', action='store_true', help="Run against the fake Ollama server")
+    args = parser.parse_args()
+
+    data = MODEL1_TRAINING_DATA[:args.limit] if args.limit else MODEL1_TRAINING_DATA
+    texts = [text for text, _ in data]
+    labels = [label for _, label in data]
+
+    server = FakeOllamaServer(load_seconds=0.0).start() if args.fake else None
+    host = server.url if server else args.host
+    try:
+        llm = SemanticClassifier(host=host)
+        classifier = TieredClassifier(llm) if args.mode == 'tiered' else llm
+
+        timings = []
+        start = time.perf_counter()
+        results = classifier.classify_batch(texts, max_workers=args.workers, timings=timings)
+        wall = time.perf_counter() - start
+
+        predictions = [result.get('category') for result in results]
+        correct = sum(p == l for p, l in zip(predictions, labels))
+        print(f"\n{args.mode} classifier on {len(texts)} examples ({args.workers} workers, {host})")
+        print(f"accuracy: {correct}/{len(texts)} = {correct / len(texts) * 100:.1f}%")
+        print(f"latency:  {format_ms(summarize(timings))}")
+        print(f"wall:     {wall:.2f}s ({len(texts) / wall:.1f} commands/s)\n")
+        print_confusion(confusion_matrix(labels, predictions))
+
+        if args.mode == 'tiered':
+            stats = classifier.get_stats()
+            print("\n" + "  ".join(f"{tier}: {stats[tier]['hits']} ({stats[tier]['hit_rate'] * 100:.0f}%)"
+                                   for tier in TieredClassifier.TIERS))
+        llm.close()
+    finally:
+        if server:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Input event counts per command, through ActionRouter and ExecutorBridge as EVA runs them
+recorder = RecordingBackend (in-memory, timestamped events)
+ctypes   = recording build of executor.c (make -C execution/c_executors), when present
+Both backends must produce the expected key/mouse event counts; the repo has no test
+suite, so this exits non-zero on a mismatch
+
+Usage:
+    python -m benchmarks.command_input
+"""
+import logging
+import sys
+import time
+from execution.action_router import ActionRouter
+from execution.executor_bridge import ExecutorBridge
+from execution.input_backends import CtypesBackend, RecordingBackend
+from execution.system_executor import SystemExecutor
+from models.step_generator import StepGenerator
+
+# (category, raw command, entities, expected events) - a key down and up per character/key
+COMMANDS = [
+    ('APP_LAUNCH', 'open notepad', {'app_name': 'notepad', 'action': 'launch'}, 2 + 2 * len('notepad') + 2),
+    ('WEB_ACTION', 'search for python', {'action': 'search'}, 4 + 2 * len('python') + 2),
+    ('IN_APP_ACTION', 'close this window', {'action': 'close'}, 4),
+    ('IN_APP_ACTION', 'type hello world', {'action': 'type'}, 2 * len('hello world')),
+    ('IN_APP_ACTION', 'click', {'action': 'click'}, 2),
+]
+
+
+def run(router, generator, category, text, entities):
+    classification = {'category': category, 'action': entities.get('action', ''), 'raw_command': text}
+    steps = generator.generate({'classification': classification, 'entities': entities, 'raw_command': text})
+    return router.execute(category, steps, entities, text, classification)
+
+
+def main():
+    logging.getLogger().setLevel(logging.WARNING)
+    for name in ("StepGenerator", "ActionRouter", "SystemExecutor", "ExecutorBridge", "PlanExecutor"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    generator = StepGenerator()
+    generator.create_default_rules()
+    generator.compile_templates()
+
+    recorder = RecordingBackend()
+    backends = {'recorder': (recorder, lambda: len(recorder.events), lambda: recorder.calls, recorder.reset)}
+    try:
+        native = CtypesBackend()
+        if native.recording:
+            backends['ctypes'] = (native, lambda: len(native.recorded_events()), native.recorded_calls,
+                                  native.reset_recording)
+    except OSError as e:
+        print(f"ctypes backend skipped: {e}")
+
+    failures = 0
+    print(f"{'command':<22} {'backend':<9} {'events':>6} {'calls':>5} {'input span':>11} {'wall':>9}")
+    for name, (backend, count, calls, reset) in backends.items():
+        router = ActionRouter(SystemExecutor(ExecutorBridge(backend=backend)), screenshot_handler=None)
+        for category, text, entities, expected in COMMANDS:
+            reset()
+            start = time.perf_counter()
+            result = run(router, generator, category, text, entities)
+            wall = time.perf_counter() - start
+            span = ''
+            if backend is recorder and recorder.events:
+                span = f"{(recorder.events[-1].time - recorder.events[0].time) * 1000:.2f}ms"
+            print(f"{text:<22} {name:<9} {count():>6} {calls():>5} {span:>11} {wall * 1000:7.1f}ms")
+            if not result.get('success') or count() != expected:
+                print(f"FAIL {name} '{text}': {count()} events (expected {expected}), result {result}")
+                failures += 1
+
+    print(f"\nevent checks: {'OK' if not failures else f'{failures} failures'}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Execution layer benchmark - p50/p95/p99 per action and where the time goes
+Drives ExecutorBridge, PlanExecutor, ActionRouter and SystemExecutor through the in-memory
+recorder ("mock") and the C executor library when it loads ("ctypes"; on Linux that is the
+recording stub build, so the numbers are the Python + ctypes overhead without real input).
+Every time.sleep and subprocess.run made from EVA's own code inside an action is counted with
+its call site; actions whose fixed sleeps are most of their wall time are flagged
+(sleeps inside the C library, e.g. mouse_click's Sleep(50), only show up in the latency)
+
+Usage:
+    python -m benchmarks execution_layer [--runs 5] [--sleep-share 0.5] [--backend mock|ctypes|all]
+"""
+import argparse
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from execution.action_router import ActionRouter
+from execution.executor_bridge import ExecutorBridge
+from execution.input_backends import CtypesBackend, RecordingBackend
+from execution.plan_executor import PlanExecutor
+from execution.system_controls import create_audio_endpoint, create_brightness_provider
+from execution.system_executor import SystemExecutor
+from models.step_generator import StepGenerator
+from benchmarks.stats import summarize
+
+QUERY = "python asyncio tutorial for beginners 2024"
+REPO_ROOT = str(Path(__file__).resolve().parent.parent)
+
+
+class Instrument:
+    """Counts time.sleep and subprocess.run calls (with call sites) made inside a `with` block"""
+
+    def __init__(self):
+        self.sleeps = []  # (call site, seconds)
+        self.spawns = []  # (call site, program)
+
+    @staticmethod
+    def _site():
+        """file:line of the caller, or None outside the repo (e.g. subprocess's own polling)"""
+        frame = sys._getframe(2)
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if not filename.startswith(REPO_ROOT):
+            return None
+        return f"{os.path.basename(filename)}:{frame.f_lineno}"
+
+    def __enter__(self):
+        self._sleep, self._run = time.sleep, subprocess.run
+
+        def sleep(seconds):
+            site = self._site()
+            if site:
+                self.sleeps.append((site, seconds))
+            self._sleep(seconds)
+
+        def run(args, *rest, **kwargs):
+            program = args[0] if isinstance(args, (list, tuple)) else str(args).split()[0]
+            self.spawns.append((self._site() or '?', program))
+            return self._run(args, *rest, **kwargs)
+
+        time.sleep, subprocess.run = sleep, run
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        time.sleep, subprocess.run = self._sleep, self._run
+        return False
+
+
+def actions(bridge):
+    """(name, callable) pairs exercising the execution layer"""
+    preference = 'auto' if platform.system() == 'Windows' else 'fake'  # 'auto' has no handles elsewhere
+    system = SystemExecutor(bridge, audio=create_audio_endpoint(preference),
+                            brightness=create_brightness_provider(preference))
+    router = ActionRouter(system, screenshot_handler=None)
+    generator = StepGenerator()
+    generator.create_default_rules()
+    generator.compile_templates()
+    launch_plan = generator.generate({'classification': {'category': 'APP_LAUNCH', 'action': 'launch'},
+                                      'entities': {'app_name': 'notepad'}, 'raw_command': 'open notepad'})
+    plans = PlanExecutor(bridge)
+    return [
+        ('launch_application', lambda: bridge.launch_application('notepad')),
+        ('plan APP_LAUNCH', lambda: plans.run(launch_plan, 'APP_LAUNCH')),
+        ('TYPE_TEXT', lambda: bridge.execute_action('TYPE_TEXT', {}, {'text': QUERY})),
+        ('PRESS_KEY ctrl+l', lambda: bridge.execute_action('PRESS_KEY', {}, {'key': 'ctrl+l'})),
+        ('MOUSE_CLICK at x,y', lambda: bridge.execute_action('MOUSE_CLICK', {'x': 100, 'y': 100}, {'button': 'left'})),
+        ('router close window', lambda: router.execute('IN_APP_ACTION', [], {'action': 'close'}, 'close window', {})),
+        ('set_volume', lambda: system.set_volume(40)),
+        ('router volume up', lambda: router.execute('SYSTEM_ACTION', [], {}, 'increase volume',
+                                                    {'category': 'SYSTEM_ACTION', 'action': 'set_volume'})),
+        ('set_brightness', lambda: system.set_brightness(60)),
+    ]
+
+
+def measure(action, runs):
+    samples, ok = [], 0
+    instrument = Instrument()
+    for _ in range(runs):
+        with instrument:
+            start = time.perf_counter()
+            result = action()
+            samples.append(time.perf_counter() - start)
+        ok += bool(result and result.get('success'))
+    return samples, ok, instrument
+
+
+def fmt(seconds):
+    return f"{seconds * 1000:.1f}ms" if seconds >= 0.001 else f"{seconds * 1e6:.0f}us"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the execution layer")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--sleep-share', type=float, default=0.5,
+                        help="Flag actions whose fixed sleeps are at least this share of wall time")
+    parser.add_argument('--backend', choices=('mock', 'ctypes', 'all'), default='all')
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.ERROR)
+    for name in ("StepGenerator", "ActionRouter", "SystemExecutor", "ExecutorBridge", "PlanExecutor", "InputBackend"):
+        logging.getLogger(name).setLevel(logging.CRITICAL)
+
+    backends = {}
+    if args.backend in ('mock', 'all'):
+        backends['mock'] = RecordingBackend()
+    if args.backend in ('ctypes', 'all'):
+        try:
+            native = CtypesBackend()
+            backends['ctypes (stub)' if native.recording else 'ctypes'] = native
+        except OSError as e:
+            print(f"ctypes backend skipped: {e}")
+
+    flagged = []
+    print(f"{'action':<20} {'backend':<14} {'ok':>5} {'p50':>9} {'p95':>9} {'p99':>9} {'sleep':>6} {'spawns':>6}")
+    for label, backend in backends.items():
+        for name, action in actions(ExecutorBridge(backend=backend)):
+            samples, ok, instrument = measure(action, args.runs)
+            summary = summarize(samples)
+            slept = sum(seconds for _, seconds in instrument.sleeps)
+            share = slept / sum(samples) if sum(samples) else 0.0
+            print(f"{name:<20} {label:<14} {ok:>2}/{args.runs:<2} {fmt(summary['p50']):>9} {fmt(summary['p95']):>9} "
+                  f"{fmt(summary['p99']):>9} {share * 100:5.0f}% {len(instrument.spawns) / args.runs:6.1f}")
+            if share >= args.sleep_share:
+                flagged.append((name, label, share, instrument))
+
+    if flagged:
+        print(f"\n⚠️ Fixed sleeps are ≥{args.sleep_share * 100:.0f}% of wall time:")
+        for name, label, share, instrument in flagged:
+            sites = Counter()
+            for site, seconds in instrument.sleeps:
+                sites[(site, seconds)] += 1
+            detail = ', '.join(f"{site} sleep({seconds:g})×{count / args.runs:g}"
+                               for (site, seconds), count in sites.most_common(4))
+            print(f"  {name} [{label}] {share * 100:.0f}%: {detail}")
+
+
+if __name__ == "__main__":
+    main()
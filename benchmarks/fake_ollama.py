@@ -0,0 +1,307 @@
+"""
+Local stand-in for the Ollama HTTP API (/api/tags, /api/generate)
+Simulates model load, prompt evaluation and per-token generation latency (blocking or
+NDJSON streaming) so the classifier client can be exercised and benchmarked without a
+GPU or Mistral
+
+Usage:
+    python -m benchmarks.fake_ollama --port 11434
+"""
+import argparse
+import json
+import re
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Keyword rules mirroring the classifier prompt's examples
+_RULES = [
+    (r'\b(volume|brightness|mute|unmute|shutdown|restart|lock)\b', "SYSTEM_ACTION", "system"),
+    (r'\b(search|google|look up|go to|browse)\b', "WEB_ACTION", "search"),
+    (r'\b(open|launch|start)\b', "APP_LAUNCH", "launch"),
+]
+_COMMAND = re.compile(r'USER COMMAND: "(.*?)"', re.DOTALL)
+
+
+def default_responder(prompt):
+    """Classification JSON for the command in the prompt, followed by chatter a real model often adds"""
+    match = _COMMAND.search(prompt)
+    command = match.group(1).lower() if match else prompt.lower()
+    category, action = "IN_APP_ACTION", (command.split() or ["unknown"])[0]
+    for pattern, rule_category, rule_action in _RULES:
+        if re.search(pattern, command):
+            category, action = rule_category, rule_action
+            break
+    answer = json.dumps({"category": category, "confidence": 0.9, "action": action})
+    return answer + "\n\nThe command was classified based on its main verb and the target it refers to."
+
+
+def parse_duration(value):
+    """Ollama keep_alive value → seconds (None = forever)"""
+    if value is None:
+        return 300.0  # Ollama default: 5 minutes
+    if isinstance(value, (int, float)):
+        return None if value < 0 else float(value)
+    match = re.fullmatch(r'(-?\d+(?:\.\d+)?)(ms|s|m|h)?', str(value).strip())
+    if not match:
+        return 300.0
+    number = float(match.group(1))
+    if number < 0:
+        return None
+    return number * {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600, None: 1}[match.group(2)]
+
+
+def _common_prefix(a, b):
+    count = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        count += 1
+    return count
+
+
+class FakeOllamaServer:
+    """Threaded HTTP/1.1 server (keep-alive capable) with simulated model timing"""
+
+    def __init__(self, host="127.0.0.1", port=0, responder=default_responder,
+                 load_seconds=0.5, prompt_seconds_per_token=0.0002, token_seconds=0.01,
+                 prefix_cache=True):
+        """
+        Args:
+            host, port: Bind address (port 0 = pick a free port)
+            responder: Callable prompt -> full response text
+            load_seconds: Simulated model load when the model isn't resident
+            prompt_seconds_per_token: Simulated prompt evaluation cost
+            token_seconds: Simulated generation cost per output token
+            prefix_cache: Reuse the previous request's evaluated prefix (Ollama's KV cache)
+        """
+        self.responder = responder
+        self.load_seconds = load_seconds
+        self.prompt_seconds_per_token = prompt_seconds_per_token
+        self.token_seconds = token_seconds
+
+        self.lock = threading.Lock()
+        self.counters = {'connections': 0, 'requests': 0, 'generate': 0, 'loads': 0,
+                         'tokens_requested': 0, 'tokens_generated': 0, 'cancelled': 0,
+                         'prompt_tokens': 0, 'prompt_tokens_evaluated': 0, 'prompt_eval_seconds': 0.0}
+        self.loaded_until = {}  # model -> monotonic expiry (None = forever)
+        self.prefix_cache = prefix_cache
+        self.kv_cache = {}  # model -> token ids of the last evaluated sequence
+        self.vocab = {}  # word -> token id (one "token" per whitespace-separated word)
+
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="FakeOllama", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread:
+            self.thread.join(timeout=2)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def unload(self, model=None):
+        """Drop resident models (simulates Ollama's keep-alive expiry)"""
+        with self.lock:
+            if model is None:
+                self.loaded_until.clear()
+            else:
+                self.loaded_until.pop(model, None)
+
+    def _ensure_loaded(self, model, keep_alive):
+        """Sleep for the load cost if the model isn't resident; returns load seconds"""
+        now = time.monotonic()
+        with self.lock:
+            resident = model in self.loaded_until and (
+                self.loaded_until[model] is None or self.loaded_until[model] > now)
+            if not resident:
+                self.counters['loads'] += 1
+                self.kv_cache.pop(model, None)  # a fresh load starts with an empty KV cache
+        load = 0.0 if resident else self.load_seconds
+        if load:
+            time.sleep(load)
+
+        ttl = parse_duration(keep_alive)
+        with self.lock:
+            self.loaded_until[model] = None if ttl is None else time.monotonic() + ttl
+        return load
+
+    def _prepare(self, body):
+        """Load + prompt evaluation; returns (final stats dict, output tokens)"""
+        model = body.get('model', 'mistral')
+        prompt = body.get('prompt')
+        load = self._ensure_loaded(model, body.get('keep_alive'))
+        if not prompt:
+            return {'model': model, 'response': '', 'done': True, 'done_reason': 'load',
+                    'load_duration': int(load * 1e9)}, []
+
+        # Like Ollama's runner, only tokens after the longest prefix shared with the previous
+        # request's sequence (KV cache) are evaluated; "context" tokens are prepended as-is
+        sequence = list(body.get('context') or []) + self._token_ids(prompt.split())
+        with self.lock:
+            cached = _common_prefix(self.kv_cache.get(model, []), sequence) if self.prefix_cache else 0
+            self.kv_cache[model] = sequence
+        evaluated = len(sequence) - cached
+        prompt_eval = evaluated * self.prompt_seconds_per_token
+        time.sleep(prompt_eval)
+
+        # The fake has no chat template, so raw prompts are answered from the text it can see
+        tokens = re.findall(r'\S+\s*', self.responder(self._detokenize(sequence) if body.get('context') else prompt))
+        num_predict = (body.get('options') or {}).get('num_predict')
+        if num_predict is not None and num_predict >= 0:
+            tokens = tokens[:num_predict]
+        with self.lock:
+            self.counters['tokens_requested'] += len(tokens)
+            self.counters['prompt_tokens'] += len(sequence)
+            self.counters['prompt_tokens_evaluated'] += evaluated
+            self.counters['prompt_eval_seconds'] += prompt_eval
+        return {
+            'model': model,
+            'response': '',
+            'done': True,
+            'done_reason': 'stop',
+            'context': sequence + self._token_ids(tokens),
+            'load_duration': int(load * 1e9),
+            'prompt_eval_count': evaluated,
+            'prompt_eval_duration': int(prompt_eval * 1e9),
+            'eval_count': len(tokens),
+            'eval_duration': int(len(tokens) * self.token_seconds * 1e9)
+        }, tokens
+
+    def _token_ids(self, words):
+        with self.lock:
+            return [self.vocab.setdefault(word.strip(), len(self.vocab)) for word in words]
+
+    def _detokenize(self, ids):
+        with self.lock:
+            words = {index: word for word, index in self.vocab.items()}
+        return " ".join(words.get(index, '') for index in ids)
+
+    def _generate(self, body):
+        final, tokens = self._prepare(body)
+        time.sleep(len(tokens) * self.token_seconds)
+        with self.lock:
+            self.counters['tokens_generated'] += len(tokens)
+        final['response'] = "".join(tokens)
+        return final
+
+    def _generate_stream(self, body, write):
+        """Emit one NDJSON chunk per token; stops early if the client disconnects"""
+        final, tokens = self._prepare(body)
+        model = final['model']
+        for token in tokens:
+            time.sleep(self.token_seconds)
+            try:
+                write({'model': model, 'response': token, 'done': False})
+            except (BrokenPipeError, ConnectionResetError):
+                with self.lock:
+                    self.counters['cancelled'] += 1
+                return False
+            with self.lock:
+                self.counters['tokens_generated'] += 1
+        write(final)
+        return True
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive: one handler instance per TCP connection
+
+            def setup(self):
+                super().setup()
+                # Headers and body go out in separate writes - without this, Nagle + delayed ACK
+                # adds ~40 ms to every reused connection (Go's net/http, which Ollama uses, sets it too)
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                with server.lock:
+                    server.counters['connections'] += 1
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, payload, status=200):
+                data = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                with server.lock:
+                    server.counters['requests'] += 1
+                if self.path == "/api/tags":
+                    self._send_json({'models': [{'name': 'mistral:latest'}]})
+                else:
+                    self._send_json({'error': 'not found'}, status=404)
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length) or b'{}')
+                with server.lock:
+                    server.counters['requests'] += 1
+                if self.path != "/api/generate":
+                    self._send_json({'error': 'not found'}, status=404)
+                    return
+                with server.lock:
+                    server.counters['generate'] += 1
+                if body.get('stream', True):  # Ollama streams unless told not to
+                    self._send_stream(body)
+                else:
+                    self._send_json(server._generate(body))
+
+            def _send_stream(self, body):
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+
+                def write(payload):
+                    data = (json.dumps(payload) + "\n").encode('utf-8')
+                    self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b"\r\n")
+                    self.wfile.flush()
+
+                if server._generate_stream(body, write):
+                    self.wfile.write(b"0\r\n\r\n")
+                else:
+                    self.close_connection = True
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Ollama server for offline testing")
+    parser.add_argument('--port', type=int, default=11434)
+    parser.add_argument('--load-seconds', type=float, default=0.5)
+    parser.add_argument('--token-seconds', type=float, default=0.01)
+    args = parser.parse_args()
+
+    server = FakeOllamaServer(port=args.port, load_seconds=args.load_seconds, token_seconds=args.token_seconds)
+    print(f"Fake Ollama listening on {server.url} (Ctrl+C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Intent matcher benchmark - nearest-phrase lookup vs Model 1 (NB pipeline) vs the LLM
+All three see the same held-out split of MODEL1_TRAINING_DATA; the matcher and Model 1
+are built from the rest. The "learned" pass adds half the held-out commands as confirmed
+history and re-evaluates the other half, the way a session feeds the matcher
+
+Usage:
+    python -m benchmarks.intent_matcher [--holdout 0.3] [--threshold 0.5] [--host URL]
+"""
+import argparse
+import time
+import config
+from models.intent_matcher import IntentMatcher
+from models.semantic_classifier import SemanticClassifier
+from models.tiered_classifier import infer_action
+from train_models_complete import MODEL1_TRAINING_DATA, create_model1_pipeline
+from benchmarks.classifier_tiers import split
+from benchmarks.fake_ollama import FakeOllamaServer
+from benchmarks.stats import summarize, format_ms
+
+
+def evaluate(classify, test):
+    """(latencies, correct, answered) for classify(text) -> category or None"""
+    latencies, correct, answered = [], 0, 0
+    for text, label in test:
+        start = time.perf_counter()
+        category = classify(text)
+        latencies.append(time.perf_counter() - start)
+        if category is not None:
+            answered += 1
+            correct += category == label
+    return latencies, correct, answered
+
+
+def report(label, test, latencies, correct, answered):
+    accuracy = correct / answered if answered else 0.0
+    print(f"{label:<16} answered {answered / len(test) * 100:5.1f}%  accuracy {accuracy * 100:5.1f}%  "
+          f"{format_ms(summarize(latencies))}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the nearest-phrase intent matcher")
+    parser.add_argument('--holdout', type=float, default=0.3, help="Fraction of the data used for evaluation")
+    parser.add_argument('--threshold', type=float, default=config.INTENT_MATCH_THRESHOLD)
+    parser.add_argument('--host', help="Real Ollama URL (default: start the fake server)")
+    args = parser.parse_args()
+
+    train, test = split(MODEL1_TRAINING_DATA, args.holdout)
+
+    start = time.perf_counter()
+    matcher = IntentMatcher((text, label, infer_action(label, text.lower())) for text, label in train)
+    print(f"{len(train)} train / {len(test)} held-out commands, matcher built in "
+          f"{(time.perf_counter() - start) * 1000:.1f}ms")
+
+    def nearest(text):
+        match = matcher.match(text)
+        return match['category'] if match and match['similarity'] >= args.threshold else None
+
+    report("nearest (top-1)", test, *evaluate(lambda text: (matcher.match(text) or {}).get('category'), test))
+    report(f"nearest >= {args.threshold:.2f}", test, *evaluate(nearest, test))
+
+    pipeline = create_model1_pipeline()
+    pipeline.fit([text for text, _ in train], [label for _, label in train])
+    report("model 1 (NB)", test, *evaluate(lambda text: str(pipeline.predict([text.lower()])[0]), test))
+
+    server = None
+    host = args.host
+    if not host:
+        server = FakeOllamaServer(load_seconds=0.0).start()
+        host = server.url
+    try:
+        llm = SemanticClassifier(host=host)
+        report("llm", test, *evaluate(lambda text: llm.classify(text).get('category'), test))
+        llm.close()
+    finally:
+        if server:
+            server.stop()
+
+    # Incremental learning: confirmed commands from one half, evaluated on the other
+    confirmed, unseen = test[:len(test) // 2], test[len(test) // 2:]
+    before = evaluate(nearest, unseen)
+    history = [{'command': text, 'result': {'success': True},
+                'classification': {'category': label, 'action': infer_action(label, text.lower())}}
+               for text, label in confirmed]
+    start = time.perf_counter()
+    added = matcher.add_from_history(history)
+    add_seconds = time.perf_counter() - start
+    print(f"\nlearned {added} confirmed commands in {add_seconds * 1000:.2f}ms "
+          f"({add_seconds / max(1, added) * 1e6:.0f}us each)")
+    report("unseen, before", unseen, *before)
+    report("unseen, after", unseen, *evaluate(nearest, unseen))
+    report("confirmed, after", confirmed, *evaluate(nearest, confirmed))
+
+
+if __name__ == "__main__":
+    main()
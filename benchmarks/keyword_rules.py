@@ -0,0 +1,98 @@
+"""
+Keyword rule microbenchmark - per-rule `any(kw in text)` scans vs the compiled KeywordMatcher
+Runs every rule (system, app launch, in-app, legacy system list) over MODEL1_TRAINING_DATA,
+checks both give identical answers, and reports time per utterance
+
+Usage:
+    python -m benchmarks.keyword_rules [--repeat 20]
+"""
+import argparse
+import time
+from models.command_classifier import CommandClassifier
+from train_models_complete import MODEL1_TRAINING_DATA
+from benchmarks.stats import summarize, format_us
+
+# Overlaps and prefixes the rules have to get right, beyond the training phrases
+EXTRA = ["restart and open spotify", "lock my screen now", "volume and brightness", "run", "open",
+         "please turn off computer", "reopen the last tab", "screen brightness 40", "press enter to start"]
+
+
+def legacy_rules(text_lower):
+    """The rule checks as CommandClassifier ran them before KeywordMatcher (lists rebuilt per call)"""
+    system_patterns = {
+        'volume': ['volume', 'sound level', 'audio level'],
+        'brightness': ['brightness', 'screen brightness'],
+        'shutdown': ['shut down', 'power off', 'turn off computer'],
+        'restart': ['restart', 'reboot'],
+        'sleep': ['sleep', 'hibernate'],
+        'lock': ['lock screen', 'lock computer', 'lock my screen']
+    }
+    system = next((sub for sub, keywords in system_patterns.items() if any(kw in text_lower for kw in keywords)), None)
+
+    app_name = None
+    for keyword in ['open', 'launch', 'start', 'run']:
+        if keyword in text_lower:
+            name = text_lower.split(keyword, 1)[1].strip()
+            name = name.replace('.', '').replace(',', '').replace('?', '').replace('!', '').strip()
+            if name:
+                app_name = name
+                break
+
+    in_app_keywords = [
+        'click', 'press', 'tap', 'select', 'send', 'message', 'text', 'type', 'write', 'enter',
+        'search', 'find', 'look for', 'scroll', 'swipe', 'play', 'pause', 'stop',
+        'next', 'previous', 'back', 'close', 'minimize', 'maximize'
+    ]
+    in_app = any(kw in text_lower for kw in in_app_keywords)
+
+    legacy = next((category for category, phrases in CommandClassifier.SYSTEM_COMMANDS.items()
+                   if any(phrase in text_lower for phrase in phrases)), None)
+    return system, app_name, in_app, legacy
+
+
+def compiled_rules(text_lower):
+    """Same answers from one KeywordMatcher scan"""
+    hits = CommandClassifier.scan(text_lower)
+    system = CommandClassifier._detect_system_command(text_lower, hits)
+    launch = CommandClassifier._detect_app_launch(text_lower, text_lower, hits)
+    in_app = any(hit.family == 'in_app' for hit in hits)
+    legacy = next((category for category in CommandClassifier.SYSTEM_COMMANDS
+                   if any(hit.family == 'legacy' and hit.label == category for hit in hits)), None)
+    return (system['subcategory'] if system else None, launch['app_name'] if launch else None, in_app, legacy)
+
+
+def time_rules(rules, texts, repeat):
+    """Per-utterance seconds (best of `repeat` passes over the corpus, per utterance)"""
+    samples = []
+    for text in texts:
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            rules(text)
+            best = min(best, time.perf_counter() - start)
+        samples.append(best)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the compiled keyword rules")
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    texts = [text.lower().strip() for text, _ in MODEL1_TRAINING_DATA] + EXTRA
+    mismatches = [text for text in texts if legacy_rules(text) != compiled_rules(text)]
+    for text in mismatches:
+        print(f"MISMATCH '{text}': legacy={legacy_rules(text)} compiled={compiled_rules(text)}")
+    print(f"{len(texts)} utterances, {len(mismatches)} mismatches\n")
+
+    legacy = time_rules(legacy_rules, texts, args.repeat)
+    compiled = time_rules(compiled_rules, texts, args.repeat)
+    scan = time_rules(CommandClassifier.scan, texts, args.repeat)
+    print(f"legacy   {format_us(summarize(legacy))}")
+    print(f"compiled {format_us(summarize(compiled))}")
+    print(f"scan     {format_us(summarize(scan))}")
+    print(f"\nspeedup (mean): {sum(legacy) / sum(compiled):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Ollama client benchmark - per-request connections vs the pooled keep-alive session
+Runs SemanticClassifier against the fake Ollama server (or a real one with --host)
+
+Usage:
+    python -m benchmarks.ollama_client [--commands 50] [--host http://localhost:11434]
+"""
+import argparse
+import time
+import requests
+import config
+from models.semantic_classifier import SemanticClassifier
+from train_models_complete import MODEL1_TRAINING_DATA
+from benchmarks.fake_ollama import FakeOllamaServer
+from benchmarks.stats import summarize, format_ms
+
+
+def _payload(text, keep_alive=None):
+    body = {"model": config.OLLAMA_MODEL, "prompt": f'USER COMMAND: "{text}"', "stream": False}
+    if keep_alive is not None:
+        body["keep_alive"] = keep_alive
+    return body
+
+
+def run_classify(classifier, commands):
+    latencies = []
+    for text in commands:
+        start = time.perf_counter()
+        classifier.classify(text)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def run_keep_alive(host, keep_alive, sessions, gap):
+    """First-command latency of each "session" separated by an idle gap"""
+    latencies = []
+    with requests.Session() as session:
+        for _ in range(sessions):
+            time.sleep(gap)
+            start = time.perf_counter()
+            session.post(f"{host}/api/generate", json=_payload("open chrome", keep_alive), timeout=60).json()
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Ollama classifier client")
+    parser.add_argument('--commands', type=int, default=50, help="Commands from the Model 1 training set")
+    parser.add_argument('--host', help="Real Ollama URL (default: start the fake server)")
+    parser.add_argument('--sessions', type=int, default=3, help="Sessions in the keep-alive comparison")
+    args = parser.parse_args()
+
+    commands = [text for text, _ in MODEL1_TRAINING_DATA[:args.commands]]
+    server = None
+    host = args.host
+    if not host:
+        server = FakeOllamaServer(load_seconds=0.5, token_seconds=0.0005).start()
+        host = server.url
+        print(f"Fake Ollama at {host}")
+
+    try:
+        # Blocking requests isolate connection reuse - an early-terminated stream drops its connection
+        classifier = SemanticClassifier(host=host, streaming=False)
+        baseline = SemanticClassifier(host=host, streaming=False)
+        baseline.session = requests  # module-level post(): a new connection per command (pre-pooling behaviour)
+
+        for label, client in (("fresh connections", baseline), ("pooled session", classifier)):
+            before = server.counters['connections'] if server else 0
+            latencies = run_classify(client, commands)
+            line = f"{label:<19} {format_ms(summarize(latencies))}"
+            if server:
+                line += f"  connections={server.counters['connections'] - before}"
+            print(line)
+        classifier.close()
+
+        if server:
+            # keep_alive=0 unloads after every request, like Ollama's default expiring between sessions
+            for keep_alive in (0, config.OLLAMA_KEEP_ALIVE):
+                server.unload()
+                loads = server.counters['loads']
+                first = run_keep_alive(host, keep_alive, args.sessions, gap=0.05)
+                print(f"keep_alive={keep_alive!s:<6} first command per session {format_ms(summarize(first))}  "
+                      f"model loads={server.counters['loads'] - loads}")
+    finally:
+        if server:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Streaming classifier benchmark - blocking generation vs streaming with early JSON termination
+Runs against the fake Ollama server with a model that keeps talking after its JSON answer
+
+Usage:
+    python -m benchmarks.ollama_streaming [--commands 30] [--ramble 60] [--token-ms 10]
+"""
+import argparse
+import time
+from models.semantic_classifier import SemanticClassifier
+from train_models_complete import MODEL1_TRAINING_DATA
+from benchmarks.fake_ollama import FakeOllamaServer, default_responder
+from benchmarks.stats import summarize, format_ms
+
+
+def rambling_responder(extra_words):
+    """Responder that adds a preamble and `extra_words` of explanation around the JSON"""
+    def respond(prompt):
+        answer = default_responder(prompt).split("\n", 1)[0]
+        explanation = " ".join(["because"] * extra_words)
+        return f"Sure! Here is the classification:\n{answer}\n\nExplanation: {explanation}"
+    return respond
+
+
+def run(server, classifier, commands):
+    """Classify every command; returns (latencies, labels, tokens generated, tokens requested)"""
+    generated = server.counters['tokens_generated']
+    requested = server.counters['tokens_requested']
+    latencies, labels = [], []
+    for text in commands:
+        start = time.perf_counter()
+        labels.append(classifier.classify(text).get('category'))
+        latencies.append(time.perf_counter() - start)
+    time.sleep(0.1)  # let the server notice the last disconnect
+    return (latencies, labels,
+            server.counters['tokens_generated'] - generated,
+            server.counters['tokens_requested'] - requested)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark streaming classification with early termination")
+    parser.add_argument('--commands', type=int, default=30)
+    parser.add_argument('--ramble', type=int, default=60, help="Words the model adds after the JSON")
+    parser.add_argument('--token-ms', type=float, default=10.0, help="Simulated generation time per token")
+    args = parser.parse_args()
+
+    commands = [text for text, _ in MODEL1_TRAINING_DATA[:args.commands]]
+    server = FakeOllamaServer(responder=rambling_responder(args.ramble), load_seconds=0.0,
+                              token_seconds=args.token_ms / 1000.0).start()
+    try:
+        blocking = SemanticClassifier(host=server.url, streaming=False)
+        streaming = SemanticClassifier(host=server.url, streaming=True)
+
+        results = {}
+        for label, classifier in (("blocking", blocking), ("streaming", streaming)):
+            latencies, labels, generated, requested = run(server, classifier, commands)
+            results[label] = labels
+            print(f"{label:<10} {format_ms(summarize(latencies))}  "
+                  f"tokens generated={generated}/{requested} (saved {requested - generated})")
+
+        stats = streaming.get_stream_stats()
+        agree = sum(a == b for a, b in zip(results['blocking'], results['streaming']))
+        print(f"early stops: {stats['early_stops']}/{stats['requests']}  "
+              f"tokens received: {stats['tokens_received']}  "
+              f"mean time to JSON: {stats['mean_json_seconds'] * 1000:.1f}ms  "
+              f"same category: {agree}/{len(commands)}")
+        blocking.close()
+        streaming.close()
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
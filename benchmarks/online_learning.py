@@ -0,0 +1,178 @@
+"""
+Online learning benchmark - partial_fit updates vs a full retrain, and classify latency
+while updates run in the background
+Model 1 is trained on part of MODEL1_TRAINING_DATA; half of the held-out commands arrive as
+confirmed session history, the other half stays unseen. Log and artifacts go to a temp dir
+The repo has no test suite, so the learn/swap/replay, source-filter and pruning checks live here and
+exit non-zero on failure
+
+Usage:
+    python -m benchmarks.online_learning [--holdout 0.3] [--sessions 5]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+import config
+from models.artifact_store import ArtifactStore
+from models.classification_cache import ClassificationCache
+from models.command_processor import CommandProcessor
+from models.feedback import FeedbackLog, OnlineLearner, confirmed_commands
+from models.tiered_classifier import TieredClassifier, infer_action
+from train_models_complete import MODEL1_TRAINING_DATA, create_model1_pipeline
+from benchmarks.classifier_tiers import split
+from benchmarks.stats import summarize, format_ms
+
+
+def accuracy(pipeline, data):
+    if not data:
+        return 0.0
+    predictions = pipeline.predict([text.lower().strip() for text, _ in data])
+    return sum(p == label for p, (_, label) in zip(predictions, data)) / len(data)
+
+
+def history(data, source='llm'):
+    """Session history entries as EVA.report_result records them"""
+    return [{'command': text, 'result': {'success': True},
+             'classification': {'category': label, 'action': infer_action(label, text.lower()), 'source': source}}
+            for text, label in data]
+
+
+def cached_llm_answer_learned():
+    """A phrase the LLM labelled is still learned when the repeat comes from the cache"""
+    processor = CommandProcessor.__new__(CommandProcessor)
+    processor.classifier = type('LLM', (), {'classify': staticmethod(
+        lambda text: {'category': 'APP_LAUNCH', 'confidence': 0.95, 'action': 'launch'})})()
+    processor.cache = ClassificationCache()
+    results = [processor.process("open spotify") for _ in range(2)]
+    entries = [{'command': result['raw_command'], 'result': {'success': True},
+                'classification': result['classification']} for result in results]
+    return results[1]['classification'].get('cached') and len(confirmed_commands(entries)) == 2
+
+
+def check_learning(pipeline, confirmed, unseen):
+    """learn -> hot swap -> classify, then JSONL replay when a learner starts without the saved model"""
+    failures = []
+    repeats = 3
+    with tempfile.TemporaryDirectory() as root:
+        log_path = os.path.join(root, 'feedback.jsonl')
+        tiered = TieredClassifier(llm=None, pipeline=pipeline, matcher=False)
+        saved = os.path.join(root, 'saved')
+        learner = OnlineLearner(tiered, log=FeedbackLog(log_path), store=ArtifactStore(root=saved), persist=True).start()
+        learner.submit(history(confirmed * repeats))
+        learner.stop()
+        if tiered.pipeline is pipeline:
+            failures.append("the updated pipeline was not swapped in")
+        elif accuracy(tiered.pipeline, confirmed) < accuracy(pipeline, confirmed):
+            failures.append("accuracy on the learned commands went down")
+        logged = FeedbackLog(log_path).read()
+        if len(logged) != len(confirmed) * repeats or None in logged:
+            failures.append(f"{len(logged)} feedback records logged, expected {len(confirmed) * repeats}")
+
+        # Restart without the saved model: the whole log is replayed into the same model
+        replayed = TieredClassifier(llm=None, pipeline=pipeline, matcher=False)
+        OnlineLearner(replayed, log=FeedbackLog(log_path), store=ArtifactStore(root=os.path.join(root, 'empty')),
+                      persist=False).start().stop()
+        probes = [text.lower() for text, _ in confirmed + unseen]
+        if list(replayed.pipeline.predict(probes)) != list(tiered.pipeline.predict(probes)):
+            failures.append("replaying the feedback log gave a different model")
+
+        # Restart with the saved model: its feedback_offset covers the log, nothing is applied twice
+        resumed = OnlineLearner(TieredClassifier(llm=None, pipeline=pipeline, matcher=False), log=FeedbackLog(log_path),
+                                store=ArtifactStore(root=saved))
+        if resumed.offset != len(logged):
+            failures.append(f"saved model resumes at record {resumed.offset}, expected {len(logged)}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark incremental Model 1 updates")
+    parser.add_argument('--holdout', type=float, default=0.3, help="Fraction of the data held out of initial training")
+    parser.add_argument('--sessions', type=int, default=5, help="Sessions the confirmed commands are spread over")
+    args = parser.parse_args()
+
+    train, test = split(MODEL1_TRAINING_DATA, args.holdout)
+    confirmed, unseen = test[:len(test) // 2], test[len(test) // 2:]
+    pipeline = create_model1_pipeline()
+    pipeline.fit([text for text, _ in train], [label for _, label in train])
+    print(f"{len(train)} train, {len(confirmed)} confirmed later, {len(unseen)} unseen")
+    print(f"before: confirmed {accuracy(pipeline, confirmed) * 100:.1f}%  unseen {accuracy(pipeline, unseen) * 100:.1f}%")
+
+    with tempfile.TemporaryDirectory() as root:
+        tiered = TieredClassifier(llm=None, pipeline=pipeline, matcher=False)
+        learner = OnlineLearner(tiered, log=FeedbackLog(os.path.join(root, 'feedback.jsonl')),
+                                store=ArtifactStore(root=root)).start()
+
+        # Classify continuously on the "command loop" while sessions are learned in the background
+        probes = [text for text, _ in unseen]
+        latencies = []
+        done = threading.Event()
+
+        def command_loop():
+            i = 0
+            while not done.is_set():
+                start = time.perf_counter()
+                tiered.classify_local(probes[i % len(probes)])
+                latencies.append(time.perf_counter() - start)
+                i += 1
+
+        baseline = []
+        for text in probes * 3:
+            start = time.perf_counter()
+            tiered.classify_local(text)
+            baseline.append(time.perf_counter() - start)
+
+        loop = threading.Thread(target=command_loop)
+        loop.start()
+        per_session = max(1, len(confirmed) // args.sessions)
+        submit_seconds = []
+        for i in range(0, len(confirmed), per_session):
+            start = time.perf_counter()
+            learner.submit(history(confirmed[i:i + per_session]))
+            submit_seconds.append(time.perf_counter() - start)
+            time.sleep(0.05)
+        learner.stop()
+        done.set()
+        loop.join()
+
+        stats = learner.get_stats()
+        print(f"after:  confirmed {accuracy(tiered.pipeline, confirmed) * 100:.1f}%  "
+              f"unseen {accuracy(tiered.pipeline, unseen) * 100:.1f}%")
+        print(f"\n{stats['updates']} updates, {stats['examples']} examples, "
+              f"mean {stats['mean_seconds'] * 1000:.1f}ms  max {stats['max_seconds'] * 1000:.1f}ms per update")
+        print(f"submit (command loop side) {format_ms(summarize(submit_seconds))}")
+
+        start = time.perf_counter()
+        retrained = create_model1_pipeline()
+        data = train + confirmed
+        retrained.fit([text for text, _ in data], [label for _, label in data])
+        print(f"full retrain {(time.perf_counter() - start) * 1000:.1f}ms  "
+              f"(confirmed {accuracy(retrained, confirmed) * 100:.1f}%  unseen {accuracy(retrained, unseen) * 100:.1f}%)")
+
+        print(f"\nclassify_local idle          {format_ms(summarize(baseline))}")
+        print(f"classify_local during updates {format_ms(summarize(latencies))}")
+        versions = len(ArtifactStore(root=root).manifest()['artifacts']['command_classifier']['versions'])
+        print(f"artifact versions kept: {versions}")
+
+    failures = 0
+    for failure in check_learning(pipeline, confirmed, unseen):
+        print(f"FAIL {failure}")
+        failures += 1
+    local = [len(confirmed_commands(history(confirmed, source))) for source in ('model', 'keyword', 'nearest')]
+    if any(local):
+        print(f"FAIL locally labelled commands were learned: {local}")
+        failures += 1
+    if not cached_llm_answer_learned():
+        print("FAIL an LLM answer served from the cache was not learned")
+        failures += 1
+    if versions > config.ONLINE_LEARNING_KEEP_VERSIONS:
+        print(f"FAIL {versions} artifact versions kept (limit {config.ONLINE_LEARNING_KEEP_VERSIONS})")
+        failures += 1
+    print(f"\nfeedback checks: {'OK' if not failures else f'{failures} failures'}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
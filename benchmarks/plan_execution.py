@@ -0,0 +1,167 @@
+"""
+Plan execution benchmark - fixed 'wait' sleeps vs condition-based waits
+A simulated desktop stands in for the C executor and user32: the start menu takes focus
+--menu-ms after the Windows key and the launched app --app-ms after Enter
+legacy    = ExecutorBridge.launch_application (Win, sleep 0.5, type, sleep 0.5, Enter)
+fixed     = PlanExecutor with every wait sleeping its full duration
+condition = PlanExecutor waiting for the foreground window to change (default); the 0.5s wait
+            for search results between typing and Enter always sleeps
+The repo has no test suite, so the plan checks live here and exit non-zero on failure
+
+Usage:
+    python -m benchmarks.plan_execution [--runs 5] [--menu-ms 120] [--app-ms 600]
+"""
+import argparse
+import copy
+import logging
+import sys
+import time
+from execution.plan_executor import PlanExecutor, normalize_step
+from models.step_generator import StepGenerator
+from train_models_complete import MODEL2_TRAINING_DATA
+from benchmarks.stats import summarize, format_ms
+
+
+class FakeDesktop:
+    """Records bridge actions and changes the foreground window after a delay"""
+
+    def __init__(self, menu_seconds, app_seconds, action_seconds=0.0005):
+        self.delays = {'win': menu_seconds, 'enter': app_seconds}
+        self.action_seconds = action_seconds
+        self.actions = []
+        self.batches = 0
+        self.window = (1, 'Desktop')
+        self.pending = None  # (ready at, window)
+        self.fail_on = None
+
+    def execute_action(self, action_type, coordinates, parameters):
+        time.sleep(self.action_seconds)
+        self.actions.append((action_type, parameters.get('key') or parameters.get('text')))
+        if action_type == 'PRESS_KEY' and parameters.get('key') == self.fail_on:
+            return {'success': False, 'error': f"could not press {self.fail_on}"}
+        key = parameters.get('key')
+        if action_type == 'PRESS_KEY' and key in self.delays:
+            self.pending = (time.perf_counter() + self.delays[key], (self.window[0] + 1, key))
+        return {'success': True}
+
+    def execute_batch(self, actions):
+        self.batches += 1
+        for action in actions:
+            result = self.execute_action(*action)
+            if not result['success']:
+                return result
+        return {'success': True}
+
+    def launch_application(self, app_name):
+        self.execute_action('PRESS_KEY', {}, {'key': 'win'})
+        time.sleep(0.5)
+        self.execute_action('TYPE_TEXT', {}, {'text': app_name})
+        time.sleep(0.5)
+        self.execute_action('PRESS_KEY', {}, {'key': 'enter'})
+        return {'success': True}
+
+    def snapshot(self):
+        if self.pending and time.perf_counter() >= self.pending[0]:
+            self.window, self.pending = self.pending[1], None
+        return self.window
+
+
+def fixed(steps):
+    """Same plan with every wait forced to sleep its full duration"""
+    steps = copy.deepcopy(steps)
+    for step in steps:
+        parameters = step.get('parameters', step)
+        if step.get('action') == 'wait' or step.get('action_type') == 'WAIT':
+            parameters['until'] = 'sleep'
+    return steps
+
+
+def check(plans, args):
+    """Both schemas give the same input sequence; a failing step stops the plan"""
+    failures = 0
+    sequences = {}
+    for label, steps in plans.items():
+        desktop = FakeDesktop(args.menu_ms / 1000, args.app_ms / 1000)
+        result = PlanExecutor(desktop, probe=desktop).run(steps, label)
+        sequences[label] = desktop.actions
+        if not result['success']:
+            print(f"FAIL {label}: {result.get('error')}")
+            failures += 1
+        inputs = sum(action[0] != 'WAIT' for step in steps for action in normalize_step(step))
+        if len(desktop.actions) != inputs:
+            print(f"FAIL {label}: {len(desktop.actions)} actions sent, expected {inputs}")
+            failures += 1
+        # Enter must not go out in the same batch as the search text (results need time to appear)
+        for timing in result.get('timings', []):
+            actions = timing.get('actions', [])
+            if 'TYPE_TEXT' in actions and 'PRESS_KEY' in actions[actions.index('TYPE_TEXT'):]:
+                print(f"FAIL {label}: Enter sent with the typed search and no wait: {actions}")
+                failures += 1
+    if len(set(map(tuple, sequences.values()))) != 1:
+        print(f"FAIL schemas send different input: {sequences}")
+        failures += 1
+
+    desktop = FakeDesktop(args.menu_ms / 1000, args.app_ms / 1000)
+    desktop.fail_on = 'win'
+    result = PlanExecutor(desktop, probe=desktop).run(plans['default rules'], 'failing')
+    if result['success'] or desktop.actions != [('PRESS_KEY', 'win')] or result.get('failed_steps') != [0]:
+        print(f"FAIL failing step did not stop the plan: {result}, sent {desktop.actions}")
+        failures += 1
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark step plan execution")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--menu-ms', type=float, default=120, help="Start menu appears this long after Win")
+    parser.add_argument('--app-ms', type=float, default=600, help="Launched app takes focus this long after Enter")
+    args = parser.parse_args()
+    logging.getLogger("StepGenerator").setLevel(logging.WARNING)
+    logging.getLogger("PlanExecutor").setLevel(logging.ERROR)
+
+    generator = StepGenerator()
+    generator.create_default_rules()
+    generator.compile_templates()
+    trained = StepGenerator()
+    trained.rules = copy.deepcopy(MODEL2_TRAINING_DATA)
+    trained.compile_templates()
+    command = {'classification': {'category': 'APP_LAUNCH', 'action': 'launch'},
+               'entities': {'app_name': 'notepad'}, 'raw_command': 'open notepad'}
+    plans = {'default rules': generator.generate(command), 'trained rules': trained.generate(command)}
+
+    failures = check(plans, args)
+    print(f"plan checks: {'OK' if not failures else f'{failures} failures'}\n")
+
+    def measure(run):
+        samples = []
+        for _ in range(args.runs):
+            desktop = FakeDesktop(args.menu_ms / 1000, args.app_ms / 1000)
+            start = time.perf_counter()
+            run(desktop)
+            samples.append(time.perf_counter() - start)
+        return samples
+
+    print(f"start menu {args.menu_ms:.0f}ms, app window {args.app_ms:.0f}ms, {args.runs} runs each")
+    print(f"{'legacy launch_application':<32} {format_ms(summarize(measure(lambda d: d.launch_application('notepad'))))}")
+    for label, steps in plans.items():
+        for mode, plan in (('fixed', fixed(steps)), ('condition', steps)):
+            samples = measure(lambda d: PlanExecutor(d, probe=d).run(plan, label))
+            print(f"{f'{label} {mode}':<32} {format_ms(summarize(samples))}")
+
+    desktop = FakeDesktop(args.menu_ms / 1000, args.app_ms / 1000)
+    executor = PlanExecutor(desktop, probe=desktop)
+    result = executor.run(plans['trained rules'], 'APP_LAUNCH')
+    print(f"\nper-step timing (trained rules, {desktop.batches} input batches):")
+    for timing in result['timings']:
+        detail = ', '.join(timing['actions']) if timing['kind'] == 'input' else \
+            f"{timing['outcome']} (duration {timing['duration']}s)"
+        print(f"  steps {timing['steps']!s:<8} {timing['kind']:<6} {timing['seconds'] * 1000:8.1f}ms  {detail}")
+    stats = executor.get_stats()
+    print(f"waits met {stats['waits_met']}, timed out {stats['waits_timed_out']}, "
+          f"{stats['wait_seconds_saved']:.2f}s of fixed sleeps saved")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Prompt caching benchmark - prompt tokens evaluated per classification
+legacy  = previous prompt (command in the middle, so only the text before it is reusable)
+prefix  = static PROMPT_PREFIX first, command last (Ollama reuses the cached prefix)
+context = prefix evaluated once, its context tokens sent with each command
+
+Usage:
+    python -m benchmarks.prompt_cache [--commands 30] [--prompt-ms 2]
+"""
+import argparse
+import time
+from models.semantic_classifier import SemanticClassifier, PROMPT_PREFIX
+from train_models_complete import MODEL1_TRAINING_DATA
+from benchmarks.fake_ollama import FakeOllamaServer
+from benchmarks.stats import summarize, format_ms
+
+
+def legacy_prompt(text):
+    """The prompt SemanticClassifier built per call before PROMPT_PREFIX existed"""
+    head, examples = PROMPT_PREFIX.split("\nReturn ONLY valid JSON", 1)
+    head = head.replace("Analyze the user command at the end", "Analyze this command")
+    return f'{head}\nUSER COMMAND: "{text}"\n\nReturn ONLY valid JSON{examples}'
+
+
+class LegacyPromptClassifier(SemanticClassifier):
+    def _request_body(self, text, stream):
+        body = super()._request_body(text, stream)
+        body["prompt"] = legacy_prompt(text)
+        return body
+
+
+def run(server, classifier, commands):
+    before = dict(server.counters)
+    latencies = []
+    for text in commands:
+        start = time.perf_counter()
+        classifier.classify(text)
+        latencies.append(time.perf_counter() - start)
+    delta = {key: server.counters[key] - before[key] for key in ('prompt_tokens', 'prompt_tokens_evaluated', 'prompt_eval_seconds')}
+    return latencies, delta
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark prompt prefix reuse against the fake Ollama server")
+    parser.add_argument('--commands', type=int, default=30)
+    parser.add_argument('--prompt-ms', type=float, default=2.0, help="Simulated prompt evaluation time per token")
+    args = parser.parse_args()
+
+    commands = [text for text, _ in MODEL1_TRAINING_DATA[:args.commands]]
+    server = FakeOllamaServer(load_seconds=0.0, prompt_seconds_per_token=args.prompt_ms / 1000.0,
+                              token_seconds=0.001).start()
+    try:
+        clients = [
+            ("legacy", LegacyPromptClassifier(host=server.url, streaming=False, prompt_cache="prefix")),
+            ("prefix", SemanticClassifier(host=server.url, streaming=False, prompt_cache="prefix")),
+            ("context", SemanticClassifier(host=server.url, streaming=False, prompt_cache="context")),
+        ]
+        for label, classifier in clients:
+            server.kv_cache.clear()
+            latencies, delta = run(server, classifier, commands)
+            count = len(commands)
+            print(f"{label:<8} prompt tokens/call={delta['prompt_tokens'] / count:6.1f}  "
+                  f"evaluated/call={delta['prompt_tokens_evaluated'] / count:6.1f}  "
+                  f"prompt eval={delta['prompt_eval_seconds'] / count * 1000:6.1f}ms  "
+                  f"{format_ms(summarize(latencies))}")
+            classifier.close()
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Shared latency statistics for benchmark reports"""
+import math
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers (pct in 0-100)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(values):
+    """Summary dict (count, mean, p50, p95, p99, max) for a list of seconds"""
+    if not values:
+        return {'count': 0, 'mean': 0.0, 'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'max': 0.0}
+    return {
+        'count': len(values),
+        'mean': sum(values) / len(values),
+        'p50': percentile(values, 50),
+        'p95': percentile(values, 95),
+        'p99': percentile(values, 99),
+        'max': max(values)
+    }
+
+
+def format_ms(summary):
+    """One-line millisecond rendering of a summarize() result"""
+    return (f"n={summary['count']}  mean={summary['mean'] * 1000:.1f}ms  "
+            f"p50={summary['p50'] * 1000:.1f}ms  p95={summary['p95'] * 1000:.1f}ms  "
+            f"p99={summary['p99'] * 1000:.1f}ms  max={summary['max'] * 1000:.1f}ms")
+
+
+def format_us(summary):
+    """One-line microsecond rendering of a summarize() result (for sub-millisecond paths)"""
+    return (f"n={summary['count']}  mean={summary['mean'] * 1e6:.1f}us  "
+            f"p50={summary['p50'] * 1e6:.1f}us  p95={summary['p95'] * 1e6:.1f}us  "
+            f"p99={summary['p99'] * 1e6:.1f}us  max={summary['max'] * 1e6:.1f}us")
@@ -0,0 +1,131 @@
+"""
+Step template benchmark - correctness of repeated generate() calls and plan throughput
+legacy    = previous generate(): returns the shared rule list and overwrites step['text']
+deepcopy  = legacy made safe by deep-copying the rules on every call
+compiled  = StepTemplate.instantiate (current StepGenerator.generate)
+The repo has no test suite, so the correctness checks live here and exit non-zero on failure
+
+Usage:
+    python -m benchmarks.step_templates [--calls 20000]
+"""
+import argparse
+import copy
+import logging
+import sys
+import time
+from models.step_generator import StepGenerator, slot_values
+from train_models_complete import MODEL2_TRAINING_DATA
+
+COMMANDS = [
+    ('APP_LAUNCH', 'open chrome', {'app_name': 'chrome', 'action': 'launch'}),
+    ('APP_LAUNCH', 'launch spotify', {'app_name': 'spotify', 'action': 'launch'}),
+    ('WEB_ACTION', 'search for python tutorials', {'action': 'search'}),
+    ('WEB_ACTION', 'go to github.com', {'action': 'navigate'}),
+    ('IN_APP_ACTION', 'close this window', {'action': 'close'}),
+    ('IN_APP_ACTION', 'play next song', {'action': 'next'}),
+]
+
+
+def command_data(category, text, entities):
+    return {
+        'classification': {'category': category, 'action': entities.get('action', ''), 'raw_command': text},
+        'entities': dict(entities),
+        'raw_command': text
+    }
+
+
+def legacy_generate(rules, data):
+    """StepGenerator.generate before templates (mutates `rules`)"""
+    steps = rules.get(data['classification']['category'], [])
+    app_name = data['entities'].get('app_name', '')
+    for step in steps:
+        if 'text' in step and '{app_name}' in step['text']:
+            step['text'] = app_name
+    return steps
+
+
+def deepcopy_generate(rules, data):
+    steps = copy.deepcopy(rules.get(data['classification']['category'], []))
+    values = slot_values(data)
+    for step in steps:
+        if 'text' in step:
+            for slot, value in values.items():
+                step['text'] = step['text'].replace('{' + slot + '}', value)
+    return steps
+
+
+def typed_text(steps):
+    """Text of the first typing step, in either step schema"""
+    for step in steps:
+        if step.get('action') == 'type':
+            return step.get('text')
+        if step.get('action_type') == 'TYPE_TEXT':
+            return step.get('parameters', {}).get('text')
+    return None
+
+
+def check(generator, label):
+    """Every command, three rounds, in an order that exposed the legacy mutation"""
+    failures = 0
+    expected = {
+        'open chrome': 'chrome', 'launch spotify': 'spotify',
+        'search for python tutorials': 'python tutorials', 'go to github.com': 'github.com',
+    }
+    for _ in range(3):
+        for category, text, entities in COMMANDS:
+            steps = generator.generate(command_data(category, text, entities))
+            steps[0]['mutated'] = True  # callers scribbling on the result must not leak into the template
+            typed = typed_text(steps)
+            want = expected.get(text, entities.get('action') if category == 'IN_APP_ACTION' else None)
+            if want is not None and typed is not None and typed != want:
+                print(f"FAIL [{label}] '{text}': typed {typed!r}, expected {want!r}")
+                failures += 1
+    for template in generator.templates.values():
+        if any(step.get('mutated') for step in template.instantiate({})):
+            print(f"FAIL [{label}] template {template.category} was modified by a caller")
+            failures += 1
+    return failures
+
+
+def throughput(generate, calls):
+    data = [command_data(*command) for command in COMMANDS]
+    start = time.perf_counter()
+    for i in range(calls):
+        generate(data[i % len(data)])
+    seconds = time.perf_counter() - start
+    return calls / seconds, seconds / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark compiled step templates")
+    parser.add_argument('--calls', type=int, default=20000)
+    args = parser.parse_args()
+    logging.getLogger("StepGenerator").setLevel(logging.WARNING)
+
+    generator = StepGenerator()
+    trained = StepGenerator()
+    trained.rules = copy.deepcopy(MODEL2_TRAINING_DATA)
+    trained.compile_templates()
+
+    failures = check(generator, 'default rules') + check(trained, 'trained rules')
+    stale = copy.deepcopy(generator.rules)
+    legacy_generate(stale, command_data(*COMMANDS[0]))
+    legacy_second = typed_text(legacy_generate(stale, command_data(*COMMANDS[1])))
+    print(f"legacy generate: second launch types {legacy_second!r} (expected 'spotify')")
+    print(f"compiled templates: {'OK' if not failures else f'{failures} failures'}\n")
+
+    rules = copy.deepcopy(generator.rules)
+    for label, generate in [
+        ('legacy (unsafe)', lambda data: legacy_generate(rules, data)),
+        ('deepcopy', lambda data: deepcopy_generate(generator.rules, data)),
+        ('compiled', lambda data: generator.templates[data['classification']['category']].instantiate(slot_values(data))),
+        ('generate()', generator.generate),
+    ]:
+        per_second, seconds = throughput(generate, args.calls)
+        print(f"{label:<16} {per_second:>10,.0f} plans/s  {seconds * 1e6:6.2f}us/plan")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+STT latency benchmark - replays WAV fixtures through VAD capture + Whisper
+Reports end-of-speech → text latency per fixture (or, with --streaming,
+time-to-first-partial and time-to-final)
+
+Usage:
+    python -m benchmarks.stt_latency path/to/fixtures/ [--realtime] [--no-transcribe]
+    python -m benchmarks.stt_latency path/to/fixtures/ --streaming --realtime
+    python -m benchmarks.stt_latency --synthesize 5 --no-transcribe
+"""
+import argparse
+import os
+import tempfile
+import time
+import wave
+import numpy as np
+import config
+from speech.audio_capture import AudioCaptureService, WavFileSource
+from speech.vad import VoiceActivityDetector
+from benchmarks.stats import summarize, format_ms
+
+
+def synthesize_fixtures(count, directory):
+    """Write tone-burst fixtures (speech-like energy) separated by silence"""
+    rng = np.random.default_rng(0)
+    paths = []
+    for i in range(count):
+        speech_seconds = 0.5 + 0.5 * i
+        t = np.arange(int(speech_seconds * config.SAMPLE_RATE)) / config.SAMPLE_RATE
+        tone = 6000 * np.sin(2 * np.pi * 220 * t) * (0.6 + 0.4 * np.sin(2 * np.pi * 3 * t))
+        lead = rng.normal(0, 50, int(0.5 * config.SAMPLE_RATE))
+        samples = np.concatenate([lead, tone]).astype(np.int16)
+
+        path = os.path.join(directory, f"synthetic_{i:02d}.wav")
+        with wave.open(path, 'wb') as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(config.SAMPLE_RATE)
+            wf.writeframes(samples.tobytes())
+        paths.append(path)
+    return paths
+
+
+def run(paths, realtime=False, transcribe=True):
+    """Replay each fixture through the shared capture service and collect end-of-speech → text latencies"""
+    stt = None
+    if transcribe:
+        from speech.speech_to_text import SpeechToText
+        stt = SpeechToText()
+
+    latencies = []
+    for path in paths:
+        capture = AudioCaptureService(source=WavFileSource(path, realtime=realtime))
+        vad = VoiceActivityDetector(chunk_size=capture.chunk_size)
+        capture_start = time.perf_counter()
+        capture.start()
+        subscription = capture.subscribe(start_index=0)
+        frames, stats = vad.capture(subscription.read)
+        capture_end = time.perf_counter()
+        capture.stop()
+
+        text = ""
+        if stt is not None and stats['speech_detected']:
+            text = stt.transcribe_audio(stt.frames_to_audio(frames))
+        done = time.perf_counter()
+
+        if not stats['speech_detected']:
+            print(f"{os.path.basename(path)}: no speech detected")
+            continue
+
+        latency = done - stats['speech_end_time']
+        latencies.append(latency)
+        print(f"{os.path.basename(path)}: captured {stats['duration']:.2f}s "
+              f"(capture {capture_end - capture_start:.3f}s) "
+              f"end-of-speech→text {latency * 1000:.1f}ms  '{text}'")
+
+    print(f"\nEnd-of-speech → text: {format_ms(summarize(latencies))}")
+    if stt is not None:
+        print_tier_stats(stt)
+    return latencies
+
+
+def print_tier_stats(stt):
+    """Per-tier real-time factor so the fallback policy can be tuned on this machine"""
+    for tier, stats in stt.get_tier_stats().items():
+        if not stats['calls']:
+            continue
+        print(f"Whisper {tier} tier ({stt.tiers[tier]['model_size']}): {stats['calls']} decodes, "
+              f"RTF {stats['rtf']:.3f}, {stats['fallbacks']} fallbacks")
+
+
+def run_streaming(paths, realtime=True):
+    """Replay each fixture through SpeechToText.listen_streaming and collect partial/final latencies"""
+    from speech.speech_to_text import SpeechToText
+    stt = SpeechToText()
+
+    first_partials = []
+    finals = []
+    for path in paths:
+        capture = AudioCaptureService(source=WavFileSource(path, realtime=realtime), chunk_size=stt.vad.chunk_size)
+        capture.start()
+        subscription = capture.subscribe(start_index=0)
+        text, stats = stt.listen_streaming(read_chunk=subscription.read)
+        capture.stop()
+
+        if stats['time_to_first_partial'] is not None:
+            first_partials.append(stats['time_to_first_partial'])
+        if stats['time_to_final'] is not None:
+            finals.append(stats['time_to_final'])
+
+        first = stats['time_to_first_partial']
+        final = stats['time_to_final']
+        print(f"{os.path.basename(path)}: {len(stats['partials'])} partials, "
+              f"first partial {'-' if first is None else f'{first * 1000:.1f}ms'}, "
+              f"final {'-' if final is None else f'{final * 1000:.1f}ms'}  '{text}'")
+
+    print(f"\nTime to first partial: {format_ms(summarize(first_partials))}")
+    print(f"Time to final:         {format_ms(summarize(finals))}")
+    print_tier_stats(stt)
+    return first_partials, finals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay WAV fixtures through VAD capture and Whisper")
+    parser.add_argument('fixtures', nargs='?', help="WAV file or directory of 16 kHz mono WAV files")
+    parser.add_argument('--synthesize', type=int, default=0, help="Generate N synthetic tone-burst fixtures")
+    parser.add_argument('--realtime', action='store_true', help="Pace replay at real time like a microphone")
+    parser.add_argument('--no-transcribe', action='store_true', help="Measure VAD capture only (no Whisper)")
+    parser.add_argument('--streaming', action='store_true',
+                        help="Partial transcription mode (use with --realtime so partials have time to run)")
+    args = parser.parse_args()
+
+    if args.synthesize:
+        paths = synthesize_fixtures(args.synthesize, tempfile.mkdtemp(prefix='eva_stt_'))
+    elif args.fixtures and os.path.isdir(args.fixtures):
+        paths = sorted(os.path.join(args.fixtures, f) for f in os.listdir(args.fixtures) if f.endswith('.wav'))
+    elif args.fixtures:
+        paths = [args.fixtures]
+    else:
+        parser.error("pass a fixtures path or --synthesize N")
+
+    if args.streaming:
+        run_streaming(paths, realtime=args.realtime)
+    else:
+        run(paths, realtime=args.realtime, transcribe=not args.no_transcribe)
+
+
+if __name__ == "__main__":
+    main()
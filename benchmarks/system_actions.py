@@ -0,0 +1,185 @@
+"""
+System actions benchmark - relative steps, mute and ramps in-process vs a spawned helper process
+handle = FakeAudioEndpoint/FakeBrightnessProvider through SystemExecutor
+native = volume/mute keys from system_commands.c (on Linux the recording stub build, so
+         the events are checked but nothing is sent)
+spawn  = a bare `python -c pass` as a lower bound for one nircmd/PowerShell fallback
+The repo has no test suite, so the routing and spawn-count checks live here and exit non-zero on failure
+
+Usage:
+    python -m benchmarks system_actions [--runs 20]
+"""
+import argparse
+import contextlib
+import io
+import logging
+import subprocess
+import sys
+import time
+import config
+from execution.action_router import ActionRouter, parse_level_change
+from execution.executor_bridge import ExecutorBridge
+from execution.input_backends import CtypesBackend, RecordingBackend, KEYEVENTF_KEYUP
+from execution.system_controls import (FakeAudioEndpoint, FakeBrightnessProvider, NativeSystemKeys,
+                                       UnavailableAudioEndpoint, UnavailableBrightnessProvider)
+from execution.system_executor import SystemExecutor
+from benchmarks.stats import summarize, format_ms, format_us
+
+VK_VOLUME_MUTE, VK_VOLUME_UP = 0xAD, 0xAF
+SYSTEM = {'category': 'SYSTEM_ACTION', 'confidence': 0.9, 'action': 'system'}  # no subcategory, as CommandProcessor sends it
+# A number is absolute only after "to"/"at" or without a direction word; the verb decides the direction
+PARSES = [
+    ("volume up 2 notches", {'mode': 'change', 'direction': 1, 'amount': None, 'steps': 2}),
+    ("turn up the volume 3 times", {'mode': 'change', 'direction': 1, 'amount': None, 'steps': 3}),
+    ("volume up 20", {'mode': 'change', 'direction': 1, 'amount': 20}),
+    ("turn the volume up to 80", {'mode': 'set', 'level': 80}),
+    ("volume 30", {'mode': 'set', 'level': 30}),
+    ("lower the brightness more", {'mode': 'change', 'direction': -1}),
+    ("more volume", {'mode': 'change', 'direction': 1}),
+    ("turn it up, no, down", None),
+]
+
+
+def router_for(system):
+    return ActionRouter(system, screenshot_handler=None)
+
+
+def run(router, command):
+    with contextlib.redirect_stdout(io.StringIO()):  # the router prints a ✅ line per action
+        return router.execute('SYSTEM_ACTION', [], {}, command, dict(SYSTEM, raw_command=command))
+
+
+def check(native):
+    failures = 0
+
+    def expect(label, ok, detail):
+        nonlocal failures
+        if not ok:
+            print(f"FAIL {label}: {detail}")
+            failures += 1
+
+    for command, expected in PARSES:
+        parsed = parse_level_change(command)
+        ok = parsed is None if expected is None else \
+            parsed is not None and all(parsed.get(key) == value for key, value in expected.items())
+        expect(f"parse '{command}'", ok, parsed)
+
+    system = SystemExecutor(ExecutorBridge(backend=RecordingBackend()), audio=FakeAudioEndpoint(volume=50),
+                            brightness=FakeBrightnessProvider(brightness=50))
+    router = router_for(system)
+    for command, level in (("increase volume", 50 + config.VOLUME_STEP),
+                           ("turn the volume down by 20", 30 + config.VOLUME_STEP),
+                           ("set volume to 35", 35), ("max volume", 100)):
+        result = run(router, command)
+        expect(command, result.get('success') and system.audio.get_volume() == level,
+               (result, system.audio.get_volume()))
+    for command, muted in (("mute", True), ("toggle mute", False), ("toggle mute", True), ("unmute", False)):
+        result = run(router, command)
+        expect(command, result.get('success') and system.audio.get_mute() == muted, (result, system.audio.get_mute()))
+    for command, level in (("set brightness to 30", 30), ("make the screen brighter", 30 + config.BRIGHTNESS_STEP)):
+        result = run(router, command)
+        expect(command, result.get('success') and system.brightness.get_brightness() == level,
+               (result, system.brightness.get_brightness()))
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = router.execute('SYSTEM_ACTION', [], {}, "please", dict(SYSTEM, action='set_volume'))
+    expect("volume from action alone needs a level", not result.get('success'), result)
+
+    seconds, interval = config.RAMP_SECONDS, config.RAMP_INTERVAL
+    config.RAMP_SECONDS, config.RAMP_INTERVAL = 0.05, 0.01
+    try:
+        before = system.audio.operations['set_volume']['calls']
+        result = run(router, "slowly lower the volume to 0")
+        calls = system.audio.operations['set_volume']['calls'] - before
+        expect("ramp in 5 steps", result.get('success') and calls == 5 and system.audio.get_volume() == 0,
+               (result, calls, system.audio.get_volume()))
+    finally:
+        config.RAMP_SECONDS, config.RAMP_INTERVAL = seconds, interval
+    expect("no spawns through handles", system.get_stats()['spawns'] == 0, system.get_stats()['spawns_by_program'])
+
+    # Nothing left to set the level with: report failure, never success
+    system = SystemExecutor(ExecutorBridge(backend=RecordingBackend()), audio=UnavailableAudioEndpoint("benchmark"),
+                            brightness=UnavailableBrightnessProvider("benchmark"),
+                            native=NativeSystemKeys(lib_path="/nonexistent/executor.so"))
+    result = system.set_brightness(50)
+    expect("brightness without WMI fails without spawning", not result.get('success')
+           and system.get_stats()['spawns'] == 0, (result, system.get_stats()['spawns_by_program']))
+    system._spawn = lambda args, **kwargs: subprocess.CompletedProcess(args, 1)
+    result = system.set_volume(50)
+    expect("failed nircmd is a failure", not result.get('success'), result)
+
+    if native is not None:
+        system = SystemExecutor(ExecutorBridge(backend=RecordingBackend()),
+                                audio=UnavailableAudioEndpoint("benchmark"),
+                                brightness=UnavailableBrightnessProvider("benchmark"))
+        router = router_for(system)
+        native.reset_recording()
+        run(router, "turn the volume up by 10")
+        ups = [e for e in native.recorded_events() if e[1] == VK_VOLUME_UP and not e[2] & KEYEVENTF_KEYUP]
+        expect("volume keys in one SendInput", len(ups) == 10 // config.VOLUME_KEY_PERCENT
+               and native.recorded_calls() == 1, (native.recorded_events(), native.recorded_calls()))
+        native.reset_recording()
+        run(router, "toggle mute")
+        expect("mute key", [e[1] for e in native.recorded_events()] == [VK_VOLUME_MUTE, VK_VOLUME_MUTE],
+               native.recorded_events())
+        result = run(router, "mute")
+        expect("mute key reports unknown state", result.get('message') == "Toggled mute (state unknown)", result)
+        native.reset_recording()
+        result = run(router, "decrease brightness by 20")
+        expect("no brightness keys without WMI", not result.get('success') and not native.recorded_events(),
+               (result, native.recorded_events()))
+        expect("no spawns for relative steps", system.get_stats()['spawns'] == 0,
+               system.get_stats()['spawns_by_program'])
+    return failures
+
+
+def measure(call, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark relative system actions")
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.ERROR)
+    for name in ("SystemControls", "SystemExecutor", "ExecutorBridge", "ActionRouter", "InputBackend"):
+        logging.getLogger(name).setLevel(logging.CRITICAL)
+
+    try:
+        native = CtypesBackend()
+        native = native if native.recording else None  # never press real media keys from a benchmark
+    except OSError as e:
+        print(f"native checks skipped: {e}")
+        native = None
+
+    failures = check(native)
+    print(f"system action checks: {'OK' if not failures else f'{failures} failures'}\n")
+
+    handles = router_for(SystemExecutor(ExecutorBridge(backend=RecordingBackend()), audio=FakeAudioEndpoint(),
+                                        brightness=FakeBrightnessProvider()))
+    rows = [
+        ("volume up via handle", format_us, lambda: run(handles, "turn the volume up by 2")),
+        ("toggle mute via handle", format_us, lambda: run(handles, "toggle mute")),
+    ]
+    if native is not None:
+        keys = router_for(SystemExecutor(ExecutorBridge(backend=RecordingBackend()),
+                                         audio=UnavailableAudioEndpoint("benchmark"),
+                                         brightness=UnavailableBrightnessProvider("benchmark")))
+        rows += [
+            ("volume up via keys", format_us, lambda: run(keys, "turn the volume up by 2")),
+        ]
+    rows.append(("one spawned process", format_ms, lambda: subprocess.run([sys.executable, '-c', 'pass'])))
+    for label, fmt, call in rows:
+        print(f"{label:<24} {fmt(measure(call, args.runs))}")
+        if native is not None:
+            native.reset_recording()
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+System controls benchmark - a new audio/brightness handle per call vs one cached handle
+fake    = FakeAudioEndpoint/FakeBrightnessProvider with simulated handle creation cost
+          (--create-ms, endpoint activation or a WMI connection) and per-call cost (--call-ms)
+windows = pycaw + WMI on Windows (levels are read and written back unchanged)
+The repo has no test suite, so the handle lifecycle checks live here and exit non-zero on failure
+
+Usage:
+    python -m benchmarks system_controls [--calls 20] [--create-ms 40] [--call-ms 0.2]
+"""
+import argparse
+import logging
+import platform
+import sys
+import threading
+import time
+from execution.input_backends import RecordingBackend
+from execution.executor_bridge import ExecutorBridge
+from execution.system_controls import (FakeAudioEndpoint, FakeBrightnessProvider, PycawAudioEndpoint,
+                                       WmiBrightnessProvider)
+from execution.system_executor import SystemExecutor
+from benchmarks.stats import summarize, format_ms
+
+
+class ComAudioEndpoint(FakeAudioEndpoint):
+    """Fake endpoint that records which threads ran its per-thread setup (CoInitialize on Windows)"""
+
+    initialized = []
+    thread_init = staticmethod(lambda: ComAudioEndpoint.initialized.append(threading.get_ident()))
+
+
+def check():
+    failures = 0
+
+    def expect(label, ok, detail):
+        nonlocal failures
+        if not ok:
+            print(f"FAIL {label}: {detail}")
+            failures += 1
+
+    audio = FakeAudioEndpoint()
+    for level in (10, 20, 30):
+        audio.set_volume(level)
+    expect("lazy single create", audio.counters['creates'] == 1 and audio.get_volume() == 30, audio.get_stats())
+
+    audio.fail_next = 1
+    audio.set_volume(40)
+    expect("recreate after failure", audio.counters['creates'] == 2 and audio.counters['invalidations'] == 1
+           and audio.get_volume() == 40, audio.get_stats())
+
+    audio.fail_next = 2
+    try:
+        audio.set_volume(50)
+        expect("second failure raises", False, "no exception")
+    except OSError:
+        expect("error counted", audio.counters['errors'] == 1, audio.get_stats())
+
+    thread = threading.Thread(target=audio.set_volume, args=(60,))
+    thread.start()
+    thread.join()
+    expect("new handle on another thread", audio.counters['creates'] == 4, audio.get_stats())
+
+    # A worker thread (the pipelined executor's) must set up COM before creating its handle
+    audio = ComAudioEndpoint()
+    audio.set_volume(10)
+    worker = threading.Thread(target=lambda: [audio.set_volume(level) for level in (20, 30)])
+    worker.start()
+    worker.join()
+    audio.set_volume(40)
+    expect("thread setup once per creating thread", audio.counters['thread_inits'] == 2
+           and ComAudioEndpoint.initialized == [threading.get_ident(), worker.ident]
+           and audio.counters['creates'] == 3 and audio.get_volume() == 40,
+           (ComAudioEndpoint.initialized, audio.get_stats()))
+
+    system = SystemExecutor(ExecutorBridge(backend=RecordingBackend()), audio=FakeAudioEndpoint(),
+                            brightness=FakeBrightnessProvider())
+    results = [system.set_volume(70), system.set_brightness(80)]
+    expect("SystemExecutor through handles", all(r['success'] for r in results)
+           and system.audio.get_volume() == 70 and system.brightness.get_brightness() == 80, results)
+    stats = system.get_stats()
+    expect("per-call counters", stats['audio']['set_volume']['calls'] == 1
+           and stats['brightness']['set_brightness']['calls'] == 1, stats)
+    return failures
+
+
+def measure(call, calls):
+    samples = []
+    for i in range(calls):
+        start = time.perf_counter()
+        call(i)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def compare(label, make, set_level, get_level, calls):
+    """Fresh handle per call (the old SystemExecutor) vs one long-lived handle"""
+    cached = make()
+    level = get_level(cached)
+    fresh = measure(lambda i: set_level(make(), level), calls)
+    reused = measure(lambda i: set_level(cached, level), calls)
+    print(f"{label:<22} per call  {format_ms(summarize(fresh))}")
+    print(f"{label:<22} cached    {format_ms(summarize(reused))}")
+    return cached
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cached system control handles")
+    parser.add_argument('--calls', type=int, default=20)
+    parser.add_argument('--create-ms', type=float, default=40, help="Simulated handle creation cost")
+    parser.add_argument('--call-ms', type=float, default=0.2, help="Simulated cost of one get/set")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.ERROR)
+    for name in ("SystemControls", "SystemExecutor", "ExecutorBridge"):
+        logging.getLogger(name).setLevel(logging.CRITICAL)
+
+    failures = check()
+    print(f"handle checks: {'OK' if not failures else f'{failures} failures'}\n")
+
+    create, call = args.create_ms / 1000, args.call_ms / 1000
+    handles = [
+        compare('fake volume', lambda: FakeAudioEndpoint(create_seconds=create, call_seconds=call),
+                lambda h, v: h.set_volume(v), lambda h: h.get_volume(), args.calls),
+        compare('fake brightness', lambda: FakeBrightnessProvider(create_seconds=create, call_seconds=call),
+                lambda h, v: h.set_brightness(v), lambda h: h.get_brightness(), args.calls),
+    ]
+    if platform.system() == 'Windows':
+        for label, make, set_level, get_level in (
+            ('pycaw volume', PycawAudioEndpoint, lambda h, v: h.set_volume(v), lambda h: h.get_volume()),
+            ('WMI brightness', WmiBrightnessProvider, lambda h, v: h.set_brightness(v), lambda h: h.get_brightness()),
+        ):
+            try:
+                handles.append(compare(label, make, set_level, get_level, args.calls))
+            except Exception as e:
+                print(f"{label:<22} unavailable: {e}")
+
+    print("\ncounters of the cached handles:")
+    for handle in handles:
+        stats = handle.get_stats()
+        operations = ', '.join(f"{op} {counts['calls']}× mean {counts['mean_seconds'] * 1000:.2f}ms"
+                               for op, counts in stats.items() if isinstance(counts, dict))
+        print(f"  {type(handle).__name__:<24} creates {stats['creates']} ({stats['create_seconds'] * 1000:.1f}ms)  "
+              f"{operations}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
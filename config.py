@@ -18,13 +18,33 @@ C_EXECUTOR_DIR = os.path.join(BASE_DIR, 'execution', 'c_executors')
 SCREENSHOT_TEMP_DIR = os.path.join(BASE_DIR, 'temp_screenshots')
 LOG_DIR = os.path.join(BASE_DIR, 'logs')
 
+# Model Artifacts (versioned store in MODEL_WEIGHTS_DIR, see models/artifact_store.py)
+ARTIFACT_MMAP_MODE = 'r'  # memory-map NumPy arrays on load (None = read fully into memory)
+ARTIFACT_VERIFY_HASH = True  # check each artifact's sha256 against the manifest on load
+ARTIFACT_MMAP_MIN_BYTES = 1024 * 1024  # array data from which joblib + mmap beats plain pickle
+
 # Whisper Model Settings
 WHISPER_MODEL_SIZE = "large"  # ✅ Changed to large (methodology)
 WHISPER_DEVICE = "cpu"
 WHISPER_COMPUTE_TYPE = "int8"
 
+# Whisper Model Tiers (fast model first, large model only for long / low-confidence commands)
+WHISPER_TIERED = True  # False = single WHISPER_MODEL_SIZE model (previous behaviour)
+WHISPER_TIERS = {
+    "fast": {"model_size": "base", "beam_size": 1, "best_of": 1},
+    "accurate": {"model_size": WHISPER_MODEL_SIZE, "beam_size": 5, "best_of": 5},
+}
+WHISPER_FAST_MAX_SECONDS = 4.0  # longer commands go straight to the accurate tier
+WHISPER_FALLBACK_LOGPROB = -0.6  # fast tier average log-prob below this → re-decode with the accurate tier
+WHISPER_PRELOAD_ACCURATE = True  # load the accurate tier in the background at startup instead of on the first fallback
+
 LOG_LEVEL = logging.INFO
 
+# Latency Tracing (per-stage spans per command, exported at shutdown)
+TRACING_ENABLED = False
+TRACE_MAX_SPANS = 10000
+TRACE_DIR = os.path.join(LOG_DIR, 'traces')
+
 # Gemini Settings (for screen summary + coordinate filtering ONLY)
 GEMINI_MODEL = "models/gemini-2.0-flash-exp"
 GEMINI_FALLBACK_MODELS = [
@@ -43,5 +63,81 @@ CHUNK_SIZE = 1024
 SAMPLE_RATE = 16000
 RECORD_SECONDS = 5
 
+# Shared Audio Capture (one persistent input stream for wake word + commands)
+AUDIO_FRAME_SIZE = 512  # samples per ring buffer chunk (Porcupine frame length)
+AUDIO_BUFFER_SECONDS = 10  # ring buffer history
+COMMAND_FROM_WAKE_WORD = False  # True = first command starts at the wake word frame (the greeting is then printed, not spoken, so it isn't recorded)
+
+# Command Capture Settings
+STT_CAPTURE_MODE = "vad"  # "vad" = stop on trailing silence, "fixed" = legacy 10 second window
+VAD_MAX_DURATION = 10.0  # seconds - hard cap on one command
+VAD_SILENCE_TIMEOUT = 0.8  # seconds of trailing silence that ends a command
+VAD_PRE_ROLL = 0.3  # seconds of audio kept from before speech onset
+VAD_ENERGY_THRESHOLD = 500  # int16 RMS level treated as speech
+STT_STREAMING = False  # True = partial transcripts while speaking (costly with large models on CPU)
+STT_PARTIAL_INTERVAL = 0.5  # seconds between partial decodes
+STT_EARLY_CLASSIFY = True  # streaming only: classify the stable prefix before the final transcript
+STT_DEBUG_SAVE_AUDIO = False  # True = dump each command to a WAV file and transcribe from disk
+STT_DEBUG_AUDIO_DIR = os.path.join(LOG_DIR, 'recordings')
+
+# Startup Settings
+STARTUP_BACKGROUND_LOADING = True  # load Whisper, Ollama client, Gemini, C bridge while the wake word listens
+STARTUP_WORKERS = 4
+
+# Ollama Settings (semantic classifier)
+OLLAMA_HOST = "http://localhost:11434"
+OLLAMA_MODEL = "mistral"
+OLLAMA_CONNECT_TIMEOUT = 2.0  # seconds - fail fast when Ollama isn't running
+OLLAMA_READ_TIMEOUT = 15.0  # seconds - max wait for one classification
+OLLAMA_KEEP_ALIVE = "30m"  # how long Ollama keeps Mistral loaded after a request (-1 = forever)
+OLLAMA_POOL_SIZE = 4  # pooled keep-alive connections (early classify + pipeline workers)
+OLLAMA_PRELOAD = True  # load the model into Ollama at startup instead of on the first command
+OLLAMA_STREAMING = True  # stream tokens and cancel generation once the classification JSON is complete
+OLLAMA_PROMPT_CACHE = "prefix"  # "prefix" = static prefix first (Ollama reuses its KV cache), "context" = prime once, send context tokens
+OLLAMA_RAW_TEMPLATE = ("[INST] ", " [/INST]")  # model chat template applied by us in "context" mode (raw prompts)
+CLASSIFIER_BATCH_WORKERS = 4  # concurrent Ollama requests in classify_batch (capped at OLLAMA_POOL_SIZE)
+
+# Local Classifier (fast path in front of Ollama)
+LOCAL_CLASSIFIER_ENABLED = True  # keyword rules + Model 1 answer first; Ollama only when unsure
+LOCAL_CLASSIFIER_THRESHOLD = 0.8  # minimum local confidence to skip the LLM
+LOCAL_RULE_MIN_PROBABILITY = 0.1  # app-launch keyword rule wins unless Model 1 gives its category less than this (system rules always win; an overruled rule goes to the next tier)
+INTENT_MATCHER_ENABLED = True  # nearest-neighbour phrase match between the local tier and the LLM
+INTENT_MATCH_THRESHOLD = 0.5  # minimum cosine similarity to accept a nearest-neighbour match
+INTENT_MATCHER_DIMENSIONS = 4096  # hashed character n-gram features
+
+# Online Learning (confirmed commands → Model 1 via partial_fit, see models/feedback.py)
+ONLINE_LEARNING_ENABLED = True
+FEEDBACK_LOG_PATH = os.path.join(BASE_DIR, 'cache', 'feedback.jsonl')
+ONLINE_LEARNING_PERSIST = True  # save each updated Model 1 as a new artifact version
+ONLINE_LEARNING_KEEP_VERSIONS = 3  # older command_classifier versions are pruned after each save
+
+# Classification Cache (normalized text, numbers masked → category/action)
+CLASSIFIER_CACHE_ENABLED = True
+CLASSIFIER_CACHE_SIZE = 512  # entries (LRU eviction)
+CLASSIFIER_CACHE_TTL = 7 * 24 * 3600  # seconds (None = never expire)
+CLASSIFIER_CACHE_PATH = os.path.join(BASE_DIR, 'cache', 'classifications.json')  # None = memory only
+CLASSIFIER_CACHE_MIN_CONFIDENCE = 0.6  # don't cache fallbacks and low-confidence guesses
+
 # Session Settings
 SESSION_TIMEOUT = 10  # seconds
+PIPELINED_SESSION = False  # True = capture the next command while the previous one executes
+PIPELINE_INFERENCE_WORKERS = 2  # concurrent classify/step-generation workers (execution stays in order)
+
+# Plan Execution (Model 2 steps → ExecutorBridge, see execution/plan_executor.py)
+PLAN_EXECUTION_CATEGORIES = ('APP_LAUNCH', 'WEB_ACTION')  # categories whose generated steps are run as plans
+PLAN_WAIT_CONDITION = "foreground_changed"  # default for 'wait' steps ("sleep" = always the full duration)
+PLAN_WAIT_POLL = 0.01  # seconds between condition checks
+PLAN_WAIT_SETTLE = 0.05  # seconds for the new window to take input once the condition holds
+PLAN_SLOW_SECONDS = 1.5  # plans slower than this are logged with their slowest step
+
+# Input (execution/input_backends.py)
+INPUT_BACKEND = "auto"  # "ctypes" (C executor), "pynput", "recorder" (in-memory, nothing sent); auto = ctypes, then pynput; fails if neither loads
+INPUT_PACE_MS = 0  # delay between key events (0 = whole string/chord in one SendInput; raise for apps that drop fast input)
+
+# System Controls (execution/system_controls.py)
+SYSTEM_CONTROL_BACKEND = "auto"  # "windows" (pycaw + WMI), "fake" (in-memory, nothing changes); auto = windows on Windows, unavailable elsewhere
+VOLUME_STEP = 10  # % for "volume up"/"decrease volume" without a number
+BRIGHTNESS_STEP = 10
+VOLUME_KEY_PERCENT = 2  # % per volume media key press (native fallback, Windows default)
+RAMP_SECONDS = 1.0  # duration of "slowly"/"gradually"/"fade" level changes
+RAMP_INTERVAL = 0.05  # seconds between intermediate levels while ramping
@@ -1,16 +1,107 @@
 """
 Action Router - Routes commands to appropriate executors
-Executes keyboard and mouse actions for IN_APP
+Executes keyboard and mouse actions for IN_APP through the executor bridge's input backend
 """
 import logging
+import re
 from colorama import Fore, Style
 import time
-from pynput.keyboard import Controller, Key
-from pynput.mouse import Controller as MouseController
+import config
+from execution.plan_executor import PlanExecutor
+from models.command_classifier import CommandClassifier
 
 logger = logging.getLogger("ActionRouter")
-keyboard = Controller()
-mouse = MouseController()
+
+POWER_ACTIONS = ['shutdown', 'restart', 'sleep', 'lock']
+UP_WORDS = r'\b(increase|raise|up|louder|brighter|higher|boost)\b'
+DOWN_WORDS = r'\b(decrease|lower|reduce|down|quieter|softer|dim|dimmer)\b'
+# Only used when no verb gives the direction ("more volume"); "lower the brightness more" goes down
+UP_MODIFIERS = r'\bmore\b'
+DOWN_MODIFIERS = r'\bless\b'
+STEP_WORDS = r'\b(\d+)\s*(notch|notches|step|steps|times|clicks?)\b'
+RAMP_WORDS = r'\b(slowly|gradually|fade|ramp)\b'
+
+
+def system_subcategory(classification, raw_command):
+    """
+    volume/brightness/shutdown/restart/sleep/lock for a SYSTEM_ACTION - the classifier's
+    subcategory when present, else the system keyword rules, else the action (set_volume, ...)
+    """
+    subcategory = classification.get('subcategory', '').lower()
+    if subcategory:
+        return subcategory
+    text_lower = raw_command.lower()
+    hits = CommandClassifier.scan(text_lower)
+    found = {hit.label for hit in hits if hit.family == 'system'}
+    for subcategory in CommandClassifier.SYSTEM_PATTERNS:
+        if subcategory in found:
+            return subcategory
+    # "mute", "unmute" and friends are only in the legacy command list
+    legacy = {hit.label for hit in hits if hit.family == 'legacy'}
+    for subcategory in ['volume', 'brightness']:
+        if subcategory in legacy:
+            return subcategory
+    action = classification.get('action', '').lower()
+    if 'volume' in action or 'mute' in action:
+        return 'volume'
+    if 'bright' in action or re.search(r'\b(bright\w*|dim\w*)\b', text_lower):
+        return 'brightness'
+    return action if action in POWER_ACTIONS else ''
+
+
+def _direction(text_lower):
+    """1 (up), -1 (down), 0 (none) or None when the words disagree"""
+    up, down = bool(re.search(UP_WORDS, text_lower)), bool(re.search(DOWN_WORDS, text_lower))
+    if not up and not down:
+        up, down = bool(re.search(UP_MODIFIERS, text_lower)), bool(re.search(DOWN_MODIFIERS, text_lower))
+    if up and down:
+        return None
+    return 1 if up else -1 if down else 0
+
+
+def parse_level_change(text):
+    """
+    Volume/brightness request from command text
+    
+    A number is an absolute level after "to"/"at" or when there is no direction word;
+    with one ("volume up 20", "turn it down 2 notches") it is a relative change
+    
+    Returns:
+        {'mode': 'set', 'level', 'ramp'} for "set volume to 40", "volume 30", "max brightness"
+        {'mode': 'change', 'direction': 1/-1, 'amount' (percent or None), 'steps', 'ramp'} for
+            "increase volume", "turn brightness down by 20", "volume up 3 times" - without an
+            amount the change is steps x the configured step
+        {'mode': 'mute', 'muted': True/False/None (toggle)}
+        or None (nothing found, or up and down words in the same command)
+    """
+    text_lower = text.lower()
+    if re.search(r'\bunmute\b', text_lower):
+        return {'mode': 'mute', 'muted': False}
+    if re.search(r'\bmute\b', text_lower):
+        return {'mode': 'mute', 'muted': None if re.search(r'\btoggle\b', text_lower) else True}
+    
+    ramp = bool(re.search(RAMP_WORDS, text_lower))
+    absolute = re.search(r'\b(?:to|at)\s+(\d+)', text_lower)
+    if absolute:
+        return {'mode': 'set', 'level': int(absolute.group(1)), 'ramp': ramp}
+    if re.search(r'\b(max|maximum|full)\b', text_lower):
+        return {'mode': 'set', 'level': 100, 'ramp': ramp}
+    if re.search(r'\b(min|minimum)\b', text_lower):
+        return {'mode': 'set', 'level': 0, 'ramp': ramp}
+    
+    direction = _direction(text_lower)
+    if direction is None:
+        return None
+    steps = re.search(STEP_WORDS, text_lower)
+    number = re.search(r'(\d+)', text_lower)
+    if direction == 0:
+        return {'mode': 'set', 'level': int(number.group(1)), 'ramp': ramp} if number and not steps else None
+    if steps:
+        return {'mode': 'change', 'direction': direction, 'amount': None, 'steps': int(steps.group(1)),
+                'ramp': ramp}
+    return {'mode': 'change', 'direction': direction, 'amount': int(number.group(1)) if number else None,
+            'steps': 1, 'ramp': ramp}
+
 
 class ActionRouter:
     """Routes commands and executes steps"""
@@ -19,6 +110,7 @@ class ActionRouter:
         """Initialize action router"""
         self.system_executor = system_executor
         self.screenshot_handler = screenshot_handler
+        self.plan_executor = PlanExecutor(system_executor.executor)
         logger.info("✓ Action router initialized")
     
     def execute(self, category, steps, entities, raw_command, classification):
@@ -26,7 +118,9 @@ class ActionRouter:
         logger.info(f"📍 Routing {category} command")
         
         try:
-            if category == 'APP_LAUNCH':
+            if steps and category in config.PLAN_EXECUTION_CATEGORIES:
+                return self._execute_plan(category, steps, entities)
+            elif category == 'APP_LAUNCH':
                 return self._execute_app_launch(entities)
             elif category == 'SYSTEM_ACTION':
                 return self._execute_system_action(entities, classification, raw_command)
@@ -40,6 +134,18 @@ class ActionRouter:
             logger.error(f"❌ Execution error: {e}")
             return {"success": False, "error": str(e)}
     
+    def _execute_plan(self, category, steps, entities):
+        """Run Model 2's steps through the executor bridge"""
+        logger.info(f"🧩 Running {len(steps)}-step plan for {category}")
+        result = self.plan_executor.run(steps, label=category)
+        if result.get('success'):
+            app_name = entities.get('app_name', '')
+            done = f"Opened {app_name}" if category == 'APP_LAUNCH' and app_name else result['message']
+            print(f"{Fore.GREEN}✅ {done} ({result['seconds']:.2f}s){Style.RESET_ALL}")
+        else:
+            logger.error(f"❌ Plan failed at step {result.get('failed_steps')}: {result.get('error')}")
+        return result
+    
     def _execute_app_launch(self, entities):
         """Launch application"""
         app_name = entities.get('app_name', '').lower().rstrip('.')
@@ -55,32 +161,35 @@ class ActionRouter:
             return {"success": False, "error": str(e)}
     
     def _execute_system_action(self, entities, classification, raw_command):
-        """Execute volume, brightness, power"""
-        subcategory = classification.get('subcategory', '').lower()
+        """Execute volume, brightness (absolute, relative, mute, ramped) and power"""
+        subcategory = system_subcategory(classification, raw_command)
         logger.info(f"⚙️ System action: {subcategory}")
         
         try:
-            if subcategory == 'volume':
-                import re
-                match = re.search(r'(\d+)', raw_command)
-                if match:
-                    level = int(match.group(1))
-                    result = self.system_executor.set_volume(level)
-                    if result.get('success'):
-                        print(f"{Fore.GREEN}✅ {result['message']}{Style.RESET_ALL}")
-                    return result
-                return {"success": False, "error": "No volume level found"}
-            
-            elif subcategory == 'brightness':
-                import re
-                match = re.search(r'(\d+)', raw_command)
-                if match:
-                    level = int(match.group(1))
-                    result = self.system_executor.set_brightness(level)
-                    if result.get('success'):
-                        print(f"{Fore.GREEN}✅ {result['message']}{Style.RESET_ALL}")
-                    return result
-                return {"success": False, "error": "No brightness level found"}
+            if subcategory in ['volume', 'brightness']:
+                change = parse_level_change(raw_command)
+                if change is None:
+                    return {"success": False, "error": f"No {subcategory} level found"}
+                if change['mode'] == 'mute':
+                    if subcategory != 'volume':
+                        return {"success": False, "error": "Only volume can be muted"}
+                    result = self.system_executor.set_mute(change['muted'])
+                elif subcategory == 'volume':
+                    if change['mode'] == 'set':
+                        result = self.system_executor.set_volume(change['level'], ramp=change['ramp'])
+                    else:
+                        delta = change['amount'] or change['steps'] * config.VOLUME_STEP
+                        result = self.system_executor.change_volume(delta * change['direction'], ramp=change['ramp'])
+                else:
+                    if change['mode'] == 'set':
+                        result = self.system_executor.set_brightness(change['level'], ramp=change['ramp'])
+                    else:
+                        delta = change['amount'] or change['steps'] * config.BRIGHTNESS_STEP
+                        result = self.system_executor.change_brightness(delta * change['direction'],
+                                                                        ramp=change['ramp'])
+                if result.get('success'):
+                    print(f"{Fore.GREEN}✅ {result['message']}{Style.RESET_ALL}")
+                return result
             
             elif subcategory in ['shutdown', 'restart', 'sleep', 'lock']:
                 result = self.system_executor.execute_system_command(subcategory)
@@ -103,17 +212,18 @@ class ActionRouter:
         try:
             if action == 'close':
                 # Alt+F4 to close window
-                keyboard.press(Key.alt)
-                keyboard.press(Key.f4)
-                keyboard.release(Key.f4)
-                keyboard.release(Key.alt)
+                result = self.system_executor.executor.press_keys('alt+f4')
+                if not result.get('success'):
+                    return result
                 time.sleep(0.5)
                 print(f"{Fore.GREEN}✅ Window closed{Style.RESET_ALL}")
                 return {"success": True, "message": "Window closed"}
             
             elif action == 'click':
-                # Click center of screen
-                mouse.click()
+                # Click where the pointer is
+                result = self.system_executor.executor.execute_action('MOUSE_CLICK', {}, {'button': 'left'})
+                if not result.get('success'):
+                    return result
                 time.sleep(0.3)
                 print(f"{Fore.GREEN}✅ Clicked{Style.RESET_ALL}")
                 return {"success": True, "message": "Clicked"}
@@ -124,7 +234,9 @@ class ActionRouter:
                 match = re.search(r'type\s+(.+)', raw_command, re.IGNORECASE)
                 if match:
                     text = match.group(1)
-                    keyboard.type(text)
+                    result = self.system_executor.executor.type_text(text)
+                    if not result.get('success'):
+                        return result
                     time.sleep(0.2)
                     print(f"{Fore.GREEN}✅ Typed: {text}{Style.RESET_ALL}")
                     return {"success": True, "message": f"Typed: {text}"}
@@ -1,4 +1,10 @@
+#ifdef _WIN32
 #include <windows.h>
+#else
+#include "input_stub.h"  /* records events instead of injecting them */
+#endif
+#include <stdlib.h>
+#include <string.h>
 #include "executor.h"
 
 int mouse_move(int x, int y) {
@@ -46,18 +52,112 @@ int keyboard_press_key(int vk_code) {
 }
 
 int keyboard_type_string(const char* text) {
-    if (!text) return -1;
-    while (*text) {
-        INPUT input = {0};
-        input.type = INPUT_KEYBOARD;
-        input.ki.wScan = *text;
-        input.ki.dwFlags = KEYEVENTF_UNICODE;
-        SendInput(1, &input, sizeof(INPUT));
-        Sleep(20);
-        input.ki.dwFlags = KEYEVENTF_UNICODE | KEYEVENTF_KEYUP;
-        SendInput(1, &input, sizeof(INPUT));
-        Sleep(20);
-        text++;
+    return keyboard_type_string_paced(text, 0);
+}
+
+/* Submit events in one SendInput call, or one at a time pace_ms apart */
+static int send_events(INPUT* inputs, int count, int pace_ms) {
+    if (count <= 0) return 0;
+    if (pace_ms <= 0) {
+        return SendInput((UINT)count, inputs, sizeof(INPUT)) == (UINT)count ? 0 : -1;
+    }
+    for (int i = 0; i < count; i++) {
+        if (SendInput(1, &inputs[i], sizeof(INPUT)) != 1) return -1;
+        if (i + 1 < count) Sleep(pace_ms);
     }
     return 0;
-}
\ No newline at end of file
+}
+
+static int is_extended_key(int vk_code) {
+    return (vk_code >= 0x21 && vk_code <= 0x28)   /* page up/down, end, home, arrows */
+        || vk_code == 0x2D || vk_code == 0x2E     /* insert, delete */
+        || vk_code == 0x5B || vk_code == 0x5C     /* windows keys */
+        || vk_code == 0xA3 || vk_code == 0xA5;    /* right ctrl, right alt */
+}
+
+/* UTF-8 -> UTF-16 code units (surrogate pairs above U+FFFF); returns the unit count */
+static int utf8_to_utf16(const char* text, WORD* out) {
+    const unsigned char* p = (const unsigned char*)text;
+    int count = 0;
+    while (*p) {
+        unsigned int cp;
+        int extra;
+        if (*p < 0x80) { cp = *p; extra = 0; }
+        else if ((*p & 0xE0) == 0xC0) { cp = *p & 0x1F; extra = 1; }
+        else if ((*p & 0xF0) == 0xE0) { cp = *p & 0x0F; extra = 2; }
+        else if ((*p & 0xF8) == 0xF0) { cp = *p & 0x07; extra = 3; }
+        else { cp = 0xFFFD; extra = 0; }
+        p++;
+        for (int i = 0; i < extra; i++) {
+            if ((*p & 0xC0) != 0x80) { cp = 0xFFFD; break; }
+            cp = (cp << 6) | (*p++ & 0x3F);
+        }
+        if (cp >= 0x10000) {
+            cp -= 0x10000;
+            out[count++] = (WORD)(0xD800 | (cp >> 10));
+            out[count++] = (WORD)(0xDC00 | (cp & 0x3FF));
+        } else {
+            out[count++] = (WORD)cp;
+        }
+    }
+    return count;
+}
+
+int keyboard_type_string_paced(const char* text, int pace_ms) {
+    if (!text) return -1;
+    size_t length = strlen(text);
+    WORD* units = malloc((length + 1) * sizeof(WORD));
+    INPUT* inputs = calloc(length * 2 + 1, sizeof(INPUT));
+    if (!units || !inputs) {
+        free(units);
+        free(inputs);
+        return -1;
+    }
+    int count = utf8_to_utf16(text, units);
+    for (int i = 0; i < count; i++) {
+        inputs[2 * i].type = INPUT_KEYBOARD;
+        inputs[2 * i].ki.wScan = units[i];
+        inputs[2 * i].ki.dwFlags = KEYEVENTF_UNICODE;
+        inputs[2 * i + 1].type = INPUT_KEYBOARD;
+        inputs[2 * i + 1].ki.wScan = units[i];
+        inputs[2 * i + 1].ki.dwFlags = KEYEVENTF_UNICODE | KEYEVENTF_KEYUP;
+    }
+    int result = send_events(inputs, count * 2, pace_ms);
+    free(units);
+    free(inputs);
+    return result;
+}
+
+int keyboard_chord(const int* vk_codes, int count, int pace_ms) {
+    if (!vk_codes || count <= 0 || count > 8) return -1;
+    INPUT inputs[16] = {0};
+    for (int i = 0; i < count; i++) {
+        DWORD extended = is_extended_key(vk_codes[i]) ? KEYEVENTF_EXTENDEDKEY : 0;
+        /* press in order, release in reverse: ctrl down, l down, l up, ctrl up */
+        inputs[i].type = INPUT_KEYBOARD;
+        inputs[i].ki.wVk = (WORD)vk_codes[i];
+        inputs[i].ki.dwFlags = extended;
+        inputs[2 * count - 1 - i].type = INPUT_KEYBOARD;
+        inputs[2 * count - 1 - i].ki.wVk = (WORD)vk_codes[i];
+        inputs[2 * count - 1 - i].ki.dwFlags = extended | KEYEVENTF_KEYUP;
+    }
+    return send_events(inputs, count * 2, pace_ms);
+}
+
+int keyboard_send_events(const int* codes, const int* flags, int count, int pace_ms) {
+    if (!codes || !flags || count < 0) return -1;
+    INPUT* inputs = calloc(count + 1, sizeof(INPUT));
+    if (!inputs) return -1;
+    for (int i = 0; i < count; i++) {
+        inputs[i].type = INPUT_KEYBOARD;
+        if (flags[i] & KEYEVENTF_UNICODE) {
+            inputs[i].ki.wScan = (WORD)codes[i];
+        } else {
+            inputs[i].ki.wVk = (WORD)codes[i];
+        }
+        inputs[i].ki.dwFlags = (DWORD)flags[i];
+    }
+    int result = send_events(inputs, count, pace_ms);
+    free(inputs);
+    return result;
+}
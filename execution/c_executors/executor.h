@@ -4,4 +4,20 @@ int mouse_move(int x, int y);
 int mouse_click(int button);
 int mouse_scroll(int amount);
 int keyboard_press_key(int vk_code);
-int keyboard_type_string(const char* text);
\ No newline at end of file
+int keyboard_type_string(const char* text);
+
+/* Batched input: each call is one SendInput (pace_ms > 0 sends events pace_ms apart) */
+int keyboard_type_string_paced(const char* text, int pace_ms);
+int keyboard_chord(const int* vk_codes, int count, int pace_ms);
+int keyboard_send_events(const int* codes, const int* flags, int count, int pace_ms);
+
+/* System controls (system_commands.c): media keys sent in one SendInput */
+int system_volume_up(void);
+int system_volume_down(void);
+int system_volume_mute(void);
+int system_brightness_up(void);
+int system_brightness_down(void);
+int system_volume_steps(int steps);
+int system_sleep(void);
+int system_shutdown(void);
+int system_restart(void);
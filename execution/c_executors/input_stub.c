@@ -0,0 +1,77 @@
+/*
+ * Recording stand-in for the Win32 input API (non-Windows builds, see input_stub.h)
+ */
+#include <string.h>
+#include <time.h>
+#include "input_stub.h"
+
+#define INPUT_STUB_CAPACITY 4096
+
+static INPUT stub_events[INPUT_STUB_CAPACITY];
+static int stub_event_count = 0;
+static int stub_call_count = 0;
+
+UINT SendInput(UINT count, INPUT* inputs, int size) {
+    (void)size;
+    stub_call_count++;
+    UINT i;
+    for (i = 0; i < count && stub_event_count < INPUT_STUB_CAPACITY; i++) {
+        stub_events[stub_event_count++] = inputs[i];
+    }
+    return i;
+}
+
+int SetCursorPos(int x, int y) {
+    INPUT input;
+    memset(&input, 0, sizeof(input));
+    input.type = INPUT_MOUSE;
+    input.mi.dx = x;
+    input.mi.dy = y;
+    input.mi.dwFlags = MOUSEEVENTF_MOVE;
+    SendInput(1, &input, sizeof(INPUT));
+    return 1;
+}
+
+void keybd_event(BYTE vk, BYTE scan, DWORD flags, ULONG_PTR extra) {
+    (void)extra;
+    INPUT input;
+    memset(&input, 0, sizeof(input));
+    input.type = INPUT_KEYBOARD;
+    input.ki.wVk = vk;
+    input.ki.wScan = scan;
+    input.ki.dwFlags = flags;
+    SendInput(1, &input, sizeof(INPUT));
+}
+
+void Sleep(DWORD ms) {
+    struct timespec delay = {ms / 1000, (long)(ms % 1000) * 1000000L};
+    nanosleep(&delay, NULL);
+}
+
+/* Recorded events: type (INPUT_*), code (wVk, wScan for KEYEVENTF_UNICODE, mouseData for mouse) and dwFlags */
+int input_recorded_count(void) {
+    return stub_event_count;
+}
+
+int input_recorded_calls(void) {
+    return stub_call_count;
+}
+
+int input_recorded_event(int index, int* type, int* code, int* flags) {
+    if (index < 0 || index >= stub_event_count) return -1;
+    INPUT* input = &stub_events[index];
+    *type = (int)input->type;
+    if (input->type == INPUT_KEYBOARD) {
+        *code = (input->ki.dwFlags & KEYEVENTF_UNICODE) ? input->ki.wScan : input->ki.wVk;
+        *flags = (int)input->ki.dwFlags;
+    } else {
+        *code = (int)input->mi.mouseData;
+        *flags = (int)input->mi.dwFlags;
+    }
+    return 0;
+}
+
+void input_reset_recording(void) {
+    stub_event_count = 0;
+    stub_call_count = 0;
+}
@@ -0,0 +1,71 @@
+/*
+ * Recording stand-in for the Win32 input API (non-Windows builds)
+ * SendInput appends events to an in-memory log instead of injecting them, so
+ * executor.so can be loaded and checked on Linux. Read back with input_recorded_*
+ * (definitions in input_stub.c)
+ */
+#ifndef INPUT_STUB_H
+#define INPUT_STUB_H
+
+typedef unsigned char BYTE;
+typedef unsigned short WORD;
+typedef unsigned int DWORD;
+typedef unsigned int UINT;
+typedef long LONG;
+typedef unsigned long ULONG_PTR;
+
+#define INPUT_MOUSE 0
+#define INPUT_KEYBOARD 1
+
+#define KEYEVENTF_EXTENDEDKEY 0x0001
+#define KEYEVENTF_KEYUP 0x0002
+#define KEYEVENTF_UNICODE 0x0004
+
+#define MOUSEEVENTF_MOVE 0x0001
+#define MOUSEEVENTF_LEFTDOWN 0x0002
+#define MOUSEEVENTF_LEFTUP 0x0004
+#define MOUSEEVENTF_RIGHTDOWN 0x0008
+#define MOUSEEVENTF_RIGHTUP 0x0010
+#define MOUSEEVENTF_WHEEL 0x0800
+
+#define VK_CONTROL 0x11
+#define VK_F5 0x74
+#define VK_F6 0x75
+#define VK_VOLUME_MUTE 0xAD
+#define VK_VOLUME_DOWN 0xAE
+#define VK_VOLUME_UP 0xAF
+
+typedef struct {
+    LONG dx;
+    LONG dy;
+    DWORD mouseData;
+    DWORD dwFlags;
+    DWORD time;
+} MOUSEINPUT;
+
+typedef struct {
+    WORD wVk;
+    WORD wScan;
+    DWORD dwFlags;
+    DWORD time;
+} KEYBDINPUT;
+
+typedef struct {
+    DWORD type;
+    union {
+        MOUSEINPUT mi;
+        KEYBDINPUT ki;
+    };
+} INPUT;
+
+UINT SendInput(UINT count, INPUT* inputs, int size);
+void keybd_event(BYTE vk, BYTE scan, DWORD flags, ULONG_PTR extra);
+int SetCursorPos(int x, int y);
+void Sleep(DWORD ms);
+
+int input_recorded_count(void);
+int input_recorded_calls(void);
+int input_recorded_event(int index, int* type, int* code, int* flags);
+void input_reset_recording(void);
+
+#endif
@@ -1,45 +1,70 @@
+#ifdef _WIN32
 #include <windows.h>
 #include <powrprof.h>
+#else
+#include "input_stub.h"  /* records events instead of injecting them */
+#endif
+#include <stdlib.h>
+#include <string.h>
+#include "executor.h"
+
+/*
+ * Taps vk `count` times (optionally with a held modifier) in one SendInput.
+ * The media keys act on key down, so no delay between down and up is needed.
+ */
+static int tap_keys(WORD vk, WORD modifier, int count) {
+    if (count <= 0) return 0;
+    int total = count * 2 + (modifier ? 2 : 0);
+    INPUT* inputs = (INPUT*)calloc((size_t)total, sizeof(INPUT));
+    if (!inputs) return -1;
+    int n = 0;
+    if (modifier) {
+        inputs[n].type = INPUT_KEYBOARD;
+        inputs[n++].ki.wVk = modifier;
+    }
+    for (int i = 0; i < count; i++) {
+        inputs[n].type = INPUT_KEYBOARD;
+        inputs[n++].ki.wVk = vk;
+        inputs[n].type = INPUT_KEYBOARD;
+        inputs[n].ki.wVk = vk;
+        inputs[n++].ki.dwFlags = KEYEVENTF_KEYUP;
+    }
+    if (modifier) {
+        inputs[n].type = INPUT_KEYBOARD;
+        inputs[n].ki.wVk = modifier;
+        inputs[n++].ki.dwFlags = KEYEVENTF_KEYUP;
+    }
+    int result = SendInput((UINT)n, inputs, sizeof(INPUT)) == (UINT)n ? 0 : -1;
+    free(inputs);
+    return result;
+}
 
 int system_volume_up() {
-    keybd_event(VK_VOLUME_UP, 0, 0, 0);
-    Sleep(50);
-    keybd_event(VK_VOLUME_UP, 0, KEYEVENTF_KEYUP, 0);
-    return 0;
+    return tap_keys(VK_VOLUME_UP, 0, 1);
 }
 
 int system_volume_down() {
-    keybd_event(VK_VOLUME_DOWN, 0, 0, 0);
-    Sleep(50);
-    keybd_event(VK_VOLUME_DOWN, 0, KEYEVENTF_KEYUP, 0);
-    return 0;
+    return tap_keys(VK_VOLUME_DOWN, 0, 1);
 }
 
 int system_volume_mute() {
-    keybd_event(VK_VOLUME_MUTE, 0, 0, 0);
-    Sleep(50);
-    keybd_event(VK_VOLUME_MUTE, 0, KEYEVENTF_KEYUP, 0);
-    return 0;
+    return tap_keys(VK_VOLUME_MUTE, 0, 1);
 }
 
 int system_brightness_up() {
-    keybd_event(VK_CONTROL, 0, 0, 0);
-    keybd_event(VK_F6, 0, 0, 0);
-    Sleep(50);
-    keybd_event(VK_F6, 0, KEYEVENTF_KEYUP, 0);
-    keybd_event(VK_CONTROL, 0, KEYEVENTF_KEYUP, 0);
-    return 0;
+    return tap_keys(VK_F6, VK_CONTROL, 1);
 }
 
 int system_brightness_down() {
-    keybd_event(VK_CONTROL, 0, 0, 0);
-    keybd_event(VK_F5, 0, 0, 0);
-    Sleep(50);
-    keybd_event(VK_F5, 0, KEYEVENTF_KEYUP, 0);
-    keybd_event(VK_CONTROL, 0, KEYEVENTF_KEYUP, 0);
-    return 0;
+    return tap_keys(VK_F5, VK_CONTROL, 1);
+}
+
+/* Relative steps: positive = up, negative = down (one volume key step is 2% on Windows) */
+int system_volume_steps(int steps) {
+    return steps >= 0 ? tap_keys(VK_VOLUME_UP, 0, steps) : tap_keys(VK_VOLUME_DOWN, 0, -steps);
 }
 
+#ifdef _WIN32
 int system_sleep() {
     SetSuspendState(FALSE, FALSE, FALSE);
     return 0;
@@ -74,3 +99,17 @@ int system_restart() {
     ExitWindowsEx(EWX_REBOOT | EWX_FORCE, 0);
     return 0;
 }
+#else
+/* Power actions are Windows-only; the stub build refuses them */
+int system_sleep() {
+    return -1;
+}
+
+int system_shutdown() {
+    return -1;
+}
+
+int system_restart() {
+    return -1;
+}
+#endif
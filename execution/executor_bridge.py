@@ -1,69 +1,28 @@
 """
 Executor Bridge - Complete C Integration
-Bridges Python to C executors with full function support
+Bridges Python to the input backends (C executors first, see execution/input_backends.py)
 """
 
-import ctypes
-import os
 import platform
-from pathlib import Path
+import time
+import config
+from execution.input_backends import select_backend, parse_keys
 from utils.logger import setup_logger
 
 
 class ExecutorBridge:
-    """Bridge between Python and C executors"""
+    """Bridge between Python and the input backend"""
     
-    def __init__(self):
+    def __init__(self, backend=None):
+        """
+        Args:
+            backend: InputBackend (default: select_backend() with INPUT_BACKEND)
+        """
         self.logger = setup_logger('ExecutorBridge')
         self.system_platform = platform.system()
-        self.c_lib = None
-        
-        # Load C library
-        try:
-            lib_path = self._get_library_path()
-            self.c_lib = ctypes.CDLL(lib_path)
-            self._setup_functions()
-            self.logger.info("C executor library loaded successfully")
-        except Exception as e:
-            self.logger.error(f"Failed to load C library: {e}")
-            raise Exception("C executor library is REQUIRED. Please compile C executors.")
-    
-    def _get_library_path(self):
-        """Get path to compiled C library"""
-        base_path = Path(__file__).parent / 'c_executors'
-        
-        if self.system_platform == 'Windows':
-            lib_name = 'executor.dll'
-        elif self.system_platform == 'Darwin':
-            lib_name = 'executor.dylib'
-        else:
-            lib_name = 'executor.so'
-        
-        lib_path = base_path / lib_name
-        
-        if not lib_path.exists():
-            raise FileNotFoundError(f"C library not found at {lib_path}")
-        
-        return str(lib_path.absolute())
-    
-    def _setup_functions(self):
-        """Setup C function signatures"""
-        # Mouse functions
-        self.c_lib.mouse_move.argtypes = [ctypes.c_int, ctypes.c_int]
-        self.c_lib.mouse_move.restype = ctypes.c_int
-        
-        self.c_lib.mouse_click.argtypes = [ctypes.c_int]
-        self.c_lib.mouse_click.restype = ctypes.c_int
-        
-        self.c_lib.mouse_scroll.argtypes = [ctypes.c_int]
-        self.c_lib.mouse_scroll.restype = ctypes.c_int
-        
-        # Keyboard functions
-        self.c_lib.keyboard_press_key.argtypes = [ctypes.c_int]
-        self.c_lib.keyboard_press_key.restype = ctypes.c_int
-        
-        self.c_lib.keyboard_type_string.argtypes = [ctypes.c_char_p]
-        self.c_lib.keyboard_type_string.restype = ctypes.c_int
+        self.backend = backend or select_backend()
+        self.c_lib = getattr(self.backend, 'lib', None)  # None unless the ctypes backend is in use
+        self.logger.info(f"Executor bridge using {self.backend.name} input")
     
     def launch_application(self, app_name):
         """Launch application (Windows: Win+Search+Enter)"""
@@ -71,17 +30,15 @@ class ExecutorBridge:
             self.logger.info(f"Launching: {app_name}")
             
             # Press Windows key
-            self.c_lib.keyboard_press_key(0x5B)  # VK_LWIN
-            import time
+            self.backend.press_keys(['win'])
             time.sleep(0.5)
             
             # Type app name
-            app_bytes = app_name.encode('utf-8')
-            self.c_lib.keyboard_type_string(app_bytes)
+            self.backend.type_text(app_name, config.INPUT_PACE_MS)
             time.sleep(0.5)
             
             # Press Enter
-            self.c_lib.keyboard_press_key(0x0D)  # VK_RETURN
+            self.backend.press_keys(['enter'])
             
             return {'success': True}
         except Exception as e:
@@ -92,31 +49,23 @@ class ExecutorBridge:
         """Execute generic action"""
         try:
             if action_type == 'MOUSE_CLICK':
-                x = coordinates.get('x', 0)
-                y = coordinates.get('y', 0)
-                self.c_lib.mouse_move(x, y)
-                import time
-                time.sleep(0.1)
-                button = 0 if parameters.get('button') == 'left' else 1
-                result = self.c_lib.mouse_click(button)
-                return {'success': result == 0}
+                if coordinates:  # no coordinates = click where the pointer is
+                    x = coordinates.get('x', 0)
+                    y = coordinates.get('y', 0)
+                    self.backend.mouse_move(x, y)
+                    time.sleep(0.1)
+                button = 'left' if parameters.get('button', 'left') == 'left' else 'right'
+                return {'success': self.backend.mouse_click(button)}
             
             elif action_type == 'TYPE_TEXT':
-                text = parameters.get('text', '')
-                text_bytes = text.encode('utf-8')
-                result = self.c_lib.keyboard_type_string(text_bytes)
-                return {'success': result == 0}
+                return self.type_text(parameters.get('text', ''), parameters.get('pace_ms'))
             
             elif action_type == 'PRESS_KEY':
-                key = parameters.get('key', '')
-                vk_code = self._key_to_vk(key)
-                result = self.c_lib.keyboard_press_key(vk_code)
-                return {'success': result == 0}
+                return self.press_keys(parameters.get('key', ''), parameters.get('pace_ms'))
             
             elif action_type == 'MOUSE_SCROLL':
                 amount = parameters.get('amount', 0)
-                result = self.c_lib.mouse_scroll(amount)
-                return {'success': result == 0}
+                return {'success': self.backend.mouse_scroll(amount)}
             
             else:
                 return {'success': False, 'error': f'Unknown action: {action_type}'}
@@ -125,17 +74,53 @@ class ExecutorBridge:
             self.logger.error(f"Action execution error: {e}")
             return {'success': False, 'error': str(e)}
     
-    def _key_to_vk(self, key):
-        """Convert key string to virtual key code"""
-        key_map = {
-            'enter': 0x0D,
-            'tab': 0x09,
-            'escape': 0x1B,
-            'space': 0x20,
-            'backspace': 0x08,
-            'delete': 0x2E,
-            'ctrl+l': 0x4C,  # Simplified
-            'ctrl+c': 0x43,
-            'ctrl+v': 0x56,
-        }
-        return key_map.get(key.lower(), 0x0D)
+    def type_text(self, text, pace_ms=None):
+        """
+        Type a string (any Unicode) - one SendInput for the whole string with the C backend
+        
+        Args:
+            text: Text to type
+            pace_ms: Delay between key events (None = INPUT_PACE_MS, 0 = all at once)
+        """
+        pace = config.INPUT_PACE_MS if pace_ms is None else pace_ms
+        return {'success': self.backend.type_text(text, pace)}
+    
+    def press_keys(self, key, pace_ms=None):
+        """
+        Press a key or chord such as 'enter' or 'ctrl+shift+t' (held in order, released in reverse)
+        """
+        keys = parse_keys(key)
+        if not keys:
+            return {'success': False, 'error': f'Unknown key: {key}'}
+        pace = config.INPUT_PACE_MS if pace_ms is None else pace_ms
+        return {'success': self.backend.press_keys(keys, pace)}
+    
+    def execute_batch(self, actions):
+        """
+        Execute adjacent input actions back to back (stops at the first failure)
+        Runs of typing and key presses go to the backend as one batch (one SendInput in C)
+        
+        Args:
+            actions: List of (action_type, coordinates, parameters)
+        """
+        try:
+            if all(action_type in ('TYPE_TEXT', 'PRESS_KEY') for action_type, _, _ in actions):
+                items = []
+                for action_type, _, parameters in actions:
+                    if action_type == 'TYPE_TEXT':
+                        items.append(('type', parameters.get('text', '')))
+                        continue
+                    keys = parse_keys(parameters.get('key', ''))
+                    if not keys:
+                        return {'success': False, 'error': f"Unknown key: {parameters.get('key', '')}"}
+                    items.append(('keys', keys))
+                return {'success': self.backend.send_batch(items, config.INPUT_PACE_MS)}
+        except Exception as e:
+            self.logger.error(f"Batch execution error: {e}")
+            return {'success': False, 'error': str(e)}
+        
+        for action_type, coordinates, parameters in actions:
+            result = self.execute_action(action_type, coordinates, parameters)
+            if not result.get('success'):
+                return result
+        return {'success': True}
@@ -0,0 +1,374 @@
+"""
+Input Backends - keyboard/mouse injection behind one interface
+ctypes   = C executor library (executor.dll/.so/.dylib, batched SendInput)
+pynput   = pure-Python fallback when the C library isn't built
+recorder = in-memory event log with timestamps (headless benchmarks and checks)
+Keys are passed as names ('ctrl', 'l', 'f4'); each backend maps them to its own codes
+"""
+import abc
+import ctypes
+import logging
+import platform
+import time
+from collections import namedtuple
+from pathlib import Path
+import config
+
+logger = logging.getLogger("InputBackend")
+
+# Windows virtual-key codes (letters, digits and F-keys are added below)
+VK_CODES = {
+    'enter': 0x0D, 'return': 0x0D, 'tab': 0x09, 'escape': 0x1B, 'esc': 0x1B, 'space': 0x20,
+    'backspace': 0x08, 'delete': 0x2E, 'del': 0x2E, 'insert': 0x2D,
+    'home': 0x24, 'end': 0x23, 'pageup': 0x21, 'pagedown': 0x22,
+    'left': 0x25, 'up': 0x26, 'right': 0x27, 'down': 0x28,
+    'shift': 0x10, 'ctrl': 0x11, 'control': 0x11, 'alt': 0x12, 'win': 0x5B, 'windows': 0x5B,
+}
+VK_CODES.update({chr(c).lower(): c for c in range(ord('A'), ord('Z') + 1)})
+VK_CODES.update({chr(c): c for c in range(ord('0'), ord('9') + 1)})
+VK_CODES.update({f'f{n}': 0x6F + n for n in range(1, 13)})
+
+KEYEVENTF_KEYUP = 0x0002
+KEYEVENTF_UNICODE = 0x0004
+
+
+def parse_keys(key):
+    """'ctrl+l' -> ['ctrl', 'l'] (None if any part is not a known key name)"""
+    names = [part.strip() for part in key.lower().split('+') if part.strip()]
+    if not names or any(name not in VK_CODES for name in names):
+        return None
+    return names
+
+
+class InputBackend(abc.ABC):
+    """
+    Interface used by ExecutorBridge; methods return True on success
+    Batch items are ('type', text) or ('keys', [names])
+    """
+    
+    name = 'base'
+    
+    @abc.abstractmethod
+    def type_text(self, text, pace_ms=0):
+        """Type text, pace_ms between characters"""
+    
+    @abc.abstractmethod
+    def press_keys(self, keys, pace_ms=0):
+        """Press keys in order, release in reverse"""
+    
+    @abc.abstractmethod
+    def mouse_move(self, x, y):
+        """Move the cursor to screen coordinates"""
+    
+    @abc.abstractmethod
+    def mouse_click(self, button='left'):
+        """Click 'left' or 'right' at the cursor"""
+    
+    @abc.abstractmethod
+    def mouse_scroll(self, amount):
+        """amount in wheel delta units (120 = one notch, positive = up)"""
+    
+    def send_batch(self, items, pace_ms=0):
+        """Send typing and key presses back to back (backends may submit them as one call)"""
+        for kind, value in items:
+            ok = self.type_text(value, pace_ms) if kind == 'type' else self.press_keys(value, pace_ms)
+            if not ok:
+                return False
+        return True
+
+
+class CtypesBackend(InputBackend):
+    """C executor library; one SendInput per string, chord or batch when built from this tree"""
+    
+    name = 'ctypes'
+    
+    def __init__(self, lib_path=None):
+        """
+        Raises:
+            FileNotFoundError / OSError: library missing or not loadable
+        """
+        self.lib = ctypes.CDLL(lib_path or self.library_path())
+        self._setup_functions()
+    
+    @staticmethod
+    def library_path():
+        """Path to the compiled C library for this platform"""
+        base_path = Path(__file__).parent / 'c_executors'
+        system_platform = platform.system()
+        
+        if system_platform == 'Windows':
+            lib_name = 'executor.dll'
+        elif system_platform == 'Darwin':
+            lib_name = 'executor.dylib'
+        else:
+            lib_name = 'executor.so'
+        
+        lib_path = base_path / lib_name
+        if not lib_path.exists():
+            raise FileNotFoundError(f"C library not found at {lib_path}")
+        return str(lib_path.absolute())
+    
+    def _setup_functions(self):
+        """Setup C function signatures"""
+        # Mouse functions
+        self.lib.mouse_move.argtypes = [ctypes.c_int, ctypes.c_int]
+        self.lib.mouse_move.restype = ctypes.c_int
+        
+        self.lib.mouse_click.argtypes = [ctypes.c_int]
+        self.lib.mouse_click.restype = ctypes.c_int
+        
+        self.lib.mouse_scroll.argtypes = [ctypes.c_int]
+        self.lib.mouse_scroll.restype = ctypes.c_int
+        
+        # Keyboard functions
+        self.lib.keyboard_press_key.argtypes = [ctypes.c_int]
+        self.lib.keyboard_press_key.restype = ctypes.c_int
+        
+        self.lib.keyboard_type_string.argtypes = [ctypes.c_char_p]
+        self.lib.keyboard_type_string.restype = ctypes.c_int
+        
+        # Batched input - one SendInput per string/chord (binaries built before it lack these)
+        self.batched = hasattr(self.lib, 'keyboard_chord')
+        if self.batched:
+            self.lib.keyboard_type_string_paced.argtypes = [ctypes.c_char_p, ctypes.c_int]
+            self.lib.keyboard_type_string_paced.restype = ctypes.c_int
+            
+            self.lib.keyboard_chord.argtypes = [ctypes.POINTER(ctypes.c_int), ctypes.c_int, ctypes.c_int]
+            self.lib.keyboard_chord.restype = ctypes.c_int
+            
+            self.lib.keyboard_send_events.argtypes = [ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int),
+                                                      ctypes.c_int, ctypes.c_int]
+            self.lib.keyboard_send_events.restype = ctypes.c_int
+        else:
+            logger.warning("⚠️ Executor library has no batched input - rebuild with make in execution/c_executors")
+        
+        # Recording stub (non-Windows builds): events are logged instead of sent
+        self.recording = hasattr(self.lib, 'input_recorded_count')
+        if self.recording:
+            self.lib.input_recorded_event.argtypes = [ctypes.c_int] + [ctypes.POINTER(ctypes.c_int)] * 3
+            self.lib.input_recorded_event.restype = ctypes.c_int
+    
+    def type_text(self, text, pace_ms=0):
+        text_bytes = text.encode('utf-8')
+        if self.batched:
+            return self.lib.keyboard_type_string_paced(text_bytes, int(pace_ms)) == 0
+        return self.lib.keyboard_type_string(text_bytes) == 0
+    
+    def press_keys(self, keys, pace_ms=0):
+        vk_codes = [VK_CODES[key] for key in keys]
+        if self.batched:
+            codes = (ctypes.c_int * len(vk_codes))(*vk_codes)
+            return self.lib.keyboard_chord(codes, len(vk_codes), int(pace_ms)) == 0
+        if len(vk_codes) == 1:
+            return self.lib.keyboard_press_key(vk_codes[0]) == 0
+        logger.error(f"Chord {'+'.join(keys)} needs the batched executor (run make in execution/c_executors)")
+        return False
+    
+    def mouse_move(self, x, y):
+        return self.lib.mouse_move(int(x), int(y)) == 0
+    
+    def mouse_click(self, button='left'):
+        return self.lib.mouse_click(0 if button == 'left' else 1) == 0
+    
+    def mouse_scroll(self, amount):
+        return self.lib.mouse_scroll(int(amount)) == 0
+    
+    def send_batch(self, items, pace_ms=0):
+        """Whole batch as one keyboard_send_events call"""
+        if not self.batched:
+            return super().send_batch(items, pace_ms)
+        events = []
+        for kind, value in items:
+            if kind == 'type':
+                data = value.encode('utf-16-le')
+                for i in range(0, len(data), 2):
+                    unit = int.from_bytes(data[i:i + 2], 'little')
+                    events.append((unit, KEYEVENTF_UNICODE))
+                    events.append((unit, KEYEVENTF_UNICODE | KEYEVENTF_KEYUP))
+            else:
+                vk_codes = [VK_CODES[key] for key in value]
+                events.extend((vk, 0) for vk in vk_codes)
+                events.extend((vk, KEYEVENTF_KEYUP) for vk in reversed(vk_codes))
+        codes = (ctypes.c_int * len(events))(*[code for code, _ in events])
+        flags = (ctypes.c_int * len(events))(*[flag for _, flag in events])
+        return self.lib.keyboard_send_events(codes, flags, len(events), int(pace_ms)) == 0
+    
+    def recorded_events(self):
+        """Events logged by the recording stub as (type, code, flags) - empty on real builds"""
+        if not self.recording:
+            return []
+        events = []
+        kind, code, flags = ctypes.c_int(), ctypes.c_int(), ctypes.c_int()
+        for index in range(self.lib.input_recorded_count()):
+            self.lib.input_recorded_event(index, ctypes.byref(kind), ctypes.byref(code), ctypes.byref(flags))
+            events.append((kind.value, code.value, flags.value))
+        return events
+    
+    def recorded_calls(self):
+        """SendInput calls seen by the recording stub"""
+        return self.lib.input_recorded_calls() if self.recording else 0
+    
+    def reset_recording(self):
+        if self.recording:
+            self.lib.input_reset_recording()
+
+
+class PynputBackend(InputBackend):
+    """pynput controllers (needs a desktop session)"""
+    
+    name = 'pynput'
+    
+    def __init__(self):
+        from pynput.keyboard import Controller, Key
+        from pynput.mouse import Button, Controller as MouseController
+        self.keyboard = Controller()
+        self.mouse = MouseController()
+        self.buttons = {'left': Button.left, 'right': Button.right}
+        aliases = {'return': 'enter', 'escape': 'esc', 'del': 'delete', 'control': 'ctrl',
+                   'pageup': 'page_up', 'pagedown': 'page_down', 'win': 'cmd', 'windows': 'cmd'}
+        self.keys = {}
+        for name in VK_CODES:
+            attr = aliases.get(name, name)
+            self.keys[name] = getattr(Key, attr) if hasattr(Key, attr) else name
+    
+    def type_text(self, text, pace_ms=0):
+        if not pace_ms:
+            self.keyboard.type(text)
+            return True
+        for char in text:
+            self.keyboard.type(char)
+            time.sleep(pace_ms / 1000)
+        return True
+    
+    def press_keys(self, keys, pace_ms=0):
+        pressed = [self.keys[key] for key in keys]
+        for key in pressed:
+            self.keyboard.press(key)
+            if pace_ms:
+                time.sleep(pace_ms / 1000)
+        for key in reversed(pressed):
+            self.keyboard.release(key)
+        return True
+    
+    def mouse_move(self, x, y):
+        self.mouse.position = (int(x), int(y))
+        return True
+    
+    def mouse_click(self, button='left'):
+        self.mouse.click(self.buttons.get(button, self.buttons['left']))
+        return True
+    
+    def mouse_scroll(self, amount):
+        self.mouse.scroll(0, amount / 120)
+        return True
+
+
+InputEvent = namedtuple('InputEvent', ['time', 'kind', 'value', 'down'])
+
+
+class RecordingBackend(InputBackend):
+    """
+    In-memory backend: every event is timestamped and nothing is sent to the OS
+    Event counts match what SendInput would receive (a key down and up per character)
+    """
+    
+    name = 'recorder'
+    
+    def __init__(self, event_seconds=0.0, clock=time.perf_counter):
+        """
+        Args:
+            event_seconds: Simulated cost of each event (0 = instant)
+            clock: Timestamp source
+        """
+        self.event_seconds = event_seconds
+        self.clock = clock
+        self.events = []
+        self.calls = 0  # backend calls (the SendInput count for the ctypes backend)
+    
+    def _emit(self, kind, value, down=None, pace_ms=0):
+        if self.event_seconds or pace_ms:
+            time.sleep(self.event_seconds + pace_ms / 1000)
+        self.events.append(InputEvent(self.clock(), kind, value, down))
+    
+    def _keys(self, keys, pace_ms):
+        for key in keys:
+            self._emit('key', key, True, pace_ms)
+        for key in reversed(keys):
+            self._emit('key', key, False, pace_ms)
+    
+    def _text(self, text, pace_ms):
+        for char in text:
+            self._emit('char', char, True, pace_ms)
+            self._emit('char', char, False, pace_ms)
+    
+    def type_text(self, text, pace_ms=0):
+        self.calls += 1
+        self._text(text, pace_ms)
+        return True
+    
+    def press_keys(self, keys, pace_ms=0):
+        self.calls += 1
+        self._keys(keys, pace_ms)
+        return True
+    
+    def mouse_move(self, x, y):
+        self.calls += 1
+        self._emit('move', (int(x), int(y)))
+        return True
+    
+    def mouse_click(self, button='left'):
+        self.calls += 1
+        self._emit('button', button, True)
+        self._emit('button', button, False)
+        return True
+    
+    def mouse_scroll(self, amount):
+        self.calls += 1
+        self._emit('scroll', int(amount))
+        return True
+    
+    def send_batch(self, items, pace_ms=0):
+        self.calls += 1
+        for kind, value in items:
+            if kind == 'type':
+                self._text(value, pace_ms)
+            else:
+                self._keys(value, pace_ms)
+        return True
+    
+    def typed_text(self):
+        """Characters typed so far"""
+        return ''.join(event.value for event in self.events if event.kind == 'char' and event.down)
+    
+    def reset(self):
+        self.events = []
+        self.calls = 0
+
+
+BACKENDS = {'ctypes': CtypesBackend, 'pynput': PynputBackend, 'recorder': RecordingBackend}
+
+
+def select_backend(preference=config.INPUT_BACKEND):
+    """
+    Create the input backend
+    
+    Args:
+        preference: 'ctypes', 'pynput', 'recorder' or 'auto' (ctypes, then pynput)
+    
+    Returns:
+        InputBackend instance
+    
+    Raises:
+        RuntimeError: no backend could be loaded (the recorder is only used when configured)
+    """
+    order = ['ctypes', 'pynput'] if preference == 'auto' else [preference]
+    for name in order:
+        try:
+            backend = BACKENDS[name]()
+            logger.info(f"✓ Input backend: {name}")
+            return backend
+        except Exception as e:
+            logger.warning(f"⚠️ Input backend {name} unavailable: {e}")
+    
+    logger.error(f"❌ No input backend could be loaded (tried {', '.join(order)})")
+    raise RuntimeError("No input backend available. Please compile the C executors or install pynput.")
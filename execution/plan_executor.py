@@ -0,0 +1,223 @@
+"""
+Plan Executor - runs Model 2 step lists through the ExecutorBridge
+Adjacent input steps go to the bridge as one batch; 'wait' steps end as soon as their
+condition holds (e.g. the foreground window changed) and only sleep the full duration
+when nothing can be observed
+"""
+import ctypes
+import logging
+import time
+import config
+from utils.tracing import tracer
+
+logger = logging.getLogger("PlanExecutor")
+
+# StepGenerator default rules use lowercase 'action' names; trained rules use 'action_type'
+_ACTION_TYPES = {
+    'press_key': 'PRESS_KEY',
+    'type': 'TYPE_TEXT',
+    'wait': 'WAIT',
+    'click': 'MOUSE_CLICK',
+    'scroll': 'MOUSE_SCROLL',
+    'direct_execute': 'SYSTEM',
+}
+_MOUSE_BUTTONS = {'click': ('left', 1), 'right_click': ('right', 1), 'double_click': ('left', 2)}
+
+
+def normalize_step(step):
+    """
+    Convert a step in either schema into bridge actions
+    
+    Args:
+        step: {'action': 'press_key', 'key': 'win', ...} or
+              {'action_type': 'PRESS_KEY', 'parameters': {'key': 'win'}}
+    
+    Returns:
+        List of (action_type, coordinates, parameters); WAIT keeps its parameters,
+        SYSTEM steps (handled by SystemExecutor) give an empty list
+    """
+    if 'action_type' in step:
+        kind = str(step['action_type']).upper()
+        parameters = dict(step.get('parameters') or {})
+    else:
+        action = str(step.get('action', '')).lower()
+        kind = _ACTION_TYPES.get(action, action.upper())
+        parameters = {key: value for key, value in step.items()
+                      if key not in ('action', 'description', 'coordinates')}
+    coordinates = step.get('coordinates') or {}
+    
+    if kind == 'SYSTEM':
+        return []
+    if kind == 'KEYBOARD':
+        return [('PRESS_KEY', coordinates, {'key': parameters.get('keys') or parameters.get('key', '')})]
+    if kind == 'MOUSE':
+        button, clicks = _MOUSE_BUTTONS.get(parameters.get('action', 'click'), ('left', 1))
+        return [('MOUSE_CLICK', coordinates, {'button': button})] * clicks
+    return [(kind, coordinates, parameters)]
+
+
+class ForegroundProbe:
+    """Foreground window handle and title (Windows user32); unavailable elsewhere"""
+    
+    def __init__(self):
+        windll = getattr(ctypes, 'windll', None)
+        self.user32 = windll.user32 if windll else None
+    
+    @property
+    def available(self):
+        return self.user32 is not None
+    
+    def snapshot(self):
+        hwnd = self.user32.GetForegroundWindow()
+        length = self.user32.GetWindowTextLengthW(hwnd)
+        buffer = ctypes.create_unicode_buffer(length + 1)
+        self.user32.GetWindowTextW(hwnd, buffer, length + 1)
+        return hwnd, buffer.value
+
+
+class PlanExecutor:
+    """Runs step plans: batched input, condition-based waits, per-step timing"""
+    
+    def __init__(self, bridge, probe=None, poll=config.PLAN_WAIT_POLL, settle=config.PLAN_WAIT_SETTLE,
+                 slow_seconds=config.PLAN_SLOW_SECONDS):
+        """
+        Args:
+            bridge: ExecutorBridge (or anything with execute_action / execute_batch)
+            probe: Object with snapshot() used by 'foreground_changed' waits
+                   (default: ForegroundProbe when user32 is available)
+            poll: Seconds between condition checks
+            settle: Seconds to let a new foreground window take input after the condition holds
+            slow_seconds: Plans slower than this are logged with their slowest step
+        """
+        self.bridge = bridge
+        if probe is None:
+            probe = ForegroundProbe()
+            probe = probe if probe.available else None
+        self.probe = probe
+        self.poll = poll
+        self.settle = settle
+        self.slow_seconds = slow_seconds
+        self.stats = {'plans': 0, 'failed': 0, 'slow': 0, 'seconds': 0.0,
+                      'batches': 0, 'input_steps': 0,
+                      'waits_met': 0, 'waits_timed_out': 0, 'waits_slept': 0, 'wait_seconds_saved': 0.0}
+    
+    def _groups(self, steps):
+        """Split a plan into ('input', [(index, action), ...]) runs and ('wait', index, parameters)"""
+        groups = []
+        batch = []
+        for index, step in enumerate(steps):
+            for action in normalize_step(step):
+                if action[0] == 'WAIT':
+                    if batch:
+                        groups.append(('input', batch))
+                        batch = []
+                    groups.append(('wait', index, action[2]))
+                else:
+                    batch.append((index, action))
+        if batch:
+            groups.append(('input', batch))
+        return groups
+    
+    def _send(self, actions):
+        execute_batch = getattr(self.bridge, 'execute_batch', None)
+        if execute_batch is not None:
+            return execute_batch(actions)
+        for action in actions:
+            result = self.bridge.execute_action(*action)
+            if not result.get('success'):
+                return result
+        return {'success': True}
+    
+    def _wait(self, parameters, baseline):
+        """
+        Wait until the condition holds or the timeout passes
+        
+        Returns:
+            'met', 'timeout' or 'slept' (no observable condition - fixed duration)
+        """
+        duration = float(parameters.get('duration', 0) or 0)
+        timeout = float(parameters.get('timeout', duration) or 0)
+        until = parameters.get('until', config.PLAN_WAIT_CONDITION)
+        
+        if until != 'foreground_changed' or self.probe is None or baseline is None:
+            time.sleep(duration)
+            return 'slept'
+        
+        deadline = time.perf_counter() + timeout
+        while True:
+            if self.probe.snapshot() != baseline:
+                time.sleep(max(0.0, min(self.settle, deadline - time.perf_counter())))
+                return 'met'
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return 'timeout'
+            time.sleep(min(self.poll, remaining))
+    
+    def run(self, steps, label=''):
+        """
+        Execute a plan
+        
+        Args:
+            steps: Step dicts from StepGenerator.generate (either schema)
+            label: Name used in logs and trace spans (e.g. the category)
+        
+        Returns:
+            {'success', 'message' or 'error', 'seconds', 'timings': [{'steps', 'kind', 'seconds', ...}]}
+        """
+        timings = []
+        result = {'success': True}
+        baseline = None
+        start = time.perf_counter()
+        
+        with tracer.span("plan.run", plan=label, steps=len(steps)) as plan_span:
+            for group in self._groups(steps):
+                group_start = time.perf_counter()
+                if group[0] == 'input':
+                    batch = group[1]
+                    baseline = self.probe.snapshot() if self.probe is not None else None
+                    with tracer.span("plan.input", actions=len(batch)):
+                        result = self._send([action for _, action in batch])
+                    timing = {'kind': 'input', 'steps': sorted({index for index, _ in batch}),
+                              'actions': [action[0] for _, action in batch]}
+                    self.stats['batches'] += 1
+                    self.stats['input_steps'] += len(batch)
+                else:
+                    _, index, parameters = group
+                    with tracer.span("plan.wait") as span:
+                        outcome = self._wait(parameters, baseline)
+                        span.set(outcome=outcome)
+                    timing = {'kind': 'wait', 'steps': [index], 'outcome': outcome,
+                              'duration': float(parameters.get('duration', 0) or 0)}
+                    self.stats[{'met': 'waits_met', 'timeout': 'waits_timed_out', 'slept': 'waits_slept'}[outcome]] += 1
+                timing['seconds'] = time.perf_counter() - group_start
+                if timing['kind'] == 'wait':
+                    self.stats['wait_seconds_saved'] += max(0.0, timing['duration'] - timing['seconds'])
+                timings.append(timing)
+                
+                if not result.get('success'):
+                    result = {'success': False, 'error': result.get('error', 'Input step failed'),
+                              'failed_steps': timing['steps']}
+                    break
+            plan_span.set(success=result['success'])
+        
+        seconds = time.perf_counter() - start
+        self.stats['plans'] += 1
+        self.stats['seconds'] += seconds
+        if not result['success']:
+            self.stats['failed'] += 1
+        if seconds > self.slow_seconds:
+            self.stats['slow'] += 1
+            slowest = max(timings, key=lambda t: t['seconds'])
+            logger.warning(f"⚠️ Slow plan {label}: {seconds:.2f}s "
+                           f"(slowest: {slowest['kind']} step {slowest['steps']} {slowest['seconds']:.2f}s)")
+        
+        if result['success']:
+            result.setdefault('message', f"Executed {len(steps)} steps")
+        result['seconds'] = seconds
+        result['timings'] = timings
+        return result
+    
+    def get_stats(self):
+        stats = dict(self.stats)
+        stats['mean_seconds'] = stats['seconds'] / stats['plans'] if stats['plans'] else 0.0
+        return stats
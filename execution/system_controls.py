@@ -0,0 +1,388 @@
+"""
+System Controls - long-lived handles for the audio endpoint and the brightness provider
+Handles are created on first use, reused afterwards and recreated once when a call fails
+(device change, WMI provider restart) or when used from a different thread (COM handles are
+bound to the thread that created them; COM is initialized once in each such thread, e.g. the
+pipelined executor's worker). Each operation keeps call/time counters
+windows = pycaw IAudioEndpointVolume + WMI WmiMonitorBrightnessMethods
+fake    = in-memory levels (benchmarks; only when configured, never picked by 'auto')
+native  = volume key steps and mute from the C executor library (system_commands.c), used
+          in-process when no audio handle is available (there is no brightness key to fall back to)
+"""
+import abc
+import ctypes
+import logging
+import platform
+import threading
+import time
+import config
+
+logger = logging.getLogger("SystemControls")
+
+_thread_state = threading.local()  # per-thread setup already done (e.g. CoInitialize)
+
+
+class HandleUnavailable(Exception):
+    """The backing API is missing on this machine (e.g. pycaw/wmi not installed)"""
+
+
+def _co_initialize_comtypes():
+    try:
+        import comtypes
+    except ImportError as e:
+        raise HandleUnavailable(f"comtypes not available: {e}")
+    comtypes.CoInitialize()
+
+
+def _co_initialize_pythoncom():
+    try:
+        import pythoncom
+    except ImportError as e:
+        raise HandleUnavailable(f"pythoncom not available: {e}")
+    pythoncom.CoInitialize()
+
+
+class CachedHandle(abc.ABC):
+    """Lazily created handle with invalidate-and-retry and per-operation timing"""
+    
+    name = 'handle'
+    thread_init = None  # setup the creating thread needs first (CoInitialize), run once per thread
+    
+    def __init__(self):
+        self._handle = None
+        self._thread = None
+        self._unavailable = None
+        self.lock = threading.Lock()
+        self.counters = {'creates': 0, 'create_seconds': 0.0, 'invalidations': 0, 'errors': 0, 'thread_inits': 0}
+        self.operations = {}  # operation -> {'calls', 'seconds', 'max_seconds'}
+    
+    @abc.abstractmethod
+    def _create(self):
+        """Build the underlying handle (raise HandleUnavailable if the API is missing)"""
+    
+    def invalidate(self):
+        """Drop the handle; the next call recreates it"""
+        with self.lock:
+            self._handle = None
+    
+    def _initialize_thread(self):
+        """Run thread_init in the calling thread unless that thread already did"""
+        if self.thread_init is None:
+            return
+        done = _thread_state.__dict__.setdefault('initialized', set())
+        if self.thread_init not in done:
+            self.thread_init()
+            done.add(self.thread_init)
+            self.counters['thread_inits'] += 1
+    
+    def _get(self):
+        if self._unavailable:
+            raise HandleUnavailable(self._unavailable)
+        if self._handle is None or self._thread != threading.get_ident():
+            start = time.perf_counter()
+            try:
+                self._initialize_thread()
+                self._handle = self._create()
+            except HandleUnavailable as e:
+                self._unavailable = str(e)
+                raise
+            self._thread = threading.get_ident()
+            self.counters['creates'] += 1
+            self.counters['create_seconds'] += time.perf_counter() - start
+        return self._handle
+    
+    def _call(self, operation, func):
+        """Run func(handle); on failure recreate the handle and try once more"""
+        start = time.perf_counter()
+        try:
+            with self.lock:
+                try:
+                    return func(self._get())
+                except HandleUnavailable:
+                    raise
+                except Exception as e:
+                    logger.warning(f"⚠️ {self.name} handle failed ({e}), recreating")
+                    self.counters['invalidations'] += 1
+                    self._handle = None
+                    try:
+                        return func(self._get())
+                    except Exception:
+                        self.counters['errors'] += 1
+                        self._handle = None
+                        raise
+        finally:
+            seconds = time.perf_counter() - start
+            stats = self.operations.setdefault(operation, {'calls': 0, 'seconds': 0.0, 'max_seconds': 0.0})
+            stats['calls'] += 1
+            stats['seconds'] += seconds
+            stats['max_seconds'] = max(stats['max_seconds'], seconds)
+    
+    def get_stats(self):
+        stats = dict(self.counters)
+        for operation, counts in self.operations.items():
+            stats[operation] = dict(counts, mean_seconds=counts['seconds'] / counts['calls'] if counts['calls'] else 0.0)
+        return stats
+
+
+class AudioEndpoint(CachedHandle):
+    """Default playback device: volume 0-100 and mute"""
+    
+    name = 'audio'
+    
+    @abc.abstractmethod
+    def get_volume(self):
+        """Master volume 0-100"""
+    
+    @abc.abstractmethod
+    def set_volume(self, level):
+        """Set master volume 0-100"""
+    
+    @abc.abstractmethod
+    def get_mute(self):
+        """True when muted"""
+    
+    @abc.abstractmethod
+    def set_mute(self, muted):
+        """Mute (True) or unmute (False)"""
+
+
+class BrightnessProvider(CachedHandle):
+    """Built-in display brightness 0-100"""
+    
+    name = 'brightness'
+    
+    @abc.abstractmethod
+    def get_brightness(self):
+        """Current brightness 0-100"""
+    
+    @abc.abstractmethod
+    def set_brightness(self, level):
+        """Set brightness 0-100"""
+
+
+class PycawAudioEndpoint(AudioEndpoint):
+    """IAudioEndpointVolume of the default speakers via pycaw"""
+    
+    thread_init = staticmethod(_co_initialize_comtypes)
+    
+    def _create(self):
+        try:
+            from comtypes import CLSCTX_ALL
+            from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+        except ImportError as e:
+            raise HandleUnavailable(f"pycaw not available: {e}")
+        devices = AudioUtilities.GetSpeakers()
+        interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
+        return interface.QueryInterface(IAudioEndpointVolume)
+    
+    def get_volume(self):
+        return round(self._call('get_volume', lambda volume: volume.GetMasterVolumeLevelScalar()) * 100)
+    
+    def set_volume(self, level):
+        self._call('set_volume', lambda volume: volume.SetMasterVolumeLevelScalar(level / 100.0, None))
+    
+    def get_mute(self):
+        return bool(self._call('get_mute', lambda volume: volume.GetMute()))
+    
+    def set_mute(self, muted):
+        self._call('set_mute', lambda volume: volume.SetMute(int(bool(muted)), None))
+
+
+class WmiBrightnessProvider(BrightnessProvider):
+    """WmiMonitorBrightness(Methods) in root\\wmi (laptop panels; external monitors have none)"""
+    
+    thread_init = staticmethod(_co_initialize_pythoncom)
+    
+    def _create(self):
+        try:
+            import wmi
+        except ImportError as e:
+            raise HandleUnavailable(f"wmi not available: {e}")
+        connection = wmi.WMI(namespace='wmi')
+        methods = connection.WmiMonitorBrightnessMethods()
+        if not methods:
+            raise HandleUnavailable("No WMI brightness control for this display")
+        return connection, methods[0]
+    
+    def get_brightness(self):
+        return int(self._call('get_brightness', lambda handle: handle[0].WmiMonitorBrightness()[0].CurrentBrightness))
+    
+    def set_brightness(self, level):
+        self._call('set_brightness', lambda handle: handle[1].WmiSetBrightness(1, int(level)))
+
+
+class NativeSystemKeys(CachedHandle):
+    """system_commands.c in the executor library: relative volume steps and mute toggle"""
+    
+    name = 'native'
+    
+    def __init__(self, lib_path=None):
+        super().__init__()
+        self.lib_path = lib_path
+    
+    def _create(self):
+        from execution.input_backends import CtypesBackend
+        try:
+            lib = ctypes.CDLL(self.lib_path or CtypesBackend.library_path())
+        except OSError as e:
+            raise HandleUnavailable(f"executor library not loadable: {e}")
+        if not hasattr(lib, 'system_volume_steps'):
+            raise HandleUnavailable("executor library has no system commands - rebuild with make in execution/c_executors")
+        lib.system_volume_steps.argtypes = [ctypes.c_int]
+        lib.system_volume_steps.restype = ctypes.c_int
+        lib.system_volume_mute.argtypes = []
+        lib.system_volume_mute.restype = ctypes.c_int
+        return lib
+    
+    @staticmethod
+    def _checked(func, *args):
+        def run(lib):
+            if func(lib)(*args) != 0:
+                raise OSError("SendInput rejected the key events")
+        return run
+    
+    def volume_steps(self, steps):
+        """Volume keys: positive = up, negative = down (one step is config.VOLUME_KEY_PERCENT)"""
+        self._call('volume_steps', self._checked(lambda lib: lib.system_volume_steps, int(steps)))
+    
+    def toggle_mute(self):
+        self._call('toggle_mute', self._checked(lambda lib: lib.system_volume_mute))
+
+
+def _simulated(fake, func):
+    """Wrap a fake operation with its simulated cost and pending failures"""
+    def run(state):
+        if fake.call_seconds:
+            time.sleep(fake.call_seconds)
+        if fake.fail_next:
+            fake.fail_next -= 1
+            raise OSError("device invalidated")
+        return func(state)
+    return run
+
+
+class FakeAudioEndpoint(AudioEndpoint):
+    """In-memory endpoint; create_seconds/call_seconds simulate handle and call cost"""
+    
+    def __init__(self, volume=50, create_seconds=0.0, call_seconds=0.0):
+        super().__init__()
+        self.state = {'volume': volume, 'muted': False}
+        self.create_seconds = create_seconds
+        self.call_seconds = call_seconds
+        self.fail_next = 0  # calls that raise as if the device had changed
+    
+    def _create(self):
+        if self.create_seconds:
+            time.sleep(self.create_seconds)
+        return self.state
+    
+    def get_volume(self):
+        return self._call('get_volume', _simulated(self, lambda state: state['volume']))
+    
+    def set_volume(self, level):
+        self._call('set_volume', _simulated(self, lambda state: state.update(volume=int(level))))
+    
+    def get_mute(self):
+        return self._call('get_mute', _simulated(self, lambda state: state['muted']))
+    
+    def set_mute(self, muted):
+        self._call('set_mute', _simulated(self, lambda state: state.update(muted=bool(muted))))
+
+
+class FakeBrightnessProvider(BrightnessProvider):
+    """In-memory display; create_seconds/call_seconds simulate handle and call cost"""
+    
+    def __init__(self, brightness=50, create_seconds=0.0, call_seconds=0.0):
+        super().__init__()
+        self.state = {'brightness': brightness}
+        self.create_seconds = create_seconds
+        self.call_seconds = call_seconds
+        self.fail_next = 0
+    
+    def _create(self):
+        if self.create_seconds:
+            time.sleep(self.create_seconds)
+        return self.state
+    
+    def get_brightness(self):
+        return self._call('get_brightness', _simulated(self, lambda state: state['brightness']))
+    
+    def set_brightness(self, level):
+        self._call('set_brightness', _simulated(self, lambda state: state.update(brightness=int(level))))
+
+
+class UnavailableAudioEndpoint(AudioEndpoint):
+    """No audio API on this machine: every call raises HandleUnavailable, so callers fall back"""
+    
+    def __init__(self, reason):
+        super().__init__()
+        self.reason = reason
+    
+    def _create(self):
+        raise HandleUnavailable(self.reason)
+    
+    def get_volume(self):
+        return self._call('get_volume', lambda handle: handle)
+    
+    def set_volume(self, level):
+        self._call('set_volume', lambda handle: handle)
+    
+    def get_mute(self):
+        return self._call('get_mute', lambda handle: handle)
+    
+    def set_mute(self, muted):
+        self._call('set_mute', lambda handle: handle)
+
+
+class UnavailableBrightnessProvider(BrightnessProvider):
+    """No brightness API on this machine: every call raises HandleUnavailable"""
+    
+    def __init__(self, reason):
+        super().__init__()
+        self.reason = reason
+    
+    def _create(self):
+        raise HandleUnavailable(self.reason)
+    
+    def get_brightness(self):
+        return self._call('get_brightness', lambda handle: handle)
+    
+    def set_brightness(self, level):
+        self._call('set_brightness', lambda handle: handle)
+
+
+def _use_windows(preference):
+    if preference == 'fake':
+        return False
+    if preference == 'windows':
+        return True
+    if platform.system() != 'Windows':
+        raise HandleUnavailable(f"No system controls for {platform.system()} "
+                                f"(SYSTEM_CONTROL_BACKEND='{preference}'; 'fake' keeps levels in memory)")
+    return True
+
+
+def create_audio_endpoint(preference=config.SYSTEM_CONTROL_BACKEND):
+    """
+    AudioEndpoint for 'windows', 'fake' or 'auto'
+    
+    Raises:
+        HandleUnavailable: 'auto' on anything but Windows
+    """
+    if _use_windows(preference):
+        return PycawAudioEndpoint()
+    logger.warning("⚠️ Fake audio endpoint configured - volume changes stay in memory")
+    return FakeAudioEndpoint()
+
+
+def create_brightness_provider(preference=config.SYSTEM_CONTROL_BACKEND):
+    """
+    BrightnessProvider for 'windows', 'fake' or 'auto'
+    
+    Raises:
+        HandleUnavailable: 'auto' on anything but Windows
+    """
+    if _use_windows(preference):
+        return WmiBrightnessProvider()
+    logger.warning("⚠️ Fake brightness provider configured - brightness changes stay in memory")
+    return FakeBrightnessProvider()
@@ -1,114 +1,268 @@
 """
 System Executor - Execute system-level commands
 Handles volume, brightness, power commands via Windows API
+Levels go through the cached audio/brightness handles; when the audio handle is unavailable,
+volume steps and mute use the C library's media keys in-process (brightness has no such key).
+nircmd/PowerShell processes are the last resort for absolute levels and every spawn is counted
+(get_stats()['spawns'])
 """
 import logging
 import subprocess
 import time
 import os
+import config
+from execution.system_controls import (HandleUnavailable, NativeSystemKeys, UnavailableAudioEndpoint,
+                                       UnavailableBrightnessProvider, create_audio_endpoint,
+                                       create_brightness_provider)
 
 logger = logging.getLogger("SystemExecutor")
 
 class SystemExecutor:
     """Execute system commands directly via Windows API"""
     
-    def __init__(self, executor_bridge):
-        """Initialize system executor"""
+    def __init__(self, executor_bridge, audio=None, brightness=None, native=None):
+        """
+        Initialize system executor
+        
+        Args:
+            executor_bridge: ExecutorBridge
+            audio: AudioEndpoint (default: create_audio_endpoint(), created lazily on first use;
+                   an unavailable endpoint when the platform has none, so calls fall back)
+            brightness: BrightnessProvider (default: create_brightness_provider(), same fallback)
+            native: NativeSystemKeys (default: the executor library, loaded on first fallback)
+        """
         self.executor = executor_bridge
+        if audio is None:
+            try:
+                audio = create_audio_endpoint()
+            except HandleUnavailable as e:
+                logger.warning(f"⚠️ {e}")
+                audio = UnavailableAudioEndpoint(str(e))
+        if brightness is None:
+            try:
+                brightness = create_brightness_provider()
+            except HandleUnavailable as e:
+                logger.warning(f"⚠️ {e}")
+                brightness = UnavailableBrightnessProvider(str(e))
+        self.audio = audio
+        self.brightness = brightness
+        self.native = native or NativeSystemKeys()
+        self.spawns = {}  # program -> {'count', 'seconds'}
         logger.info("✓ System executor initialized")
     
-    def set_volume(self, level):
-        """Set system volume (0-100) - WORKS ACTUALLY"""
+    def get_stats(self):
+        """Handle creation and per-call timing counters, plus subprocess spawns"""
+        return {
+            'audio': self.audio.get_stats(),
+            'brightness': self.brightness.get_stats(),
+            'native': self.native.get_stats(),
+            'spawns': sum(counts['count'] for counts in self.spawns.values()),
+            'spawn_seconds': sum(counts['seconds'] for counts in self.spawns.values()),
+            'spawns_by_program': {program: dict(counts) for program, counts in self.spawns.items()},
+        }
+    
+    def _spawn(self, args, **kwargs):
+        """subprocess.run, counted per program"""
+        program = os.path.basename(args[0] if isinstance(args, (list, tuple)) else args.split()[0])
+        logger.info(f"⚠️ Spawning {program}")
+        start = time.perf_counter()
+        try:
+            return subprocess.run(args, **kwargs)
+        finally:
+            counts = self.spawns.setdefault(program, {'count': 0, 'seconds': 0.0})
+            counts['count'] += 1
+            counts['seconds'] += time.perf_counter() - start
+    
+    @staticmethod
+    def _ramp(get_level, set_level, target, seconds):
+        """Move from the current level to target in steps RAMP_INTERVAL apart"""
+        current = get_level()
+        steps = max(1, int(seconds / config.RAMP_INTERVAL))
+        for i in range(1, steps + 1):
+            set_level(round(current + (target - current) * i / steps))
+            if i < steps:
+                time.sleep(seconds / steps)
+    
+    def set_volume(self, level, ramp=False):
+        """
+        Set system volume (0-100)
+        
+        Args:
+            level: target volume in percent
+            ramp: fade over config.RAMP_SECONDS instead of jumping (needs the audio handle)
+        """
         try:
             logger.info(f"🔊 Setting volume to {level}%")
             level = max(0, min(100, level))  # Clamp 0-100
             
-            # ✅ Use pycaw (BEST)
+            # ✅ Use the cached audio endpoint (pycaw, created once)
             try:
-                from comtypes import CLSCTX_ALL
-                from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
-                
-                devices = AudioUtilities.GetSpeakers()
-                interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
-                volume = interface.QueryInterface(IAudioEndpointVolume)
-                volume.SetMasterVolumeLevelScalar(level / 100.0, None)
+                if ramp:
+                    self._ramp(self.audio.get_volume, self.audio.set_volume, level, config.RAMP_SECONDS)
+                else:
+                    self.audio.set_volume(level)
                 
                 logger.info(f"✓ Volume set to {level}%")
                 return {"success": True, "message": f"Volume set to {level}%"}
             except Exception as e1:
-                logger.warning(f"pycaw failed: {e1}, trying nircmd")
-                
-                # ✅ Fallback: nircmd (INSTALL: choco install nircmd)
-                try:
-                    nircmd_path = r"C:\Program Files\NirCmd\nircmd.exe"
-                    if not os.path.exists(nircmd_path):
-                        nircmd_path = "nircmd.exe"
-                    
-                    # nircmd: adjust volume by percent
-                    subprocess.run([nircmd_path, "changesysvolume", str(level * 655)], 
-                                 capture_output=True, timeout=2)
-                    logger.info(f"✓ Volume set to {level}% (nircmd)")
-                    return {"success": True, "message": f"Volume set to {level}%"}
-                except Exception as e2:
-                    logger.warning(f"nircmd failed: {e2}, trying PowerShell")
-                    
-                    # ✅ Last resort: PowerShell VBS
-                    ps_cmd = f'''
-                    [Windows.Media.SystemMediaTransportControls,Windows.Media,ContentType=WindowsRuntime] > $null
-                    [Windows.Media.SystemMediaTransportControls]::GetForCurrentView().SoundLevel
-                    $vol = {level} * 655
-                    (New-Object -ComObject WScript.Shell).SendKeys([char]174)
-                    '''
-                    subprocess.run(["powershell", "-Command", ps_cmd], 
+                logger.warning(f"pycaw failed: {e1}, trying volume keys")
+            
+            # ✅ In-process: volume keys down to 0, then up to the level (one SendInput each)
+            try:
+                step = config.VOLUME_KEY_PERCENT
+                self.native.volume_steps(-(100 // step))
+                self.native.volume_steps(round(level / step))
+                logger.info(f"✓ Volume set to {level}% (volume keys)")
+                return {"success": True, "message": f"Volume set to {level}%"}
+            except Exception as e2:
+                logger.warning(f"Volume keys failed: {e2}, trying nircmd")
+            
+            # ✅ Last resort: nircmd (INSTALL: choco install nircmd), 0-65535 absolute
+            nircmd_path = r"C:\Program Files\NirCmd\nircmd.exe"
+            if not os.path.exists(nircmd_path):
+                nircmd_path = "nircmd.exe"
+            result = self._spawn([nircmd_path, "setsysvolume", str(level * 655)],
                                  capture_output=True, timeout=2)
-                    logger.info(f"✓ Volume adjusted to {level}%")
-                    return {"success": True, "message": f"Volume set to {level}%"}
+            if result.returncode != 0:
+                raise OSError(f"nircmd exited with {result.returncode}")
+            logger.info(f"✓ Volume set to {level}% (nircmd)")
+            return {"success": True, "message": f"Volume set to {level}%"}
         
         except Exception as e:
             logger.error(f"Failed to set volume: {e}")
             return {"success": False, "error": str(e)}
     
-    def set_brightness(self, level):
-        """Set screen brightness (0-100)"""
+    def change_volume(self, delta, ramp=False):
+        """
+        Relative volume change - no subprocess on any path
+        
+        Args:
+            delta: percent to add (negative = down)
+            ramp: fade over config.RAMP_SECONDS (needs the audio handle)
+        """
+        direction = 'up' if delta > 0 else 'down'
+        logger.info(f"🔊 Volume {direction} {abs(delta)}%")
+        try:
+            level = max(0, min(100, self.audio.get_volume() + delta))
+            if ramp:
+                self._ramp(self.audio.get_volume, self.audio.set_volume, level, config.RAMP_SECONDS)
+            else:
+                self.audio.set_volume(level)
+            logger.info(f"✓ Volume {direction} to {level}%")
+            return {"success": True, "message": f"Volume {direction} to {level}%", "level": level}
+        except Exception as e1:
+            logger.warning(f"pycaw failed: {e1}, using volume keys")
+        
+        try:
+            self.native.volume_steps(round(delta / config.VOLUME_KEY_PERCENT))
+            logger.info(f"✓ Volume {direction} {abs(delta)}% (volume keys)")
+            return {"success": True, "message": f"Volume {direction} {abs(delta)}%"}
+        except Exception as e:
+            logger.error(f"Failed to change volume: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def set_mute(self, muted=None):
+        """
+        Mute, unmute or toggle (muted=None)
+        
+        The mute key can only toggle, so with that fallback mute/unmute report the state as unknown
+        """
+        try:
+            if muted is None:
+                muted = not self.audio.get_mute()
+            self.audio.set_mute(muted)
+            message = "Muted" if muted else "Unmuted"
+        except Exception as e1:
+            logger.warning(f"pycaw failed: {e1}, using the mute key")
+            try:
+                self.native.toggle_mute()
+                message = "Toggled mute" if muted is None else "Toggled mute (state unknown)"
+            except Exception as e:
+                logger.error(f"Failed to change mute: {e}")
+                return {"success": False, "error": str(e)}
+        
+        logger.info(f"✓ {message}")
+        return {"success": True, "message": message}
+    
+    def set_brightness(self, level, ramp=False):
+        """
+        Set screen brightness (0-100)
+        
+        Args:
+            level: target brightness in percent
+            ramp: fade over config.RAMP_SECONDS instead of jumping (needs the WMI handle)
+        """
         try:
             logger.info(f"💡 Setting brightness to {level}%")
             level = max(0, min(100, level))
             
             try:
-                import wmi
-                c = wmi.WMI(namespace='wmi')
-                methods = c.WmiMonitorBrightnessMethods()[0]
-                methods.WmiSetBrightness(1, level)
+                # ✅ Cached WMI connection (connecting is the slow part)
+                if ramp:
+                    self._ramp(self.brightness.get_brightness, self.brightness.set_brightness, level,
+                               config.RAMP_SECONDS)
+                else:
+                    self.brightness.set_brightness(level)
                 
                 logger.info(f"✓ Brightness set to {level}%")
                 return {"success": True, "message": f"Brightness set to {level}%"}
             
-            except:
-                cmd = f'powershell "(Get-WmiObject -Namespace root\\wmi -Class WmiMonitorBrightnessMethods).WmiSetBrightness(1, {level})"'
-                subprocess.run(cmd, shell=True, capture_output=True, timeout=2)
-                logger.info(f"✓ Brightness set to {level}%")
+            except HandleUnavailable:
+                raise  # no WMI brightness on this machine - PowerShell would use the same provider
+            except Exception as e1:
+                logger.warning(f"WMI brightness failed: {e1}, trying PowerShell")
+                script = f"(Get-WmiObject -Namespace root\\wmi -Class WmiMonitorBrightnessMethods).WmiSetBrightness(1, {level})"
+                result = self._spawn(["powershell", "-NoProfile", "-Command", script],
+                                     capture_output=True, timeout=2)
+                if result.returncode != 0:
+                    raise OSError(f"PowerShell exited with {result.returncode}")
+                logger.info(f"✓ Brightness set to {level}% (PowerShell)")
                 return {"success": True, "message": f"Brightness set to {level}%"}
         
         except Exception as e:
             logger.error(f"Failed to set brightness: {e}")
             return {"success": False, "error": str(e)}
     
+    def change_brightness(self, delta, ramp=False):
+        """
+        Relative brightness change through the WMI handle - no subprocess, and no key fallback
+        (Ctrl+F5/F6 would go to the foreground app, not the display)
+        
+        Args:
+            delta: percent to add (negative = down)
+            ramp: fade over config.RAMP_SECONDS (needs the WMI handle)
+        """
+        direction = 'up' if delta > 0 else 'down'
+        logger.info(f"💡 Brightness {direction} {abs(delta)}%")
+        try:
+            level = max(0, min(100, self.brightness.get_brightness() + delta))
+            if ramp:
+                self._ramp(self.brightness.get_brightness, self.brightness.set_brightness, level,
+                           config.RAMP_SECONDS)
+            else:
+                self.brightness.set_brightness(level)
+            logger.info(f"✓ Brightness {direction} to {level}%")
+            return {"success": True, "message": f"Brightness {direction} to {level}%", "level": level}
+        except Exception as e:
+            logger.error(f"Failed to change brightness: {e}")
+            return {"success": False, "error": str(e)}
+    
     def execute_system_command(self, action):
         """Execute system power commands"""
         try:
             logger.info(f"⚡ Executing system command: {action}")
             
             if action == 'shutdown':
-                subprocess.run(['shutdown', '/s', '/t', '30'], check=False)
+                self._spawn(['shutdown', '/s', '/t', '30'], check=False)
                 return {"success": True, "message": "Shutting down in 30 seconds"}
             elif action == 'restart':
-                subprocess.run(['shutdown', '/r', '/t', '30'], check=False)
+                self._spawn(['shutdown', '/r', '/t', '30'], check=False)
                 return {"success": True, "message": "Restarting in 30 seconds"}
             elif action == 'sleep':
-                subprocess.run(['rundll32.exe', 'powrprof.dll,SetSuspendState', '0,1,0'], check=False)
+                self._spawn(['rundll32.exe', 'powrprof.dll,SetSuspendState', '0,1,0'], check=False)
                 return {"success": True, "message": "Entering sleep mode"}
             elif action == 'lock':
-                subprocess.run(['rundll32.exe', 'user32.dll,LockWorkStation'], check=False)
+                self._spawn(['rundll32.exe', 'user32.dll,LockWorkStation'], check=False)
                 return {"success": True, "message": "Screen locked"}
             else:
                 return {"success": False, "error": f"Unknown command: {action}"}
@@ -3,19 +3,23 @@ EVA - Enhanced Virtual Assistant
 Main entry point following methodology EXACTLY
 """
 import time
+from concurrent.futures import ThreadPoolExecutor
 from colorama import Fore, Style, init
+from speech.audio_capture import AudioCaptureService, CaptureEnded
 from speech.wake_word_detector import WakeWordDetector
-from speech.speech_to_text import SpeechToText
+from speech.speech_to_text import SpeechToText, stable_prefix, normalize_transcript
 from speech.text_to_speech import TextToSpeech
 from models.command_processor import CommandProcessor
 from models.step_generator import StepGenerator  # MODEL 2
-from vision.screen_analyzer import ScreenAnalyzer  # Gemini (summary + filtering)
 from vision.screenshot_handler import ScreenshotHandler
 from execution.executor_bridge import ExecutorBridge
 from execution.action_router import ActionRouter
 from execution.system_executor import SystemExecutor
 from session.session_manager import SessionManager
+from session.pipeline import CommandPipeline
 from utils.logger import setup_logger
+from utils.startup import StartupOrchestrator
+from utils.tracing import tracer
 import config
 
 
@@ -30,24 +34,31 @@ class EVA:
         self.logger = setup_logger('EVA')
         self.logger.info("🚀 Initializing EVA Assistant...")
         
+        self.startup = StartupOrchestrator()
+        
         try:
-            # Speech components
-            self.wake_word = WakeWordDetector(wake_word=config.WAKE_WORD)
-            self.stt = SpeechToText()
-            self.tts = TextToSpeech()
+            # ✅ Critical path first: shared audio stream + wake word (+ TTS for the greeting)
+            self.audio_capture = self.startup.load_now("AudioCapture", AudioCaptureService)
+            self.wake_word = self.startup.load_now(
+                "WakeWordDetector",
+                lambda: WakeWordDetector(wake_word=config.WAKE_WORD, capture=self.audio_capture)
+            )
+            
+            # Heavy components load concurrently; first use waits for them if still loading
+            self.stt = self.startup.load_background("SpeechToText", lambda: SpeechToText(capture=self.audio_capture))
             
             # NLP components (Model 1)
-            self.command_processor = CommandProcessor()
+            self.command_processor = self.startup.load_background("CommandProcessor", CommandProcessor)
             
             # Step generation (Model 2)
-            self.step_generator = StepGenerator()
+            self.step_generator = self.startup.load_background("StepGenerator", StepGenerator)
             
             # Vision components
-            self.screen_analyzer = ScreenAnalyzer(config.GEMINI_API_KEY)  # Gemini
-            self.screenshot_handler = ScreenshotHandler()
+            self.screen_analyzer = self.startup.load_background("ScreenAnalyzer", self._create_screen_analyzer)  # Gemini
+            self.screenshot_handler = self.startup.load_now("ScreenshotHandler", ScreenshotHandler)
             
             # Execution components
-            self.executor_bridge = ExecutorBridge()
+            self.executor_bridge = self.startup.load_background("ExecutorBridge", ExecutorBridge)
             self.system_executor = SystemExecutor(self.executor_bridge)
             
             # Action router (connects everything)
@@ -56,15 +67,27 @@ class EVA:
                 self.screenshot_handler
             )
             
+            # TTS stays on the main thread (SAPI/COM) and overlaps with the background loads
+            self.tts = self.startup.load_now("TextToSpeech", TextToSpeech)
+            
             # Session manager
             self.session_manager = SessionManager(timeout_seconds=10)
             
-            self.logger.info("✅ EVA initialized successfully")
+            # Early classification of stable partial transcripts (streaming STT)
+            self.early_classifier = ThreadPoolExecutor(max_workers=1, thread_name_prefix="EarlyClassify")
+            
+            self.logger.info("✅ EVA initialized (heavy components warming up in background)")
             
         except Exception as e:
             self.logger.error(f"❌ Initialization failed: {e}", exc_info=True)
             raise
     
+    @staticmethod
+    def _create_screen_analyzer():
+        """Gemini client - imported here so google.generativeai loads off the critical path"""
+        from vision.screen_analyzer import ScreenAnalyzer
+        return ScreenAnalyzer(config.GEMINI_API_KEY)
+    
     def run(self):
         """
         Main run loop following methodology
@@ -81,26 +104,36 @@ class EVA:
             # Start wake word detector (Porcupine)
             self.logger.info("Starting Porcupine wake word detection...")
             self.wake_word.start()
+            self.startup.mark_listening()
             
             while True:
                 # IDLE STATE: Wait for wake word
                 print(f"{Fore.MAGENTA}🎤 Listening for '{config.WAKE_WORD.upper()}'...{Style.RESET_ALL}")
                 
                 wake_detected = False
+                command_start = None
                 while not wake_detected:
                     if self.wake_word.listen():
                         wake_detected = True
                         self.logger.info("✓ Wake word detected!")
                         print(f"\n{Fore.GREEN}✓ Wake word detected!{Style.RESET_ALL}")
         
-                        # Greet user (Methodology: "audible acknowledgment")
-                        self.tts.speak("Hey, how can I help you?")
+                        if config.COMMAND_FROM_WAKE_WORD:
+                            # ✅ Record from the wake word frame - a spoken greeting would be captured
+                            command_start = self.wake_word.detection_index
+                            print(f"{Fore.GREEN}Hey, how can I help you?{Style.RESET_ALL}")
+                        else:
+                            # Greet user (Methodology: "audible acknowledgment")
+                            self.tts.speak("Hey, how can I help you?")
         
                         # Start session
                         self.session_manager.start_session()
                         break  # ✅ FIX: Added break to exit wake word loop
     
                 # ACTIVE STATE: Session loop
+                if config.PIPELINED_SESSION:
+                    self.run_pipelined_session(command_start)
+                
                 while self.session_manager.is_active():
                     # Check timeout (Methodology: "10-second inactivity")
                     if self.session_manager.check_timeout():
@@ -111,7 +144,72 @@ class EVA:
                     
                     # Listen for command
                     print(f"\n{Fore.CYAN}✓ Listening for command...{Style.RESET_ALL}")
-                    command_text = self.stt.listen()
+                    with tracer.command():
+                        command_text, command_data = self.listen_command(start_index=command_start)
+                        command_start = None
+                        
+                        if not command_text or command_text.strip() == "":
+                            continue
+                        
+                        print(f"{Fore.WHITE}You: {command_text}{Style.RESET_ALL}")
+                        self.logger.info(f"Command: '{command_text}'")
+                        
+                        # Check for goodbye (Methodology: "deactivated by 'Goodbye'")
+                        if self.session_manager.should_end_session(command_text):
+                            print(f"\n{Fore.GREEN}👋 Goodbye!{Style.RESET_ALL}")
+                            self.tts.speak("Goodbye! Have a great day.")
+                            self.session_manager.end_session()
+                            break
+                        
+                        # Process and execute
+                        print(f"{Fore.YELLOW}⚙️ Processing...{Style.RESET_ALL}")
+                        command_data, result = self.execute_command(command_text, command_data)
+                        self.report_result(command_text, result, command_data)
+                
+                # Session ended - learn its confirmed commands, return to wake word listening
+                self.command_processor.learn(self.session_manager.commands_history)
+                self.wake_word.resume()
+                print(f"\n{Fore.MAGENTA}📴 Session ended. Returning to idle...{Style.RESET_ALL}\n")
+        
+        except KeyboardInterrupt:
+            print(f"\n\n{Fore.YELLOW}Shutting down EVA...{Style.RESET_ALL}")
+            self.shutdown()
+        
+        except CaptureEnded as e:
+            self.logger.error(f"❌ {e} - shutting down")
+            print(f"{Fore.RED}Audio input stopped - shutting down EVA{Style.RESET_ALL}")
+            self.shutdown()
+        
+        except Exception as e:
+            self.logger.error(f"Runtime error: {e}", exc_info=True)
+            print(f"{Fore.RED}Fatal error: {e}{Style.RESET_ALL}")
+            self.shutdown()
+    
+    def run_pipelined_session(self, command_start=None):
+        """
+        Pipelined session: the next command is captured while earlier ones are
+        still being classified and executed (strictly in order)
+        """
+        pipeline = CommandPipeline(
+            plan=self.plan_command,
+            execute=self.run_plan,
+            on_result=self.report_result
+        )
+        pipeline.start()
+        
+        try:
+            while self.session_manager.is_active():
+                # Timeout only counts once nothing is queued or executing
+                if pipeline.idle() and self.session_manager.check_timeout():
+                    print(f"\n{Fore.YELLOW}⏱️ Session timeout (10s inactivity){Style.RESET_ALL}")
+                    self.tts.speak("Session timeout")
+                    self.session_manager.end_session()
+                    break
+                
+                print(f"\n{Fore.CYAN}✓ Listening for command...{Style.RESET_ALL}")
+                with tracer.command():
+                    command_text, command_data = self.listen_command(start_index=command_start)
+                    command_start = None
                     
                     if not command_text or command_text.strip() == "":
                         continue
@@ -119,85 +217,149 @@ class EVA:
                     print(f"{Fore.WHITE}You: {command_text}{Style.RESET_ALL}")
                     self.logger.info(f"Command: '{command_text}'")
                     
-                    # Check for goodbye (Methodology: "deactivated by 'Goodbye'")
                     if self.session_manager.should_end_session(command_text):
+                        pipeline.cancel()
                         print(f"\n{Fore.GREEN}👋 Goodbye!{Style.RESET_ALL}")
                         self.tts.speak("Goodbye! Have a great day.")
                         self.session_manager.end_session()
                         break
                     
-                    # Process and execute
-                    print(f"{Fore.YELLOW}⚙️ Processing...{Style.RESET_ALL}")
-                    result = self.execute_command(command_text)
-                    
-                    # Update session
-                    self.session_manager.add_command(command_text, result)
-                    
-                    # Feedback (Methodology: "TTS confirmations")
-                    if result.get('success'):
-                        message = result.get('message', 'Done')
-                        print(f"{Fore.GREEN}✅ {message}{Style.RESET_ALL}")
-                        # self.tts.speak(message)  # ✅ OPTIONAL: TTS feedback
-                    else:
-                        error = result.get('error', 'Failed')
-                        print(f"{Fore.RED}❌ {error}{Style.RESET_ALL}")
-                        # self.tts.speak(f"Sorry, {error}")  # ✅ OPTIONAL: TTS error
-                
-                # Session ended, return to wake word listening
-                print(f"\n{Fore.MAGENTA}📴 Session ended. Returning to idle...{Style.RESET_ALL}\n")
+                    self.session_manager.update_activity()
+                    pipeline.submit(command_text, command_data)
+                metrics = pipeline.metrics()
+                self.logger.info(
+                    f"Pipeline: {metrics['commands_per_minute']:.1f} commands/min, "
+                    f"queue depth inference={metrics['queue_depth']['inference']} "
+                    f"execution={metrics['queue_depth']['execution']}"
+                )
+        finally:
+            pipeline.stop()
+    
+    def listen_command(self, start_index=None):
+        """
+        Capture one command
         
-        except KeyboardInterrupt:
-            print(f"\n\n{Fore.YELLOW}Shutting down EVA...{Style.RESET_ALL}")
-            self.shutdown()
+        Returns:
+            (command_text, command_data) - command_data is an early classification or None
+        """
+        with tracer.span("stt.listen", streaming=config.STT_STREAMING):
+            if config.STT_STREAMING:
+                return self.listen_streaming(start_index=start_index)
+            return self.stt.listen(start_index=start_index), None
+    
+    def report_result(self, command_text, result, command_data=None):
+        """Record the result in the session and print feedback"""
+        # Update session
+        classification = command_data['classification'] if command_data else None
+        self.session_manager.add_command(command_text, result, classification)
         
-        except Exception as e:
-            self.logger.error(f"Runtime error: {e}", exc_info=True)
-            print(f"{Fore.RED}Fatal error: {e}{Style.RESET_ALL}")
-            self.shutdown()
+        # Feedback (Methodology: "TTS confirmations")
+        if result.get('success'):
+            message = result.get('message', 'Done')
+            print(f"{Fore.GREEN}✅ {message}{Style.RESET_ALL}")
+            # self.tts.speak(message)  # ✅ OPTIONAL: TTS feedback
+        else:
+            error = result.get('error', 'Failed')
+            print(f"{Fore.RED}❌ {error}{Style.RESET_ALL}")
+            # self.tts.speak(f"Sorry, {error}")  # ✅ OPTIONAL: TTS error
     
-    def execute_command(self, command_text):
-        """Process and execute command following methodology pipeline"""
-        try:
-            # Step 1: Command Understanding (Model 1 - Classifier)
-            command_data = self.command_processor.process(command_text)
+    def listen_streaming(self, start_index=None):
+        """
+        Streaming STT - classifies the stable prefix of partial transcripts early
         
-            category = command_data['classification']['category']
-            self.logger.info(f"Category: {category}")
+        Returns:
+            (command_text, command_data) - command_data is the early classification
+            when the final transcript matches the stable prefix, else None
+        """
+        early = {'previous': '', 'prefix': '', 'future': None}
         
-            # ✅ SYSTEM_ACTION: Skip Model 2, go directly to executor
-            if category == 'SYSTEM_ACTION':
-                self.logger.info("🔵 SYSTEM_ACTION bypass → Direct Windows API execution")
-                result = self.action_router.execute(
-                category=category,
-                steps=[],  # ✅ Empty steps - not needed for system commands
-                entities=command_data['entities'],
-                raw_command=command_text,
-                classification=command_data['classification']
-                )
-                return result
+        def on_partial(text):
+            print(f"{Style.DIM}… {text}{Style.RESET_ALL}")
+            if not config.STT_EARLY_CLASSIFY:
+                return
+            prefix = stable_prefix(early['previous'], text)
+            early['previous'] = text
+            if len(prefix) >= 2 and prefix != early['prefix'] and not self.session_manager.should_end_session(prefix):
+                early['prefix'] = prefix
+                early['future'] = self.early_classifier.submit(self.command_processor.process, prefix)
         
-            # ✅ OTHER CATEGORIES: Use Model 2 to generate steps
-            steps = self.step_generator.generate(command_data)
+        command_text, stats = self.stt.listen_streaming(on_partial=on_partial, start_index=start_index)
         
-            result = self.action_router.execute(
-            category=category,
-            steps=steps,
-            entities=command_data['entities'],
-            raw_command=command_text,
-            classification=command_data['classification']
-            )
+        command_data = None
+        if early['future'] and normalize_transcript(command_text) == early['prefix']:
+            try:
+                command_data = early['future'].result()
+                self.logger.info(f"⚡ Using early classification of '{early['prefix']}'")
+            except Exception as e:
+                self.logger.warning(f"Early classification failed: {e}")
         
-            return result
+        return command_text, command_data
+    
+    def execute_command(self, command_text, command_data=None):
+        """
+        Process and execute command following methodology pipeline
+        
+        Returns:
+            (command_data, result) - command_data is None if classification failed
+        """
+        try:
+            command_data, steps = self.plan_command(command_text, command_data)
+            return command_data, self.run_plan(command_text, command_data, steps)
         
         except Exception as e:
             self.logger.error(f"Command execution failed: {e}", exc_info=True)
-            return {'success': False, 'error': str(e)}
-
+            return command_data, {'success': False, 'error': str(e)}
+    
+    def plan_command(self, command_text, command_data=None):
+        """
+        Classify (Model 1) and generate steps (Model 2)
+        
+        Returns:
+            (command_data, steps)
+        """
+        # Step 1: Command Understanding (Model 1 - Classifier)
+        if command_data is None:
+            with tracer.span("classify"):
+                command_data = self.command_processor.process(command_text)
+        
+        category = command_data['classification']['category']
+        self.logger.info(f"Category: {category}")
+        
+        # ✅ SYSTEM_ACTION: Skip Model 2, go directly to executor
+        if category == 'SYSTEM_ACTION':
+            self.logger.info("🔵 SYSTEM_ACTION bypass → Direct Windows API execution")
+            return command_data, []  # ✅ Empty steps - not needed for system commands
+        
+        # ✅ OTHER CATEGORIES: Use Model 2 to generate steps
+        with tracer.span("steps.generate", category=category) as span:
+            steps = self.step_generator.generate(command_data)
+            span.set(steps=len(steps))
+        return command_data, steps
+    
+    def run_plan(self, command_text, command_data, steps):
+        """Route a planned command to the executors"""
+        category = command_data['classification']['category']
+        with tracer.span("execute", category=category) as span:
+            result = self.action_router.execute(
+                category=category,
+                steps=steps,
+                entities=command_data['entities'],
+                raw_command=command_text,
+                classification=command_data['classification']
+            )
+            span.set(success=bool(result.get('success')))
+        return result
     
     def shutdown(self):
         """Clean shutdown"""
         try:
             self.wake_word.stop()
+            self.early_classifier.shutdown(wait=False)
+            self.startup.shutdown()
+            self.stt.log_tier_stats()
+            self.command_processor.close()
+            for path in tracer.export():
+                self.logger.info(f"📈 Trace written to {path}")
             if self.session_manager.is_active():
                 self.session_manager.end_session()
             self.logger.info("EVA shutdown complete")
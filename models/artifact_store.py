@@ -0,0 +1,164 @@
+"""
+Artifact Store - versioned model artifacts with a manifest and content hashes
+Layout: <root>/manifest.json + <root>/<name>/v<N>.{joblib,pkl}
+Artifacts holding large NumPy arrays are written with joblib (uncompressed) so the arrays
+are memory-mapped on load; small ones use plain pickle, whose C unpickler loads them ~10x
+faster than joblib's pure-Python one
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+import time
+import joblib
+import config
+
+logger = logging.getLogger("ArtifactStore")
+
+MANIFEST_VERSION = 1
+
+
+class ArtifactError(Exception):
+    """Missing, unknown or corrupt artifact"""
+
+
+def array_bytes(obj):
+    """Bytes of the NumPy array data inside obj (pickle protocol 5 out-of-band buffers)"""
+    sizes = []
+    pickle.dumps(obj, protocol=5, buffer_callback=lambda buffer: sizes.append(buffer.raw().nbytes))
+    return sum(sizes)
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ArtifactStore:
+    """Save/load named artifacts; each save of changed content becomes a new version"""
+    
+    def __init__(self, root=config.MODEL_WEIGHTS_DIR, mmap_mode=config.ARTIFACT_MMAP_MODE,
+                 verify=config.ARTIFACT_VERIFY_HASH, mmap_min_bytes=config.ARTIFACT_MMAP_MIN_BYTES):
+        """
+        Args:
+            root: Directory holding manifest.json and the artifact files
+            mmap_mode: joblib mmap_mode for loads ('r' = read-only memory map, None = read into memory)
+            verify: Check the content hash on load
+            mmap_min_bytes: Array data size from which an artifact is stored with joblib
+        """
+        self.root = root
+        self.mmap_mode = mmap_mode
+        self.verify = verify
+        self.mmap_min_bytes = mmap_min_bytes
+        self.manifest_path = os.path.join(root, 'manifest.json')
+    
+    def manifest(self):
+        """{'version': 1, 'artifacts': {name: {'current': N, 'versions': {'N': entry}}}}"""
+        if not os.path.exists(self.manifest_path):
+            return {'version': MANIFEST_VERSION, 'artifacts': {}}
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            raise ArtifactError(f"Unreadable manifest {self.manifest_path}: {e}")
+    
+    def _write_manifest(self, manifest):
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+    
+    def entry(self, name, version=None):
+        """Manifest entry for a version (default: current), or None"""
+        artifact = self.manifest()['artifacts'].get(name)
+        if not artifact:
+            return None
+        return artifact['versions'].get(str(version or artifact['current']))
+    
+    def exists(self, name):
+        return self.entry(name) is not None
+    
+    def save(self, name, obj, metadata=None):
+        """
+        Store obj as the current version of name
+        
+        Returns:
+            Version number (unchanged if the content matches the current version)
+        """
+        manifest = self.manifest()
+        artifact = manifest['artifacts'].setdefault(name, {'current': 0, 'versions': {}})
+        version = max([0] + [int(v) for v in artifact['versions']]) + 1
+        
+        os.makedirs(os.path.join(self.root, name), exist_ok=True)
+        data_bytes = array_bytes(obj)
+        fmt = 'joblib' if data_bytes >= self.mmap_min_bytes else 'pickle'
+        relative = f"{name}/v{version}.{'joblib' if fmt == 'joblib' else 'pkl'}"
+        path = os.path.join(self.root, relative)
+        if fmt == 'joblib':
+            joblib.dump(obj, path)  # ✅ Uncompressed - required for mmap_mode
+        else:
+            with open(path, 'wb') as f:
+                pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        sha256 = file_sha256(path)
+        
+        current = artifact['versions'].get(str(artifact['current']))
+        if current and current['sha256'] == sha256:
+            os.remove(path)
+            logger.info(f"✓ {name} unchanged (v{artifact['current']})")
+            return artifact['current']
+        
+        artifact['versions'][str(version)] = {
+            'file': relative,
+            'format': fmt,
+            'sha256': sha256,
+            'array_bytes': data_bytes,
+            'bytes': os.path.getsize(path),
+            'created': time.time(),
+            'metadata': metadata or {}
+        }
+        artifact['current'] = version
+        self._write_manifest(manifest)
+        logger.info(f"✓ Saved {name} v{version} ({sha256[:12]})")
+        return version
+    
+    def load(self, name, version=None):
+        """
+        Load an artifact (default: current version)
+        
+        Raises:
+            ArtifactError: Unknown name/version, missing file or hash mismatch
+        """
+        entry = self.entry(name, version)
+        if entry is None:
+            raise ArtifactError(f"No artifact {name}" + (f" v{version}" if version else ""))
+        
+        path = os.path.join(self.root, entry['file'])
+        if not os.path.exists(path):
+            raise ArtifactError(f"Artifact file missing: {path}")
+        if self.verify and file_sha256(path) != entry['sha256']:
+            raise ArtifactError(f"Content hash mismatch for {path}")
+        if entry.get('format') == 'pickle':
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        return joblib.load(path, mmap_mode=self.mmap_mode)
+    
+    def prune(self, name, keep=3):
+        """Delete all but the newest `keep` versions of name"""
+        manifest = self.manifest()
+        artifact = manifest['artifacts'].get(name)
+        if not artifact:
+            return
+        versions = sorted(artifact['versions'], key=int)
+        for version in versions[:-keep] if keep else versions:
+            if int(version) == artifact['current']:
+                continue
+            entry = artifact['versions'].pop(version)
+            path = os.path.join(self.root, entry['file'])
+            if os.path.exists(path):
+                os.remove(path)
+        self._write_manifest(manifest)
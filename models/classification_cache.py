@@ -0,0 +1,136 @@
+"""
+Classification Cache - LRU + TTL cache of intent classifications
+Keyed on normalized command text with numbers masked, so "set volume to 30" and
+"Set volume to 70." share one entry (entities are still extracted from the real text)
+"""
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+import config
+
+logger = logging.getLogger("ClassificationCache")
+
+_NUMBER = re.compile(r'\d+(?:\.\d+)?')
+_PUNCTUATION = re.compile(r'[^\w\s<>]')
+_SPACES = re.compile(r'\s+')
+
+
+def cache_key(text):
+    """Lowercase, mask numbers, strip punctuation, collapse whitespace"""
+    key = _NUMBER.sub('<num>', text.lower())
+    key = _PUNCTUATION.sub(' ', key)
+    return _SPACES.sub(' ', key).strip()
+
+
+class ClassificationCache:
+    """Thread-safe LRU cache with per-entry expiry and optional JSON persistence"""
+    
+    def __init__(self, max_entries=config.CLASSIFIER_CACHE_SIZE,
+                 ttl=config.CLASSIFIER_CACHE_TTL,
+                 path=config.CLASSIFIER_CACHE_PATH,
+                 min_confidence=config.CLASSIFIER_CACHE_MIN_CONFIDENCE):
+        """
+        Args:
+            max_entries: Size limit - least recently used entries are evicted beyond it
+            ttl: Seconds an entry stays valid (None = forever)
+            path: JSON file to load from / save to (None = memory only)
+            min_confidence: Classifications below this aren't cached (fallbacks, guesses)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.min_confidence = min_confidence
+        
+        self.entries = OrderedDict()  # key -> (expires_at wall time or None, classification)
+        self.lock = threading.Lock()
+        self.counters = {'hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0, 'skipped': 0}
+        
+        if self.path:
+            self.load()
+    
+    def get(self, text):
+        """Cached classification for text, or None"""
+        key = cache_key(text)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.counters['misses'] += 1
+                return None
+            
+            expires_at, classification = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self.entries[key]
+                self.counters['expired'] += 1
+                self.counters['misses'] += 1
+                return None
+            
+            self.entries.move_to_end(key)
+            self.counters['hits'] += 1
+            return dict(classification)
+    
+    def put(self, text, classification):
+        """Store a classification (ignored when below min_confidence)"""
+        if (classification.get('confidence') or 0) < self.min_confidence or classification.get('action') == 'unknown':
+            with self.lock:
+                self.counters['skipped'] += 1
+            return
+        
+        key = cache_key(text)
+        expires_at = time.time() + self.ttl if self.ttl else None
+        with self.lock:
+            self.entries[key] = (expires_at, dict(classification))
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.counters['evictions'] += 1
+    
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+    
+    def stats(self):
+        """Counters plus size and hit rate"""
+        with self.lock:
+            stats = dict(self.counters)
+            stats['size'] = len(self.entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+    
+    def load(self):
+        """Load unexpired entries from disk (missing or corrupt file = empty cache)"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Ignoring unreadable cache file {self.path}: {e}")
+            return
+        
+        now = time.time()
+        with self.lock:
+            for key, expires_at, classification in stored.get('entries', []):
+                if expires_at is None or expires_at > now:
+                    self.entries[key] = (expires_at, classification)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        logger.info(f"✓ Loaded {len(self.entries)} cached classifications")
+    
+    def save(self):
+        """Write entries to disk atomically (LRU order preserved)"""
+        if not self.path:
+            return
+        with self.lock:
+            entries = [[key, expires_at, classification] for key, (expires_at, classification) in self.entries.items()]
+        
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'entries': entries}, f)
+        os.replace(tmp_path, self.path)
+        logger.info(f"✓ Saved {len(entries)} cached classifications")
@@ -4,15 +4,9 @@ Classifies commands into: SYSTEM_ACTION, APP_LAUNCH, IN_APP_ACTION, WEB_ACTION
 Zero hardcoding, fully ML-based (except system commands list)
 """
 
-import joblib
-import os
-import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import classification_report
-import config
 from utils.logger import setup_logger
+from models.artifact_store import ArtifactStore
+from models.keyword_matcher import KeywordMatcher
 
 
 class CommandClassifier:
@@ -28,15 +22,44 @@ class CommandClassifier:
         'battery': ['enable battery saver', 'disable battery saver', 'power saver on', 'power saver off'],
     }
     
+    # Keyword rules, in priority order within each group
+    SYSTEM_PATTERNS = {
+        'volume': ['volume', 'sound level', 'audio level'],
+        'brightness': ['brightness', 'screen brightness'],
+        'shutdown': ['shut down', 'power off', 'turn off computer'],
+        'restart': ['restart', 'reboot'],
+        'sleep': ['sleep', 'hibernate'],
+        'lock': ['lock screen', 'lock computer', 'lock my screen']
+    }
+    LAUNCH_KEYWORDS = ['open', 'launch', 'start', 'run']
+    IN_APP_KEYWORDS = [
+        'click', 'press', 'tap', 'select',
+        'send', 'message', 'text',
+        'type', 'write', 'enter',
+        'search', 'find', 'look for',
+        'scroll', 'swipe',
+        'play', 'pause', 'stop',
+        'next', 'previous', 'back',
+        'close', 'minimize', 'maximize'
+    ]
+    
+    # ✅ All rules compiled once - one pass over the text finds every hit
+    KEYWORDS = KeywordMatcher({
+        'system': SYSTEM_PATTERNS,
+        'launch': {keyword: [keyword] for keyword in LAUNCH_KEYWORDS},
+        'in_app': {'in_app': IN_APP_KEYWORDS},
+        'legacy': SYSTEM_COMMANDS
+    })
+    
     def __init__(self):
         self.logger = setup_logger('CommandClassifier')
-        self.model_path = os.path.join(config.MODEL_WEIGHTS_DIR, 'classifier_model.pkl')
-        self.vectorizer_path = os.path.join(config.MODEL_WEIGHTS_DIR, 'classifier_vectorizer.pkl')
+        # ✅ Same artifact the trainer writes and the tiered classifier reads (Model 1 pipeline)
+        self.store = ArtifactStore()
         
         self.model = None
         self.vectorizer = None
         
-        if os.path.exists(self.model_path) and os.path.exists(self.vectorizer_path):
+        if self.store.exists('command_classifier'):
             self.load_model()
         else:
             self.train_default_model()
@@ -55,23 +78,24 @@ class CommandClassifier:
         }
         """
         text_lower = text.lower().strip()
+        hits = self.KEYWORDS.scan(text_lower)
         
         self.logger.info(f"Classifying: '{text}'")
         
         # Priority 1: SYSTEM COMMANDS (highest priority)
-        system_result = self._detect_system_command(text_lower)
+        system_result = self._detect_system_command(text_lower, hits)
         if system_result:
             self.logger.info(f"Classified: '{text}' → SYSTEM_ACTION ({system_result['subcategory']}) (confidence: {system_result['confidence']:.2%})")
             return system_result
         
         # Priority 2: APP LAUNCH
-        app_result = self._detect_app_launch(text_lower, text)
+        app_result = self._detect_app_launch(text_lower, text, hits)
         if app_result:
             self.logger.info(f"Classified: '{text}' → APP_LAUNCH (confidence: {app_result['confidence']:.2%})")
             return app_result
         
         # Priority 3: IN-APP ACTION
-        in_app_result = self._detect_in_app_action(text_lower)
+        in_app_result = self._detect_in_app_action(text_lower, hits)
         if in_app_result:
             self.logger.info(f"Classified: '{text}' → IN_APP_ACTION (confidence: {in_app_result['confidence']:.2%})")
             return in_app_result
@@ -86,19 +110,20 @@ class CommandClassifier:
             'raw_command': text
         }
     
-    def _detect_system_command(self, text_lower):
+    @classmethod
+    def scan(cls, text_lower):
+        """Every keyword rule hit in one pass - pass it to the _detect_* methods to avoid rescanning"""
+        return cls.KEYWORDS.scan(text_lower)
+    
+    @classmethod
+    def _detect_system_command(cls, text_lower, hits=None):
         """Detect system-level commands"""
-        system_patterns = {
-            'volume': ['volume', 'sound level', 'audio level'],
-            'brightness': ['brightness', 'screen brightness'],
-            'shutdown': ['shut down', 'power off', 'turn off computer'],
-            'restart': ['restart', 'reboot'],
-            'sleep': ['sleep', 'hibernate'],
-            'lock': ['lock screen', 'lock computer', 'lock my screen']
-        }
+        if hits is None:
+            hits = cls.KEYWORDS.scan(text_lower)
+        found = {hit.label for hit in hits if hit.family == 'system'}
         
-        for subcategory, keywords in system_patterns.items():
-            if any(kw in text_lower for kw in keywords):
+        for subcategory in cls.SYSTEM_PATTERNS:
+            if subcategory in found:
                 return {
                     'category': 'SYSTEM_ACTION',
                     'subcategory': subcategory,
@@ -109,46 +134,42 @@ class CommandClassifier:
         
         return None
     
-    def _detect_app_launch(self, text_lower, original_text):
+    @classmethod
+    def _detect_app_launch(cls, text_lower, original_text, hits=None):
         """Detect app launch commands"""
-        launch_keywords = ['open', 'launch', 'start', 'run']
-        
-        for keyword in launch_keywords:
-            if keyword in text_lower:
+        if hits is None:
+            hits = cls.KEYWORDS.scan(text_lower)
+        first = {}  # launch keyword -> its first occurrence
+        for hit in hits:
+            if hit.family == 'launch':
+                first.setdefault(hit.label, hit)
+        
+        for keyword in cls.LAUNCH_KEYWORDS:
+            if keyword in first:
                 # Extract app name after keyword
-                parts = text_lower.split(keyword, 1)
-                if len(parts) > 1:
-                    app_name = parts[1].strip()  # ✅ FIXED: Correct order
-                    
-                    # Clean app name (remove punctuation)
-                    app_name = app_name.replace('.', '').replace(',', '').replace('?', '').replace('!', '').strip()
-                    
-                    if app_name:
-                        return {
-                            'category': 'APP_LAUNCH',
-                            'confidence': 0.90,
-                            'subcategory': None,
-                            'requires_screen_analysis': False,
-                            'raw_command': original_text,
-                            'app_name': app_name
-                        }
+                app_name = text_lower[first[keyword].end:].strip()  # ✅ FIXED: Correct order
+                
+                # Clean app name (remove punctuation)
+                app_name = app_name.replace('.', '').replace(',', '').replace('?', '').replace('!', '').strip()
+                
+                if app_name:
+                    return {
+                        'category': 'APP_LAUNCH',
+                        'confidence': 0.90,
+                        'subcategory': None,
+                        'requires_screen_analysis': False,
+                        'raw_command': original_text,
+                        'app_name': app_name
+                    }
         
         return None
     
-    def _detect_in_app_action(self, text_lower):
+    def _detect_in_app_action(self, text_lower, hits=None):
         """Detect in-app actions"""
-        in_app_keywords = [
-            'click', 'press', 'tap', 'select',
-            'send', 'message', 'text',
-            'type', 'write', 'enter',
-            'search', 'find', 'look for',
-            'scroll', 'swipe',
-            'play', 'pause', 'stop',
-            'next', 'previous', 'back',
-            'close', 'minimize', 'maximize'
-        ]
-        
-        if any(kw in text_lower for kw in in_app_keywords):
+        if hits is None:
+            hits = self.KEYWORDS.scan(text_lower)
+        
+        if any(hit.family == 'in_app' for hit in hits):
             return {
                 'category': 'IN_APP_ACTION',
                 'confidence': 0.85,
@@ -161,70 +182,36 @@ class CommandClassifier:
     
     def _is_system_command(self, command):
         """Check if command is a system command (legacy compatibility)"""
-        command = command.lower()
-        for category, phrases in self.SYSTEM_COMMANDS.items():
-            for phrase in phrases:
-                if phrase in command:
-                    return True, category
+        found = {hit.label for hit in self.KEYWORDS.scan(command.lower()) if hit.family == 'legacy'}
+        for category in self.SYSTEM_COMMANDS:
+            if category in found:
+                return True, category
         return False, None
     
     def train_default_model(self):
-        """Train a default model with sample data"""
+        """Train Model 1 from the bundled data in-process (not persisted - only the trainer saves)"""
+        from train_models_complete import MODEL1_TRAINING_DATA, create_model1_pipeline
         self.logger.info("Training default classification model...")
         
-        # Sample training data
-        training_data = [
-            # APP_LAUNCH examples
-            ("open chrome", "APP_LAUNCH"),
-            ("launch spotify", "APP_LAUNCH"),
-            ("start notepad", "APP_LAUNCH"),
-            ("run calculator", "APP_LAUNCH"),
-            ("open whatsapp", "APP_LAUNCH"),
-            
-            # IN_APP_ACTION examples
-            ("click on the button", "IN_APP_ACTION"),
-            ("send a message to john", "IN_APP_ACTION"),
-            ("type hello world", "IN_APP_ACTION"),
-            ("search for python tutorial", "IN_APP_ACTION"),
-            ("scroll down", "IN_APP_ACTION"),
-            ("close this window", "IN_APP_ACTION"),
-            
-            # WEB_ACTION examples
-            ("search google for weather", "WEB_ACTION"),
-            ("browse to youtube", "WEB_ACTION"),
-            ("go to gmail", "WEB_ACTION"),
-            
-            # CONVERSATION examples
-            ("what time is it", "CONVERSATION"),
-            ("tell me a joke", "CONVERSATION"),
-            ("how are you", "CONVERSATION"),
-        ]
-        
-        X = [item[0] for item in training_data]
-        y = [item[1] for item in training_data]
-        
-        # Train vectorizer
-        self.vectorizer = TfidfVectorizer(max_features=100)
-        X_vectorized = self.vectorizer.fit_transform(X)
-        
-        # Train classifier
-        self.model = RandomForestClassifier(n_estimators=50, random_state=42)
-        self.model.fit(X_vectorized, y)
-        
-        # Save model
-        os.makedirs(config.MODEL_WEIGHTS_DIR, exist_ok=True)
-        joblib.dump(self.model, self.model_path)
-        joblib.dump(self.vectorizer, self.vectorizer_path)
+        X = [text for text, _ in MODEL1_TRAINING_DATA]
+        y = [label for _, label in MODEL1_TRAINING_DATA]
+        
+        pipeline = create_model1_pipeline()
+        pipeline.fit(X, y)
+        self._use_pipeline(pipeline)
         
         self.logger.info("Classification model trained successfully")
     
     def load_model(self):
         """Load pre-trained model"""
         try:
-            self.model = joblib.load(self.model_path)
-            self.vectorizer = joblib.load(self.vectorizer_path)
+            self._use_pipeline(self.store.load('command_classifier'))
             self.logger.info("Classification model loaded successfully")
         except Exception as e:
             self.logger.error(f"Failed to load model: {e}")
             self.logger.info("Falling back to training new model")
             self.train_default_model()
+    
+    def _use_pipeline(self, pipeline):
+        self.model = pipeline
+        self.vectorizer = pipeline.named_steps['tfidf']
@@ -4,7 +4,11 @@ This REPLACES Model 1
 """
 import logging
 import re
+import config
 from models.semantic_classifier import SemanticClassifier
+from models.tiered_classifier import TieredClassifier
+from models.classification_cache import ClassificationCache
+from models.feedback import OnlineLearner
 
 logger = logging.getLogger("CommandProcessor")
 
@@ -12,9 +16,14 @@ class CommandProcessor:
     """Process commands with semantic understanding"""
     
     def __init__(self):
-        """Initialize with Semantic Classifier"""
+        """Initialize with Semantic Classifier (behind the local fast path when enabled)"""
         try:
-            self.classifier = SemanticClassifier(model="mistral")
+            self.llm = SemanticClassifier(model=config.OLLAMA_MODEL)
+            self.classifier = TieredClassifier(self.llm) if config.LOCAL_CLASSIFIER_ENABLED else self.llm
+            self.cache = ClassificationCache() if config.CLASSIFIER_CACHE_ENABLED else None
+            self.learner = None
+            if config.ONLINE_LEARNING_ENABLED and isinstance(self.classifier, TieredClassifier):
+                self.learner = OnlineLearner(self.classifier).start()
         except Exception as e:
             logger.error(f"Failed to initialize semantic classifier: {e}")
             raise
@@ -24,8 +33,13 @@ class CommandProcessor:
         if not text or len(text.strip()) < 2:
             raise Exception("Text too short")
         
-        # ✅ Use Semantic Classifier (Ollama LLM)
-        classification = self.classifier.classify(text)
+        # ✅ Cache first, then local fast path, Semantic Classifier (Ollama LLM) when it isn't confident
+        classification = self.cache.get(text) if self.cache else None
+        cached = classification is not None
+        if cached:
+            logger.info(f"💾 Cached: '{text}' → {classification.get('category')}")
+        else:
+            classification = self.classifier.classify(text)
         category = classification.get('category', '')
         confidence = classification.get('confidence', 0)
         action = classification.get('action', '')
@@ -36,7 +50,10 @@ class CommandProcessor:
             logger.warning(f"Invalid: {category}")
             raise Exception(f"Invalid category: {category}")
         
-        # Extract entities
+        if self.cache and not cached:
+            self.cache.put(text, classification)
+        
+        # Extract entities (from the real text - the cache key has numbers masked)
         entities = self._extract_entities(text, category, action)
         
         return {
@@ -44,12 +61,35 @@ class CommandProcessor:
                 "category": category,
                 "confidence": confidence,
                 "action": action,
-                "raw_command": text
+                "raw_command": text,
+                "source": classification.get('source', 'llm'),  # who labelled it (kept on cache hits)
+                "cached": cached
             },
             "entities": entities,
             "raw_command": text
         }
     
+    def learn(self, commands_history):
+        """Feed a session's confirmed commands to the nearest-phrase tier and Model 1"""
+        matcher = getattr(self.classifier, 'matcher', None)
+        if matcher:
+            matcher.add_from_history(commands_history)
+        if self.learner:
+            self.learner.submit(commands_history)  # ✅ Background update - doesn't block the command loop
+    
+    def close(self):
+        """Log classifier/cache stats, finish pending model updates and persist the cache"""
+        if self.learner:
+            self.learner.stop()
+        if hasattr(self.classifier, 'log_stats'):
+            self.classifier.log_stats()
+        if self.cache:
+            stats = self.cache.stats()
+            logger.info(f"📊 Classification cache: {stats['hits']} hits / {stats['misses']} misses "
+                        f"({stats['hit_rate']*100:.0f}%), {stats['size']} entries")
+            self.cache.save()
+        self.llm.close()
+    
     def _extract_entities(self, text, category, action):
         """Extract parameters from command"""
         entities = {"action": action}
@@ -0,0 +1,197 @@
+"""
+Feedback - confirmed commands are logged and folded into Model 1 while EVA runs
+Model 1's TF-IDF vocabulary stays fixed; MultinomialNB absorbs the new examples with
+partial_fit on a background thread and the updated pipeline is swapped in atomically
+"""
+import copy
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from sklearn.pipeline import Pipeline
+import config
+from models.artifact_store import ArtifactStore
+
+logger = logging.getLogger("Feedback")
+
+CATEGORIES = ('SYSTEM_ACTION', 'APP_LAUNCH', 'IN_APP_ACTION', 'WEB_ACTION')
+LEARNED_SOURCES = ('llm',)  # local answers ('model', 'keyword', 'nearest') would reinforce Model 1's own mistakes
+
+
+def confirmed_commands(commands_history):
+    """(text, category, action) for successful, LLM-labelled commands in SessionManager.commands_history"""
+    confirmed = []
+    for entry in commands_history:
+        classification = entry.get('classification')
+        if not classification or not (entry.get('result') or {}).get('success'):
+            continue
+        if classification.get('category') not in CATEGORIES:
+            continue
+        if classification.get('source', 'llm') not in LEARNED_SOURCES:
+            continue
+        confirmed.append((entry['command'], classification['category'], classification.get('action', '')))
+    return confirmed
+
+
+class FeedbackLog:
+    """Append-only JSONL log of confirmed (text, category, action) examples"""
+    
+    def __init__(self, path=config.FEEDBACK_LOG_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+    
+    def append(self, examples):
+        """Append examples in one write"""
+        if not examples:
+            return
+        now = round(time.time(), 3)
+        lines = "".join(
+            json.dumps({'text': text, 'category': category, 'action': action, 'ts': now}, separators=(',', ':')) + "\n"
+            for text, category, action in examples
+        )
+        with self.lock:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(lines)
+    
+    def read(self, start=0):
+        """Examples from record index `start` on (unreadable lines come back as None so offsets line up)"""
+        if not os.path.exists(self.path):
+            return []
+        examples = []
+        with self.lock, open(self.path, 'r', encoding='utf-8') as f:
+            for index, line in enumerate(f):
+                if index < start:
+                    continue
+                try:
+                    record = json.loads(line)
+                    examples.append((record['text'], record['category'], record.get('action', '')))
+                except (ValueError, KeyError):
+                    logger.warning(f"⚠️ Skipping bad feedback record {index}")
+                    examples.append(None)
+        return examples
+
+
+class OnlineLearner:
+    """Background partial_fit of Model 1 with a non-blocking hot swap into the TieredClassifier"""
+    
+    def __init__(self, classifier, log=None, store=None, persist=config.ONLINE_LEARNING_PERSIST):
+        """
+        Args:
+            classifier: TieredClassifier - its `pipeline` attribute is replaced after each update
+            log: FeedbackLog (defaults to FEEDBACK_LOG_PATH)
+            store: ArtifactStore the updated pipeline is saved to
+            persist: Save each updated pipeline as a new command_classifier version
+        """
+        self.classifier = classifier
+        self.log = log or FeedbackLog()
+        self.store = store or ArtifactStore()
+        self.persist = persist
+        
+        self.queue = queue.Queue()
+        self.thread = None
+        self.counters = {'updates': 0, 'examples': 0, 'seconds': 0.0, 'max_seconds': 0.0}
+        self.offset = self._applied_offset()  # log records already folded into the pipeline
+    
+    def _applied_offset(self):
+        try:
+            entry = self.store.entry('command_classifier')
+        except Exception:
+            return 0
+        return (entry or {}).get('metadata', {}).get('feedback_offset', 0)
+    
+    def start(self):
+        """Start the worker; log records newer than the loaded model are applied first"""
+        pending = self.log.read(self.offset)
+        if pending:
+            logger.info(f"🔁 Replaying {len(pending)} feedback records")
+            self.queue.put(('replay', pending))
+        self.thread = threading.Thread(target=self._run, name="OnlineLearner", daemon=True)
+        self.thread.start()
+        return self
+    
+    def submit(self, commands_history):
+        """
+        Queue a session's confirmed commands (returns immediately)
+        
+        Returns:
+            Number of examples queued
+        """
+        examples = confirmed_commands(commands_history)
+        if examples:
+            self.queue.put(('new', examples))
+        return len(examples)
+    
+    def stop(self, timeout=5.0):
+        """Finish queued updates and stop the worker"""
+        if self.thread and self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join(timeout)
+    
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            batch = [item]
+            stop = False
+            while True:  # fold everything already queued into one update
+                try:
+                    more = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if more is None:
+                    stop = True
+                    break
+                batch.append(more)
+            
+            try:
+                self._apply(batch)
+            except Exception as e:
+                logger.error(f"Online update failed: {e}", exc_info=True)
+            if stop:
+                return
+    
+    def _apply(self, batch):
+        new = [example for kind, examples in batch if kind == 'new' for example in examples]
+        self.log.append(new)
+        records = [example for _, examples in batch for example in examples]
+        examples = [example for example in records if example is not None]
+        
+        start = time.perf_counter()
+        current = self.classifier.pipeline
+        classes = set(current.classes_)
+        examples = [example for example in examples if example[1] in classes]
+        if examples:
+            updated = self.update(current, examples)
+            self.classifier.pipeline = updated  # ✅ Atomic swap - classify() calls already running keep the old one
+        seconds = time.perf_counter() - start
+        self.offset += len(records)
+        
+        self.counters['updates'] += 1
+        self.counters['examples'] += len(examples)
+        self.counters['seconds'] += seconds
+        self.counters['max_seconds'] = max(self.counters['max_seconds'], seconds)
+        logger.info(f"📚 Model 1 updated with {len(examples)} confirmed commands ({seconds*1000:.1f}ms)")
+        
+        if self.persist and examples:
+            self.store.save('command_classifier', self.classifier.pipeline,
+                            metadata={'source': 'feedback', 'feedback_offset': self.offset})
+            self.store.prune('command_classifier', keep=config.ONLINE_LEARNING_KEEP_VERSIONS)
+    
+    @staticmethod
+    def update(pipeline, examples):
+        """New TF-IDF/NB pipeline with examples added via partial_fit (the frozen vectorizer is shared)"""
+        vectorizer = pipeline.named_steps['tfidf']
+        model = copy.deepcopy(pipeline.named_steps['clf'])
+        model.partial_fit(vectorizer.transform([text.lower().strip() for text, _, _ in examples]),
+                          [category for _, category, _ in examples])
+        return Pipeline([('tfidf', vectorizer), ('clf', model)])
+    
+    def get_stats(self):
+        stats = dict(self.counters)
+        stats['mean_seconds'] = stats['seconds'] / stats['updates'] if stats['updates'] else 0.0
+        stats['pending'] = self.queue.qsize()
+        return stats
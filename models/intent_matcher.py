@@ -0,0 +1,133 @@
+"""
+Intent Matcher - nearest-neighbour lookup over labelled command phrases
+TF-IDF over hashed character n-grams (robust to unseen words and STT typos) with a
+brute-force NumPy cosine index; new confirmed commands can be appended at any time
+"""
+import logging
+import re
+import threading
+import zlib
+import numpy as np
+import config
+from models.classification_cache import cache_key
+from models.feedback import confirmed_commands
+
+logger = logging.getLogger("IntentMatcher")
+
+_WORD = re.compile(r'\S+')
+
+
+def _features(text, ngram_range):
+    """Hashed char n-grams within word boundaries (like sklearn's char_wb) plus whole words"""
+    hashes = []
+    low, high = ngram_range
+    for word in _WORD.findall(cache_key(text)):
+        hashes.append(zlib.crc32(b'w:' + word.encode('utf-8')))
+        padded = f" {word} "
+        for n in range(low, high + 1):
+            for i in range(max(1, len(padded) - n + 1)):
+                hashes.append(zlib.crc32(padded[i:i + n].encode('utf-8')))
+    return hashes
+
+
+class IntentMatcher:
+    """Brute-force cosine nearest neighbour over TF-IDF vectors"""
+    
+    def __init__(self, phrases, dimensions=config.INTENT_MATCHER_DIMENSIONS, ngram_range=(3, 4)):
+        """
+        Args:
+            phrases: Iterable of (text, category, action) used to fit IDF and seed the index
+            dimensions: Hashed feature space size
+            ngram_range: Character n-gram lengths
+        """
+        self.dimensions = dimensions
+        self.ngram_range = ngram_range
+        self.lock = threading.Lock()
+        
+        phrases = list(phrases)
+        # IDF is fitted once on the seed corpus so stored vectors stay valid as phrases are added
+        df = np.zeros(dimensions, dtype=np.float32)
+        for text, _, _ in phrases:
+            df[np.unique(self._buckets(text))] += 1
+        self.idf = (np.log((1 + len(phrases)) / (1 + df)) + 1).astype(np.float32)
+        
+        self.matrix = np.zeros((max(16, len(phrases)), dimensions), dtype=np.float32)
+        self.size = 0
+        self.texts, self.categories, self.actions = [], [], []
+        self.known = set()  # (normalized text, category) already indexed
+        for text, category, action in phrases:
+            self.add(text, category, action)
+        logger.info(f"✓ Intent matcher ready ({self.size} phrases)")
+    
+    @classmethod
+    def from_training_data(cls):
+        """Seed from Model 1's labelled phrases (actions inferred like the local tier)"""
+        from train_models_complete import MODEL1_TRAINING_DATA
+        from models.tiered_classifier import infer_action
+        return cls((text, category, infer_action(category, text.lower()))
+                   for text, category in MODEL1_TRAINING_DATA)
+    
+    def _buckets(self, text):
+        return np.array(_features(text, self.ngram_range), dtype=np.int64) % self.dimensions
+    
+    def vectorize(self, text):
+        """Sparse L2-normalized TF-IDF vector as (bucket indices, weights)"""
+        buckets, counts = np.unique(self._buckets(text), return_counts=True)
+        weights = counts.astype(np.float32) * self.idf[buckets]
+        norm = np.linalg.norm(weights)
+        return buckets, (weights / norm if norm else weights)
+    
+    def add(self, text, category, action):
+        """Index one phrase; returns False if it was already known"""
+        key = (cache_key(text), category)
+        buckets, weights = self.vectorize(text)
+        with self.lock:
+            if key in self.known or not len(buckets):
+                return False
+            if self.size == len(self.matrix):
+                grown = np.zeros((len(self.matrix) * 2, self.dimensions), dtype=np.float32)
+                grown[:self.size] = self.matrix[:self.size]
+                self.matrix = grown
+            self.matrix[self.size, buckets] = weights
+            self.size += 1
+            self.texts.append(text)
+            self.categories.append(category)
+            self.actions.append(action)
+            self.known.add(key)
+        return True
+    
+    def add_from_history(self, commands_history):
+        """
+        Index confirmed commands from SessionManager.commands_history
+        (successful results that carry their classification)
+        
+        Returns:
+            Number of new phrases added
+        """
+        added = sum(self.add(text, category, action) for text, category, action in confirmed_commands(commands_history))
+        if added:
+            logger.info(f"✓ Intent matcher learned {added} confirmed commands ({self.size} phrases)")
+        return added
+    
+    def match(self, text):
+        """
+        Nearest indexed phrase
+        
+        Returns:
+            {'category', 'action', 'similarity', 'phrase'} or None when nothing overlaps
+        """
+        buckets, weights = self.vectorize(text)
+        if not len(buckets):
+            return None
+        with self.lock:
+            # Only the query's non-zero columns matter - a gather + small dot instead of a full matmul
+            scores = self.matrix[:self.size, buckets] @ weights
+            best = int(scores.argmax()) if self.size else -1
+            if best < 0 or scores[best] <= 0:
+                return None
+            return {
+                'category': self.categories[best],
+                'action': self.actions[best],
+                'similarity': float(scores[best]),
+                'phrase': self.texts[best]
+            }
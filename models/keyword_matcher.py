@@ -0,0 +1,63 @@
+"""
+Keyword Matcher - every keyword rule compiled into one regex, matched in a single pass
+The keywords are folded into a trie-shaped pattern inside a lookahead, so each position of
+the text is tried once and overlapping hits are kept (same answers as `kw in text` checks)
+"""
+import re
+from collections import namedtuple
+
+KeywordHit = namedtuple('KeywordHit', ['family', 'label', 'keyword', 'start', 'end'])
+
+
+def _trie_pattern(node):
+    """Regex for a trie node - alternatives are keyed by distinct characters, longest match wins"""
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    return f'(?:{body})?' if '' in node else body
+
+
+class KeywordMatcher:
+    """Substring keyword rules for several families, scanned in one regex pass"""
+    
+    def __init__(self, rules):
+        """
+        Args:
+            rules: {family: {label: [keywords]}} - keywords match as plain substrings
+        """
+        self.targets = {}  # keyword -> [(family, label)]
+        for family, labels in rules.items():
+            for label, keywords in labels.items():
+                for keyword in keywords:
+                    self.targets.setdefault(keyword, []).append((family, label))
+        
+        # Any keyword matching at a position is a prefix of the longest one matching there,
+        # so the longest match plus its prefix-keywords is every hit starting at that position
+        self.implied = {
+            keyword: [(other, target) for other in self.targets if keyword.startswith(other)
+                      for target in self.targets[other]]
+            for keyword in self.targets
+        }
+        
+        trie = {}
+        for keyword in self.targets:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[''] = True
+        self.pattern = re.compile(f'(?=({_trie_pattern(trie)}))')
+    
+    def scan(self, text):
+        """
+        Every keyword occurrence in text (overlapping included)
+        
+        Returns:
+            List of KeywordHit ordered by start position
+        """
+        hits = []
+        for match in self.pattern.finditer(text):
+            start = match.start()
+            for keyword, (family, label) in self.implied[match.group(1)]:
+                hits.append(KeywordHit(family, label, keyword, start, start + len(keyword)))
+        return hits
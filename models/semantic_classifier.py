@@ -4,35 +4,24 @@ Replaces Model 1 - understands intent semantically
 """
 import logging
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import requests
-from typing import Dict
+from requests.adapters import HTTPAdapter
+from typing import Dict, List
+import config
+from utils.tracing import tracer
 
 logger = logging.getLogger("SemanticClassifier")
 
-class SemanticClassifier:
-    """Classify commands using local LLM"""
-    
-    def __init__(self, model="mistral", host="http://localhost:11434"):
-        """Initialize with local Ollama"""
-        self.model = model
-        self.host = host
-        self.api_endpoint = f"{host}/api/generate"
-        logger.info(f"✓ Semantic Classifier initialized (Model: {model})")
-        
-        # Check if Ollama is running
-        try:
-            requests.get(f"{host}/api/tags", timeout=2)
-            logger.info("✓ Ollama is running at localhost:11434")
-        except:
-            logger.error("❌ Ollama not running! Run: ollama serve (in another terminal)")
-            raise Exception("Ollama required - must be running!")
-    
-    def classify(self, text: str) -> Dict:
-        """Classify command using local LLM"""
-        
-        prompt = f"""You are a command classifier for a voice assistant.
+REQUIRED_KEYS = ("category", "confidence", "action")
 
-Analyze this command and return ONLY a JSON response.
+# ✅ Static prompt prefix - identical every call and placed before the command, so Ollama
+# only has to evaluate the command tokens (KV cache / context reuse)
+PROMPT_PREFIX = """You are a command classifier for a voice assistant.
+
+Analyze the user command at the end and return ONLY a JSON response.
 
 CATEGORIES:
 - APP_LAUNCH: Opening applications (open chrome, launch spotify, start notepad)
@@ -40,59 +29,308 @@ CATEGORIES:
 - IN_APP_ACTION: Actions inside apps (play music, pause, send message, click button, next song, close)
 - WEB_ACTION: Search and navigation (search for python, go to youtube, look up weather)
 
-USER COMMAND: "{text}"
-
 Return ONLY valid JSON (no explanation):
-{{"category": "CATEGORY", "confidence": 0.95, "action": "action_name"}}
+{"category": "CATEGORY", "confidence": 0.95, "action": "action_name"}
 
 Examples:
-1. "play music" → {{"category": "IN_APP_ACTION", "confidence": 0.95, "action": "play"}}
-2. "set volume to 50" → {{"category": "SYSTEM_ACTION", "confidence": 0.95, "action": "set_volume"}}
-3. "search for python" → {{"category": "WEB_ACTION", "confidence": 0.9, "action": "search"}}
-4. "open chrome" → {{"category": "APP_LAUNCH", "confidence": 0.95, "action": "launch"}}
-5. "pause" → {{"category": "IN_APP_ACTION", "confidence": 0.95, "action": "pause"}}
-6. "next track" → {{"category": "IN_APP_ACTION", "confidence": 0.9, "action": "next"}}
-7. "send whatsapp message" → {{"category": "IN_APP_ACTION", "confidence": 0.9, "action": "send"}}
-8. "close window" → {{"category": "IN_APP_ACTION", "confidence": 0.95, "action": "close"}}
+1. "play music" → {"category": "IN_APP_ACTION", "confidence": 0.95, "action": "play"}
+2. "set volume to 50" → {"category": "SYSTEM_ACTION", "confidence": 0.95, "action": "set_volume"}
+3. "search for python" → {"category": "WEB_ACTION", "confidence": 0.9, "action": "search"}
+4. "open chrome" → {"category": "APP_LAUNCH", "confidence": 0.95, "action": "launch"}
+5. "pause" → {"category": "IN_APP_ACTION", "confidence": 0.95, "action": "pause"}
+6. "next track" → {"category": "IN_APP_ACTION", "confidence": 0.9, "action": "next"}
+7. "send whatsapp message" → {"category": "IN_APP_ACTION", "confidence": 0.9, "action": "send"}
+8. "close window" → {"category": "IN_APP_ACTION", "confidence": 0.95, "action": "close"}
 """
+PROMPT_COMMAND = '\nUSER COMMAND: "{text}"\n'
+
+
+def build_prompt(text):
+    """Full classification prompt for one command"""
+    return PROMPT_PREFIX + PROMPT_COMMAND.format(text=text)
+
+
+class IncrementalJSONParser:
+    """Finds the first complete JSON object with the required keys in text fed piece by piece"""
+    
+    def __init__(self, required=REQUIRED_KEYS):
+        self.required = required
+        self.text = ""
+        self.pos = 0  # Next character to scan
+        self.start = None  # Index of the '{' opening the current candidate
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.result = None
+    
+    def feed(self, piece):
+        """Add streamed text; returns the parsed object once complete, else None"""
+        if self.result is not None:
+            return self.result
+        self.text += piece
+        text = self.text
+        i = self.pos
+        while i < len(text):
+            char = text[i]
+            if self.start is None:
+                if char == '{':
+                    self.start, self.depth = i, 1
+            elif self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif char == '\\':
+                    self.escape = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char == '{':
+                self.depth += 1
+            elif char == '}':
+                self.depth -= 1
+                if self.depth == 0:
+                    try:
+                        candidate = json.loads(text[self.start:i + 1])
+                    except json.JSONDecodeError:
+                        candidate = None
+                    if isinstance(candidate, dict) and all(key in candidate for key in self.required):
+                        self.result = candidate
+                        self.pos = i + 1
+                        return candidate
+                    # Not a classification - look for one nested in (or after) this candidate
+                    i = self.start
+                    self.start = None
+            i += 1
+        self.pos = i
+        return None
+
+
+class SemanticClassifier:
+    """Classify commands using local LLM"""
+    
+    def __init__(self, model=config.OLLAMA_MODEL, host=config.OLLAMA_HOST,
+                 connect_timeout=config.OLLAMA_CONNECT_TIMEOUT,
+                 read_timeout=config.OLLAMA_READ_TIMEOUT,
+                 keep_alive=config.OLLAMA_KEEP_ALIVE,
+                 streaming=config.OLLAMA_STREAMING,
+                 prompt_cache=config.OLLAMA_PROMPT_CACHE):
+        """
+        Initialize with local Ollama
+        
+        Args:
+            model: Ollama model name
+            host: Ollama base URL
+            connect_timeout: Seconds to establish a connection
+            read_timeout: Seconds to wait for a classification
+            keep_alive: How long Ollama keeps the model loaded after each request
+            streaming: Stream tokens and stop generation once the JSON is complete
+            prompt_cache: "prefix" (full prompt, Ollama reuses the cached prefix) or
+                          "context" (prefix evaluated once, its context tokens sent per call)
+        """
+        self.model = model
+        self.host = host
+        self.api_endpoint = f"{host}/api/generate"
+        self.timeout = (connect_timeout, read_timeout)
+        self.keep_alive = keep_alive
+        self.streaming = streaming
+        self.prompt_cache = prompt_cache
+        self.prefix_context = None  # Context tokens of PROMPT_PREFIX ("context" mode)
+        self.stream_stats = {'requests': 0, 'early_stops': 0, 'tokens_received': 0, 'json_seconds': 0.0}
+        self.stats_lock = threading.Lock()
+        
+        # ✅ One pooled session - connections are reused instead of opened per command
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=config.OLLAMA_POOL_SIZE)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        logger.info(f"✓ Semantic Classifier initialized (Model: {model})")
         
+        # Check if Ollama is running
         try:
-            # Call local Ollama
-            response = requests.post(
+            self.session.get(f"{host}/api/tags", timeout=(connect_timeout, 2))
+            logger.info(f"✓ Ollama is running at {host}")
+        except requests.exceptions.RequestException:
+            logger.error("❌ Ollama not running! Run: ollama serve (in another terminal)")
+            raise Exception("Ollama required - must be running!")
+        
+        if config.OLLAMA_PRELOAD:
+            self.preload()
+        if self.prompt_cache == "context":
+            self.prime_context()
+    
+    def preload(self):
+        """Load the model into Ollama now so the first command doesn't pay for it"""
+        start = time.perf_counter()
+        try:
+            # A request without a prompt only loads the model (and sets its keep-alive)
+            response = self.session.post(
+                self.api_endpoint,
+                json={"model": self.model, "keep_alive": self.keep_alive},
+                timeout=(self.timeout[0], 120)  # first load from disk can be slow
+            )
+            response.raise_for_status()
+            logger.info(f"✓ {self.model} loaded in Ollama ({time.perf_counter() - start:.1f}s, keep_alive={self.keep_alive})")
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"⚠️ Could not preload {self.model}: {e}")
+    
+    def prime_context(self):
+        """Evaluate PROMPT_PREFIX once and keep its context tokens for every later request"""
+        template_open, _ = config.OLLAMA_RAW_TEMPLATE
+        try:
+            response = self.session.post(
                 self.api_endpoint,
                 json={
                     "model": self.model,
-                    "prompt": prompt,
+                    "prompt": template_open + PROMPT_PREFIX,
+                    "raw": True,  # we apply the chat template ourselves so the prefix tokens stay reusable
                     "stream": False,
-                    "temperature": 0.2  # Low = consistent
+                    "keep_alive": self.keep_alive,
+                    "options": {"temperature": 0.2, "num_predict": 1}
                 },
-                timeout=30
+                timeout=(self.timeout[0], 120)
             )
+            response.raise_for_status()
+            result = response.json()
+            context = result.get('context') or []
+            generated = result.get('eval_count', 0)
+            # The context ends with the token generated while priming - drop it
+            self.prefix_context = context[:len(context) - generated] if generated else context
+            logger.info(f"✓ Prompt prefix primed ({len(self.prefix_context)} context tokens)")
+        except (requests.exceptions.RequestException, ValueError) as e:
+            self.prefix_context = None
+            logger.warning(f"⚠️ Could not prime prompt context, sending full prompts: {e}")
+    
+    def close(self):
+        """Release pooled connections"""
+        self.session.close()
+    
+    def classify(self, text: str) -> Dict:
+        """Classify command using local LLM"""
+        
+        try:
+            # Call local Ollama
+            with tracer.span("ollama.generate", model=self.model, stream=self.streaming):
+                if self.streaming:
+                    classification, response_text = self._generate_streaming(text)
+                else:
+                    classification, response_text = self._generate(text)
             
-            if response.status_code == 200:
-                result = response.json()
-                response_text = result.get('response', '').strip()
-                
-                # Extract JSON from response
+            # Extract JSON from response
+            if classification is None:
                 try:
                     start = response_text.find('{')
                     end = response_text.rfind('}') + 1
                     if start >= 0 and end > start:
-                        json_str = response_text[start:end]
-                        classification = json.loads(json_str)
-                        
-                        logger.info(f"🧠 '{text}' → {classification.get('category')} ({classification.get('confidence')*100:.0f}%)")
-                        return classification
+                        classification = json.loads(response_text[start:end])
                 except json.JSONDecodeError:
-                    logger.warning(f"⚠️ Invalid JSON: {response_text}")
-                    return {"category": "IN_APP_ACTION", "confidence": 0.5, "action": "unknown"}
-            else:
-                logger.error(f"Ollama error: {response.status_code}")
+                    pass
+            
+            if not isinstance(classification, dict):
+                logger.warning(f"⚠️ Invalid JSON: {response_text}")
                 return {"category": "IN_APP_ACTION", "confidence": 0.5, "action": "unknown"}
+            
+            logger.info(f"🧠 '{text}' → {classification.get('category')} ({classification.get('confidence', 0)*100:.0f}%)")
+            return classification
         
+        except requests.exceptions.HTTPError as e:
+            logger.error(f"Ollama error: {e.response.status_code}")
+            return {"category": "IN_APP_ACTION", "confidence": 0.5, "action": "unknown"}
         except requests.exceptions.Timeout:
             logger.error("❌ Ollama timeout (maybe overloaded, wait 2 sec)")
             return {"category": "IN_APP_ACTION", "confidence": 0.5, "action": "unknown"}
         except Exception as e:
             logger.error(f"❌ Classification error: {e}")
             return {"category": "IN_APP_ACTION", "confidence": 0.5, "action": "unknown"}
+    
+    def classify_batch(self, texts, max_workers=config.CLASSIFIER_BATCH_WORKERS, timings=None) -> List[Dict]:
+        """
+        Classify many commands concurrently
+        
+        Args:
+            texts: Commands to classify
+            max_workers: Concurrent requests (capped at the connection pool size)
+            timings: Optional list - per-command seconds are appended in input order
+        
+        Returns:
+            Classifications in the same order as texts
+        """
+        def timed(text):
+            start = time.perf_counter()
+            return self.classify(text), time.perf_counter() - start
+        
+        workers = max(1, min(max_workers, config.OLLAMA_POOL_SIZE, len(texts) or 1))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ClassifyBatch") as pool:
+            results = list(pool.map(timed, texts))  # map() keeps input order
+        
+        if timings is not None:
+            timings.extend(seconds for _, seconds in results)
+        return [classification for classification, _ in results]
+    
+    def _request_body(self, text, stream):
+        body = {
+            "model": self.model,
+            "prompt": build_prompt(text),
+            "stream": stream,
+            "keep_alive": self.keep_alive,  # ✅ Keep Mistral loaded between sessions
+            "options": {"temperature": 0.2}  # Low = consistent
+        }
+        if self.prefix_context is not None:
+            # ✅ Only the command is sent as text - the prefix arrives as already-evaluated context
+            body["prompt"] = PROMPT_COMMAND.format(text=text) + config.OLLAMA_RAW_TEMPLATE[1]
+            body["context"] = self.prefix_context
+            body["raw"] = True
+        return body
+    
+    def _generate(self, text):
+        """Wait for the whole generation; returns (None, response_text)"""
+        response = self.session.post(self.api_endpoint, json=self._request_body(text, False), timeout=self.timeout)
+        response.raise_for_status()
+        return None, response.json().get('response', '').strip()
+    
+    def _generate_streaming(self, text):
+        """
+        Stream tokens and stop as soon as a complete classification object has arrived
+        
+        Returns:
+            (classification or None, text received so far)
+        """
+        parser = IncrementalJSONParser(REQUIRED_KEYS)
+        pieces = []
+        start = time.perf_counter()
+        
+        response = self.session.post(
+            self.api_endpoint,
+            json=self._request_body(text, True),
+            timeout=self.timeout,
+            stream=True
+        )
+        try:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if chunk.get('done'):
+                    break
+                pieces.append(chunk.get('response', ''))
+                if parser.feed(pieces[-1]) is not None:
+                    break
+        finally:
+            # ✅ Closing mid-stream drops the connection, which makes Ollama stop generating
+            response.close()
+        
+        with self.stats_lock:
+            self.stream_stats['requests'] += 1
+            self.stream_stats['tokens_received'] += len(pieces)
+            if parser.result is not None:
+                self.stream_stats['early_stops'] += 1
+                self.stream_stats['json_seconds'] += time.perf_counter() - start
+        
+        return parser.result, "".join(pieces).strip()
+    
+    def get_stream_stats(self):
+        """Streaming counters: requests, early_stops, tokens_received, mean time to JSON"""
+        with self.stats_lock:
+            stats = dict(self.stream_stats)
+        stats['mean_json_seconds'] = stats['json_seconds'] / stats['early_stops'] if stats['early_stops'] else 0.0
+        return stats
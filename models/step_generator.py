@@ -4,29 +4,128 @@ Generates execution steps based on command category
 """
 import logging
 import pickle
+import re
 from pathlib import Path
 import config
+from models.artifact_store import ArtifactStore
 
 logger = logging.getLogger("StepGenerator")
 
+SLOTS = ('app_name', 'action', 'target', 'query')
+_PLACEHOLDER = re.compile(r'\{(' + '|'.join(SLOTS) + r')\}')
+_WEB_PREFIX = re.compile(r'^(?:please\s+)?(?:search\s+(?:for\s+)?|look\s+up\s+|google\s+|find\s+|'
+                         r'go\s+to\s+|open\s+|navigate\s+to\s+|browse\s+to\s+|visit\s+)', re.IGNORECASE)
+
+
+def _fill(text, slots, values):
+    """Replace placeholders; a string that is exactly one placeholder becomes the value"""
+    if len(slots) == 1 and text == '{' + slots[0] + '}':
+        return values.get(slots[0], '')
+    for slot in slots:
+        text = text.replace('{' + slot + '}', values.get(slot, ''))
+    return text
+
+
+def _compile_step(step):
+    """
+    (base, nested, patches): instantiating is base.copy(), a copy of each nested dict
+    (e.g. 'parameters') and only the precomputed placeholder fields rewritten.
+    Both step schemas are flat apart from one level of 'parameters'
+    """
+    base = {}
+    nested = []
+    patches = []  # (outer key, inner key or None, template text, slots)
+    for key, value in step.items():
+        if isinstance(value, dict):
+            nested.append(key)
+            base[key] = dict(value)
+            for inner, item in value.items():
+                if isinstance(item, str):
+                    slots = tuple(dict.fromkeys(_PLACEHOLDER.findall(item)))
+                    if slots:
+                        patches.append((key, inner, item, slots))
+        else:
+            base[key] = value
+            if isinstance(value, str):
+                slots = tuple(dict.fromkeys(_PLACEHOLDER.findall(value)))
+                if slots:
+                    patches.append((key, None, value, slots))
+    return base, tuple(nested), tuple(patches)
+
+
+def slot_values(command_data):
+    """Placeholder values for a command: entities first, then what the raw command implies"""
+    entities = command_data.get('entities', {})
+    classification = command_data.get('classification', {})
+    raw = command_data.get('raw_command') or classification.get('raw_command', '')
+    query = entities.get('query') or _WEB_PREFIX.sub('', raw.strip()).rstrip('.?!')
+    return {
+        'app_name': entities.get('app_name', ''),
+        'action': entities.get('action') or classification.get('action', ''),
+        'target': entities.get('target') or query,
+        'query': query
+    }
+
+
+class StepTemplate:
+    """Immutable compiled plan for one category - instantiate() returns fresh step dicts"""
+    
+    __slots__ = ('category', '_steps', 'slots')
+    
+    def __init__(self, category, steps):
+        self.category = category
+        self._steps = tuple(_compile_step(step) for step in steps)
+        self.slots = frozenset(slot for _, _, patches in self._steps for *_, slots in patches for slot in slots)
+    
+    def __len__(self):
+        return len(self._steps)
+    
+    def instantiate(self, values):
+        """
+        Args:
+            values: {slot: text} for SLOTS (missing slots become '')
+        
+        Returns:
+            New list of new step dicts
+        """
+        plan = []
+        for base, nested, patches in self._steps:
+            step = base.copy()
+            for key in nested:
+                step[key] = step[key].copy()
+            for key, inner, text, slots in patches:
+                if inner is None:
+                    step[key] = _fill(text, slots, values)
+                else:
+                    step[key][inner] = _fill(text, slots, values)
+            plan.append(step)
+        return plan
+
+
 class StepGenerator:
     """Generates step-by-step execution plans"""
     
     def __init__(self):
         """Initialize step generator"""
         self.logger = logging.getLogger("StepGenerator")
-        self.model_path = Path(config.MODEL_WEIGHTS_DIR) / 'step_model.pkl'
+        self.store = ArtifactStore()
+        self.model_path = Path(config.MODEL_WEIGHTS_DIR) / 'step_model.pkl'  # legacy pickle
         
-        if self.model_path.exists():
+        if self.store.exists('step_rules') or self.model_path.exists():
             self.load_model()
         else:
             self.create_default_rules()
+        self.compile_templates()
         
         self.logger.info("✓ Step Generator initialized")
     
     def load_model(self):
-        """Load pre-trained rules"""
+        """Load pre-trained rules (artifact store first, then the legacy pickle)"""
         try:
+            if self.store.exists('step_rules'):
+                self.rules = self.store.load('step_rules')
+                self.logger.info("✓ Step rules loaded from artifact store")
+                return
             with open(self.model_path, 'rb') as f:
                 self.rules = pickle.load(f)
             self.logger.info("✓ Step rules loaded from pickle")
@@ -42,6 +141,8 @@ class StepGenerator:
                 {"action": "press_key", "key": "win", "description": "Press Windows key"},
                 {"action": "wait", "duration": 0.5, "description": "Wait for start menu"},
                 {"action": "type", "text": "{app_name}", "description": "Type app name"},
+                # Nothing observable marks the search results as ready, so this one always sleeps
+                {"action": "wait", "duration": 0.5, "until": "sleep", "description": "Wait for search results"},
                 {"action": "press_key", "key": "enter", "description": "Press Enter to launch"},
             ],
             
@@ -68,6 +169,10 @@ class StepGenerator:
         }
         self.logger.info("✓ Created default step rules")
     
+    def compile_templates(self):
+        """Compile self.rules into immutable StepTemplates (call again after changing rules)"""
+        self.templates = {category: StepTemplate(category, steps) for category, steps in self.rules.items()}
+    
     def generate(self, command_data):
         """Generate steps for a command (METHOD THAT WAS MISSING!)"""
         category = command_data['classification']['category']
@@ -77,17 +182,12 @@ class StepGenerator:
             self.logger.info("📍 SYSTEM_ACTION detected - bypassing Model 2, using direct Windows API")
             return []  # ✅ NO STEPS - handled by action_router directly
         
-        # Get steps for category
-        steps = self.rules.get(category, [])
-        
-        # ✅ Replace placeholders with actual entity values
-        entities = command_data['entities']
-        app_name = entities.get('app_name', '')
+        template = self.templates.get(category)
+        if template is None:
+            return []
         
-        # Replace {app_name} in steps
-        for step in steps:
-            if 'text' in step and '{app_name}' in step['text']:
-                step['text'] = app_name
+        # ✅ Fresh step dicts every call - the compiled template is never modified
+        steps = template.instantiate(slot_values(command_data))
         
         self.logger.info(f"✓ Generated {len(steps)} steps for {category}")
         return steps
@@ -0,0 +1,299 @@
+"""
+Tiered Classifier - local fast path in front of the Ollama LLM
+Tier 1: keyword rules (CommandClassifier) + TF-IDF/MultinomialNB (Model 1)
+Tier 2: nearest labelled/confirmed phrase (IntentMatcher) when it is similar enough
+Tier 3: SemanticClassifier (Mistral via Ollama) - only when neither local tier is confident
+"""
+import logging
+import pickle
+import re
+import threading
+import time
+from pathlib import Path
+import config
+from models.artifact_store import ArtifactStore, ArtifactError
+from models.command_classifier import CommandClassifier
+from utils.tracing import tracer
+
+logger = logging.getLogger("TieredClassifier")
+
+# Ordered so the most specific verb wins ("send message" → send, not message)
+IN_APP_VERBS = [
+    'close', 'minimize', 'maximize', 'click', 'type', 'send', 'play', 'pause', 'stop',
+    'next', 'previous', 'skip', 'shuffle', 'repeat', 'scroll', 'search', 'find',
+    'select', 'copy', 'paste', 'save', 'undo', 'redo', 'refresh', 'reload', 'open'
+]
+SYSTEM_ACTIONS = {'volume': 'set_volume', 'brightness': 'set_brightness'}
+
+
+def detect_system_rule(text_lower, hits=None):
+    """
+    System keyword rule for a command, or None - CommandClassifier's system patterns, plus the
+    legacy volume/brightness commands ("mute", "unmute") when they appear as whole words
+    """
+    if hits is None:
+        hits = CommandClassifier.scan(text_lower)
+    rule = CommandClassifier._detect_system_command(text_lower, hits)
+    if rule:
+        return rule
+    for hit in hits:
+        if hit.family != 'legacy' or hit.label not in SYSTEM_ACTIONS:
+            continue
+        before = text_lower[hit.start - 1] if hit.start > 0 else ' '
+        after = text_lower[hit.end] if hit.end < len(text_lower) else ' '
+        if not before.isalnum() and not after.isalnum():  # "mute", not "commute"
+            return {'category': 'SYSTEM_ACTION', 'subcategory': hit.label, 'confidence': 0.95,
+                    'requires_screen_analysis': False, 'raw_command': text_lower}
+    return None
+
+
+def load_local_model(store=None):
+    """
+    Model 1 pipeline from the artifact store, a legacy command_classifier.pkl, or trained
+    in-process from the bundled data if neither exists (not persisted - only the trainer saves)
+    """
+    store = store or ArtifactStore()
+    if store.exists('command_classifier'):
+        try:
+            return store.load('command_classifier')
+        except ArtifactError as e:
+            logger.warning(f"⚠️ {e} - rebuilding Model 1")
+    
+    legacy_path = Path(store.root) / 'command_classifier.pkl'
+    if legacy_path.exists():
+        with open(legacy_path, 'rb') as f:
+            return pickle.load(f)
+    
+    from train_models_complete import MODEL1_TRAINING_DATA, create_model1_pipeline
+    logger.warning("⚠️ command_classifier artifact not found - training Model 1 in-process (run train_models_complete.py to persist it)")
+    pipeline = create_model1_pipeline()
+    pipeline.fit([text for text, _ in MODEL1_TRAINING_DATA], [label for _, label in MODEL1_TRAINING_DATA])
+    return pipeline
+
+
+def infer_action(category, text_lower, subcategory=None):
+    """Action name in the same vocabulary the LLM prompt uses"""
+    if category == 'APP_LAUNCH':
+        return 'launch'
+    if category == 'SYSTEM_ACTION':
+        if subcategory is None:
+            rule = detect_system_rule(text_lower)
+            subcategory = rule['subcategory'] if rule else None
+        return SYSTEM_ACTIONS.get(subcategory, subcategory or 'system')
+    if category == 'WEB_ACTION':
+        return 'search' if re.search(r'\b(search|look up|google|find)\b', text_lower) else 'navigate'
+    
+    words = re.findall(r'[a-z]+', text_lower)
+    for verb in IN_APP_VERBS:
+        if verb in words:
+            return verb
+    return words[0] if words else 'unknown'
+
+
+class TieredClassifier:
+    """Answers locally when confident, falls back to the LLM otherwise"""
+    
+    TIERS = ('local', 'nearest', 'llm')
+    
+    def __init__(self, llm, pipeline=None, threshold=config.LOCAL_CLASSIFIER_THRESHOLD,
+                 rule_min_probability=config.LOCAL_RULE_MIN_PROBABILITY, matcher=None,
+                 match_threshold=config.INTENT_MATCH_THRESHOLD):
+        """
+        Args:
+            llm: Object with classify(text) -> {category, confidence, action} (SemanticClassifier)
+            pipeline: Fitted sklearn pipeline with predict_proba (defaults to Model 1 from disk)
+            threshold: Minimum local confidence to skip the LLM
+            rule_min_probability: Model probability below which a keyword rule is overruled
+            matcher: IntentMatcher for the nearest-phrase tier (defaults to one seeded from the
+                     training data when INTENT_MATCHER_ENABLED)
+            match_threshold: Minimum similarity to accept a nearest-phrase match
+        """
+        self.llm = llm
+        self.pipeline = pipeline if pipeline is not None else load_local_model()
+        self.threshold = threshold
+        self.rule_min_probability = rule_min_probability
+        if matcher is None and config.INTENT_MATCHER_ENABLED:
+            from models.intent_matcher import IntentMatcher
+            matcher = IntentMatcher.from_training_data()
+        self.matcher = matcher
+        self.match_threshold = match_threshold
+        
+        self.stats_lock = threading.Lock()
+        self.stats = {tier: {'hits': 0, 'seconds': 0.0, 'max_seconds': 0.0} for tier in self.TIERS}
+        self.stats['local']['keyword_hits'] = 0
+        self.stats['llm']['local_seconds'] = 0.0  # time spent in the local tiers before falling back
+        logger.info(f"✓ Tiered classifier initialized (local threshold {threshold:.2f})")
+    
+    def classify_local(self, text):
+        """
+        Local tier only
+        
+        Returns:
+            (classification dict, confident: bool) - classification includes 'source'
+        """
+        text_lower = text.lower().strip()
+        pipeline = self.pipeline  # ✅ One snapshot per call - OnlineLearner may swap in an updated model
+        return self._decide(text, text_lower, pipeline.predict_proba([text_lower])[0], pipeline.classes_)
+    
+    def _decide(self, text, text_lower, probabilities, classes):
+        """Combine Model 1 probabilities with the keyword rules"""
+        best = probabilities.argmax()
+        category = str(classes[best])
+        confidence = float(probabilities[best])
+        
+        # Model 1 gives SYSTEM_ACTION only a few percent on any command ("volume 30", "mute"), so
+        # a system keyword rule wins outright. Its prior is also dominated by IN_APP_ACTION, so
+        # "open chrome" can lose on argmax; but "open"/"start" also match in-app commands
+        # ("open new tab"), so a launch rule decides unless the model all but rules it out.
+        hits = CommandClassifier.scan(text_lower)
+        system_rule = detect_system_rule(text_lower, hits)
+        rule = system_rule or CommandClassifier._detect_app_launch(text_lower, text, hits)
+        subcategory = None
+        source = 'model'
+        if rule and (rule is system_rule
+                     or self._probability(probabilities, classes, rule['category']) >= self.rule_min_probability):
+            category = rule['category']
+            confidence = max(confidence, rule['confidence']) if str(classes[best]) == category else rule['confidence']
+            subcategory = rule.get('subcategory')
+            source = 'keyword'
+        
+        classification = {
+            'category': category,
+            'confidence': confidence,
+            'action': infer_action(category, text_lower, subcategory),
+            'source': source
+        }
+        # A rule the model overruled is a disagreement - let the next tier decide
+        overruled = rule is not None and source == 'model'
+        return classification, confidence >= self.threshold and not overruled
+    
+    def classify_nearest(self, text):
+        """Nearest-phrase tier; classification dict or None when no phrase is similar enough"""
+        if not self.matcher:
+            return None
+        match = self.matcher.match(text)
+        if not match or match['similarity'] < self.match_threshold:
+            return None
+        return {
+            'category': match['category'],
+            'confidence': match['similarity'],
+            'action': match['action'],
+            'source': 'nearest'
+        }
+    
+    @staticmethod
+    def _probability(probabilities, classes, category):
+        classes = list(classes)
+        return float(probabilities[classes.index(category)]) if category in classes else 0.0
+    
+    def classify(self, text):
+        """Same contract as SemanticClassifier.classify, plus a 'tier' key"""
+        start = time.perf_counter()
+        with tracer.span("classify.local"):
+            classification, confident = self.classify_local(text)
+        local_seconds = time.perf_counter() - start
+        
+        if confident:
+            self._record('local', local_seconds, keyword=classification['source'] == 'keyword')
+            logger.info(f"⚡ '{text}' → {classification['category']} ({classification['confidence']*100:.0f}%, local/{classification['source']})")
+            classification['tier'] = 'local'
+            return classification
+        
+        with tracer.span("classify.nearest"):
+            nearest = self.classify_nearest(text)
+        if nearest:
+            self._record('nearest', time.perf_counter() - start)
+            logger.info(f"🔎 '{text}' → {nearest['category']} (similarity {nearest['confidence']:.2f})")
+            nearest['tier'] = 'nearest'
+            return nearest
+        local_seconds = time.perf_counter() - start
+        
+        classification = dict(self.llm.classify(text))
+        classification['tier'] = 'llm'
+        self._record('llm', time.perf_counter() - start, local_seconds=local_seconds)
+        return classification
+    
+    def classify_batch(self, texts, max_workers=config.CLASSIFIER_BATCH_WORKERS, timings=None):
+        """
+        Classify many commands: one vectorized local pass, the nearest-phrase tier, then
+        the rest go to the LLM concurrently (see SemanticClassifier.classify_batch)
+        
+        Returns:
+            Classifications in input order, each with a 'tier' key
+        """
+        if not texts:
+            return []
+        start = time.perf_counter()
+        lowered = [text.lower().strip() for text in texts]
+        pipeline = self.pipeline
+        with tracer.span("classify.local", batch=len(texts)):
+            probabilities = pipeline.predict_proba(lowered)
+            decisions = [self._decide(text, text_lower, row, pipeline.classes_)
+                         for text, text_lower, row in zip(texts, lowered, probabilities)]
+        local_seconds = (time.perf_counter() - start) / len(texts)  # amortized per command
+        
+        results = [None] * len(texts)
+        item_seconds = [local_seconds] * len(texts)
+        fallback = []
+        for i, (classification, confident) in enumerate(decisions):
+            if confident:
+                classification['tier'] = 'local'
+                results[i] = classification
+                self._record('local', local_seconds, keyword=classification['source'] == 'keyword')
+                continue
+            
+            start = time.perf_counter()
+            nearest = self.classify_nearest(texts[i])
+            item_seconds[i] += time.perf_counter() - start
+            if nearest:
+                results[i] = dict(nearest, tier='nearest')
+                self._record('nearest', item_seconds[i])
+            else:
+                fallback.append(i)
+        
+        if fallback:
+            llm_timings = []
+            answers = self.llm.classify_batch([texts[i] for i in fallback], max_workers=max_workers, timings=llm_timings)
+            for i, answer, seconds in zip(fallback, answers, llm_timings):
+                results[i] = dict(answer, tier='llm')
+                self._record('llm', item_seconds[i] + seconds, local_seconds=item_seconds[i])
+                item_seconds[i] += seconds
+        
+        if timings is not None:
+            timings.extend(item_seconds)
+        return results
+    
+    def _record(self, tier, seconds, keyword=False, local_seconds=0.0):
+        with self.stats_lock:
+            stats = self.stats[tier]
+            stats['hits'] += 1
+            stats['seconds'] += seconds
+            stats['max_seconds'] = max(stats['max_seconds'], seconds)
+            if keyword:
+                stats['keyword_hits'] += 1
+            if tier == 'llm':
+                stats['local_seconds'] += local_seconds
+    
+    def get_stats(self):
+        """Per-tier hit rate and mean/max latency"""
+        with self.stats_lock:
+            stats = {tier: dict(values) for tier, values in self.stats.items()}
+        total = sum(stats[tier]['hits'] for tier in self.TIERS)
+        for tier in self.TIERS:
+            hits = stats[tier]['hits']
+            stats[tier]['hit_rate'] = hits / total if total else 0.0
+            stats[tier]['mean_seconds'] = stats[tier]['seconds'] / hits if hits else 0.0
+        return stats
+    
+    def log_stats(self):
+        """Log per-tier hit rate and latency"""
+        stats = self.get_stats()
+        if not any(stats[tier]['hits'] for tier in self.TIERS):
+            return
+        logger.info("📊 Classifier tiers:")
+        for tier in self.TIERS:
+            entry = stats[tier]
+            logger.info(
+                f"   {tier:<5} hits={entry['hits']} ({entry['hit_rate']*100:.0f}%)  "
+                f"mean={entry['mean_seconds']*1000:.1f}ms  max={entry['max_seconds']*1000:.1f}ms"
+            )
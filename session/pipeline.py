@@ -0,0 +1,196 @@
+"""
+Pipelined command execution for an active session
+Capture of the next command overlaps inference and execution of the previous ones
+"""
+import logging
+import queue
+import threading
+import time
+import config
+from utils.tracing import tracer
+
+logger = logging.getLogger("CommandPipeline")
+
+
+class CommandPipeline:
+    """Inference workers + a single in-order executor fed by the capture loop"""
+    
+    def __init__(self, plan, execute, on_result=None, inference_workers=config.PIPELINE_INFERENCE_WORKERS):
+        """
+        Args:
+            plan: Callable (command_text, command_data) -> (command_data, steps); command_data
+                  may be None (not classified yet)
+            execute: Callable (command_text, command_data, steps) -> result dict
+            on_result: Optional callback (command_text, result, command_data) run after each execution
+            inference_workers: Concurrent classification/step-generation workers
+        """
+        self.plan = plan
+        self.execute = execute
+        self.on_result = on_result
+        self.inference_workers = max(1, inference_workers)
+        
+        self.inference_queue = queue.Queue()
+        self.ready = {}  # seq -> planned item waiting for its turn to execute
+        self.condition = threading.Condition()
+        self.threads = []
+        self.running = False
+        
+        self.generation = 0  # Bumped by cancel(); items from older generations are dropped
+        self.next_seq = 0
+        self.next_to_execute = 0
+        self.active = set()  # seqs submitted and not yet finished or dropped
+        
+        self.started_at = None
+        self.completed_at = []
+        self.counters = {'submitted': 0, 'completed': 0, 'cancelled': 0, 'failed': 0}
+        self.max_depth = {'inference': 0, 'execution': 0}
+    
+    def start(self):
+        self.running = True
+        self.started_at = time.time()
+        for i in range(self.inference_workers):
+            thread = threading.Thread(target=self._inference_loop, name=f"PipelineInference-{i}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        executor = threading.Thread(target=self._execution_loop, name="PipelineExecutor", daemon=True)
+        executor.start()
+        self.threads.append(executor)
+        logger.info(f"✓ Command pipeline started ({self.inference_workers} inference workers)")
+    
+    def submit(self, command_text, command_data=None):
+        """Queue a captured command; returns its sequence number"""
+        with self.condition:
+            seq = self.next_seq
+            self.next_seq += 1
+            self.active.add(seq)
+            self.counters['submitted'] += 1
+            item = {
+                'seq': seq,
+                'generation': self.generation,
+                'text': command_text,
+                'command_data': command_data,
+                'steps': None,
+                'error': None,
+                'trace_id': tracer.current_command()
+            }
+        self.inference_queue.put(item)
+        self._track_depth()
+        return seq
+    
+    def cancel(self):
+        """Drop every queued or in-inference command (e.g. on "goodbye jarvis")"""
+        with self.condition:
+            self.generation += 1
+            dropped = len(self.ready)
+            self.ready.clear()
+            
+            while True:
+                try:
+                    self.inference_queue.get_nowait()
+                except queue.Empty:
+                    break
+            
+            # Only a command already executing survives; its side effects can't be undone
+            executing = self.next_to_execute - 1
+            self.active = {executing} if executing in self.active else set()
+            self.counters['cancelled'] += self.next_seq - self.next_to_execute
+            self.next_to_execute = self.next_seq
+            self.condition.notify_all()
+        
+        logger.info(f"🛑 Pipeline cancelled ({dropped} planned commands dropped)")
+    
+    def idle(self):
+        with self.condition:
+            return not self.active
+    
+    def stop(self):
+        """Stop workers (the command currently executing is allowed to finish)"""
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        for _ in range(self.inference_workers):
+            self.inference_queue.put(None)
+        for thread in self.threads:
+            thread.join(timeout=5)
+        self.threads = []
+        logger.info(f"Pipeline stopped: {self.metrics()}")
+    
+    def _track_depth(self):
+        with self.condition:
+            self.max_depth['inference'] = max(self.max_depth['inference'], self.inference_queue.qsize())
+            self.max_depth['execution'] = max(self.max_depth['execution'], len(self.ready))
+    
+    def _inference_loop(self):
+        while True:
+            item = self.inference_queue.get()
+            if item is None:
+                break
+            if item['generation'] != self.generation:
+                continue
+            
+            try:
+                with tracer.bind(item['trace_id']):
+                    item['command_data'], item['steps'] = self.plan(item['text'], item['command_data'])
+            except Exception as e:
+                logger.error(f"Inference failed for '{item['text']}': {e}")
+                item['error'] = str(e)
+            
+            with self.condition:
+                if item['generation'] != self.generation:
+                    continue
+                self.ready[item['seq']] = item
+                self.condition.notify_all()
+            self._track_depth()
+    
+    def _execution_loop(self):
+        while True:
+            with self.condition:
+                # ✅ Ordering guarantee: execute strictly by submission sequence
+                while self.running and self.next_to_execute not in self.ready:
+                    self.condition.wait()
+                if self.next_to_execute not in self.ready:
+                    break
+                item = self.ready.pop(self.next_to_execute)
+                self.next_to_execute += 1
+            
+            if item['error']:
+                result = {'success': False, 'error': item['error']}
+            else:
+                try:
+                    with tracer.bind(item['trace_id']):
+                        result = self.execute(item['text'], item['command_data'], item['steps'])
+                except Exception as e:
+                    logger.error(f"Execution failed for '{item['text']}': {e}")
+                    result = {'success': False, 'error': str(e)}
+            
+            with self.condition:
+                self.active.discard(item['seq'])
+                self.completed_at.append(time.time())
+                self.counters['completed'] += 1
+                if not result.get('success'):
+                    self.counters['failed'] += 1
+            
+            if self.on_result:
+                self.on_result(item['text'], result, item['command_data'])
+    
+    def metrics(self):
+        """
+        Throughput and queue depth snapshot
+        
+        Returns:
+            dict with counters, 'commands_per_minute' (last 60 s, or since start if
+            shorter), current 'queue_depth' and 'max_queue_depth' per stage
+        """
+        now = time.time()
+        with self.condition:
+            recent = [t for t in self.completed_at if now - t <= 60]
+            window = min(60.0, now - self.started_at) if self.started_at else 0.0
+            return {
+                **self.counters,
+                'commands_per_minute': len(recent) * 60.0 / window if window > 0 else 0.0,
+                'queue_depth': {
+                    'inference': self.inference_queue.qsize(),
+                    'execution': len(self.ready)
+                },
+                'max_queue_depth': dict(self.max_depth)
+            }
@@ -49,11 +49,12 @@ class SessionManager:
         self.last_activity_time = time.time()
         logger.info(f"✓ Activity updated (reset timeout)")
     
-    def add_command(self, command_text, result):
-        """Add command to history"""
+    def add_command(self, command_text, result, classification=None):
+        """Add command to history (with its classification, so confirmed commands can be learned)"""
         self.commands_history.append({
             'command': command_text,
             'result': result,
+            'classification': classification,
             'timestamp': time.time()
         })
         self.update_activity()  # ✅ Reset timeout on new command
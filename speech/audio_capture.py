@@ -0,0 +1,254 @@
+"""
+Shared audio capture service
+One persistent input stream + ring buffer that wake word and command capture subscribe to
+"""
+import logging
+import threading
+import time
+import wave
+from collections import deque
+import config
+
+logger = logging.getLogger("AudioCapture")
+
+
+class CaptureEnded(Exception):
+    """The shared capture stopped (source ended or stop() called) - no more audio will arrive"""
+
+
+class PyAudioSource:
+    """Microphone source backed by a single long-lived PyAudio stream"""
+    
+    def __init__(self):
+        self.pa = None
+        self.stream = None
+        self.chunk_size = None
+    
+    def open(self, sample_rate, chunk_size):
+        import pyaudio
+        self.chunk_size = chunk_size
+        self.pa = pyaudio.PyAudio()
+        self.stream = self.pa.open(
+            rate=sample_rate,
+            channels=1,
+            format=pyaudio.paInt16,
+            input=True,
+            frames_per_buffer=chunk_size
+        )
+    
+    def read(self):
+        return self.stream.read(self.chunk_size, exception_on_overflow=False)
+    
+    def close(self):
+        if self.stream:
+            self.stream.stop_stream()
+            self.stream.close()
+            self.stream = None
+        if self.pa:
+            self.pa.terminate()
+            self.pa = None
+
+
+class WavFileSource:
+    """Replays a 16-bit mono WAV file like a microphone (tests, benchmarks, Linux without audio)"""
+    
+    def __init__(self, path, realtime=True, trailing_silence=2.0):
+        """
+        Args:
+            path: WAV file at the capture sample rate
+            realtime: Pace reads at the audio rate instead of as fast as possible
+            trailing_silence: Seconds of zeros appended so VAD can see end of speech
+        """
+        self.path = path
+        self.realtime = realtime
+        self.trailing_silence = trailing_silence
+        self.pcm = b''
+        self.offset = 0
+        self.chunk_bytes = 0
+        self.chunk_seconds = 0.0
+        self.next_time = 0.0
+    
+    def open(self, sample_rate, chunk_size):
+        with wave.open(self.path, 'rb') as wf:
+            if wf.getframerate() != sample_rate or wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+                raise ValueError(f"{self.path}: expected {sample_rate} Hz mono 16-bit PCM")
+            self.pcm = wf.readframes(wf.getnframes())
+        
+        self.pcm += b'\x00\x00' * int(self.trailing_silence * sample_rate)
+        self.offset = 0
+        self.chunk_bytes = chunk_size * 2
+        self.chunk_seconds = chunk_size / sample_rate
+        self.next_time = time.perf_counter()
+    
+    def read(self):
+        if self.realtime:
+            delay = self.next_time - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            self.next_time += self.chunk_seconds
+        
+        chunk = self.pcm[self.offset:self.offset + self.chunk_bytes]
+        self.offset += self.chunk_bytes
+        return chunk
+    
+    def close(self):
+        self.pcm = b''
+
+
+class GeneratorSource:
+    """Source fed from any iterable of PCM chunks (bytes)"""
+    
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.iterator = None
+    
+    def open(self, sample_rate, chunk_size):
+        self.iterator = iter(self.chunks)
+    
+    def read(self):
+        return next(self.iterator, b'')
+    
+    def close(self):
+        self.iterator = None
+
+
+class AudioSubscription:
+    """Independent read cursor into the capture ring buffer"""
+    
+    def __init__(self, service, cursor):
+        self.service = service
+        self.cursor = cursor
+        self.closed = False
+    
+    def read(self, timeout=None):
+        """
+        Next chunk for this subscriber (blocks until available)
+        
+        Returns b'' when the source has ended, the subscription is closed,
+        or the timeout expires.
+        """
+        return self.service._read(self, timeout)
+    
+    def seek_live(self):
+        """Skip everything buffered and continue from the newest audio"""
+        self.cursor = self.service.position
+    
+    def close(self):
+        self.closed = True
+        self.service._unsubscribe(self)
+
+
+class AudioCaptureService:
+    """Single persistent input stream with a ring buffer shared by all consumers"""
+    
+    def __init__(self, source=None,
+                 sample_rate=config.SAMPLE_RATE,
+                 chunk_size=config.AUDIO_FRAME_SIZE,
+                 buffer_seconds=config.AUDIO_BUFFER_SECONDS):
+        """
+        Args:
+            source: Audio source (PyAudioSource, WavFileSource, GeneratorSource) - defaults to microphone
+            sample_rate: Capture sample rate (Hz)
+            chunk_size: Samples per chunk pushed into the ring buffer
+            buffer_seconds: How much history the ring buffer keeps
+        """
+        self.source = source or PyAudioSource()
+        self.sample_rate = sample_rate
+        self.chunk_size = chunk_size
+        
+        max_chunks = max(1, int(buffer_seconds * sample_rate / chunk_size))
+        self.ring = deque(maxlen=max_chunks)
+        self.position = 0  # Absolute index of the next chunk to be captured
+        self.ended = False
+        
+        self.subscribers = []
+        self.condition = threading.Condition()
+        self.running = False
+        self.thread = None
+    
+    def start(self):
+        """Open the source once and start the background reader"""
+        if self.running:
+            return
+        self.source.open(self.sample_rate, self.chunk_size)
+        self.running = True
+        self.ended = False
+        self.thread = threading.Thread(target=self._capture_loop, name="AudioCapture", daemon=True)
+        self.thread.start()
+        logger.info(f"✓ Audio capture started ({self.sample_rate} Hz, {self.chunk_size} samples/chunk)")
+    
+    def stop(self):
+        """Stop the reader and release the source"""
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=2)
+            self.thread = None
+        self.source.close()
+        with self.condition:
+            self.ended = True
+            self.condition.notify_all()
+        logger.info("Audio capture stopped")
+    
+    def subscribe(self, start_index=None):
+        """
+        Create a subscriber cursor
+        
+        Args:
+            start_index: Absolute chunk index to start from (e.g. the wake word
+                         frame); None = live. Clamped to the oldest buffered chunk.
+        """
+        with self.condition:
+            oldest = self.position - len(self.ring)
+            cursor = self.position if start_index is None else max(oldest, min(start_index, self.position))
+            subscription = AudioSubscription(self, cursor)
+            self.subscribers.append(subscription)
+        return subscription
+    
+    def _unsubscribe(self, subscription):
+        with self.condition:
+            if subscription in self.subscribers:
+                self.subscribers.remove(subscription)
+            self.condition.notify_all()
+    
+    def _capture_loop(self):
+        while self.running:
+            try:
+                chunk = self.source.read()
+            except Exception as e:
+                logger.error(f"Capture error: {e}")
+                chunk = b''
+            
+            with self.condition:
+                if not chunk:
+                    self.ended = True
+                    self.running = False
+                    self.condition.notify_all()
+                    break
+                self.ring.append(chunk)
+                self.position += 1
+                self.condition.notify_all()
+    
+    def _read(self, subscription, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        
+        with self.condition:
+            while not subscription.closed:
+                oldest = self.position - len(self.ring)
+                if subscription.cursor < oldest:
+                    logger.warning(f"Subscriber overrun - skipped {oldest - subscription.cursor} chunks")
+                    subscription.cursor = oldest
+                
+                if subscription.cursor < self.position:
+                    chunk = self.ring[subscription.cursor - oldest]
+                    subscription.cursor += 1
+                    return chunk
+                
+                if self.ended:
+                    return b''
+                
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return b''
+                self.condition.wait(remaining)
+        
+        return b''
@@ -2,37 +2,197 @@
 Speech-to-text using Faster Whisper
 Simple, robust recording without over-engineering
 """
-from faster_whisper import WhisperModel
+from datetime import datetime
+import logging
+import threading
+import time
+import numpy as np
 import pyaudio
 import wave
-import tempfile
 import os
 import config
+from speech.vad import VoiceActivityDetector
 from utils.logger import setup_logger
+from utils.tracing import tracer
+
+logger = logging.getLogger("SpeechToText")
+
+
+def normalize_transcript(text):
+    """Lowercase words with surrounding punctuation stripped"""
+    return " ".join(word.strip('.,!?') for word in text.lower().split())
+
+
+def stable_prefix(previous, current):
+    """Longest run of leading words two consecutive hypotheses agree on"""
+    stable = []
+    for old_word, new_word in zip(normalize_transcript(previous).split(), normalize_transcript(current).split()):
+        if old_word != new_word:
+            break
+        stable.append(new_word)
+    return " ".join(stable)
+
+
+class StreamingTranscriber:
+    """Transcribes a growing audio window on a background thread and emits partial hypotheses"""
+    
+    def __init__(self, decode, on_partial=None,
+                 interval=config.STT_PARTIAL_INTERVAL,
+                 max_duration=config.VAD_MAX_DURATION):
+        """
+        Args:
+            decode: Callable (audio, final) -> text
+            on_partial: Callback invoked with each new partial hypothesis
+            interval: Seconds between partial decodes
+            max_duration: Initial buffer size in seconds (grown if exceeded)
+        """
+        self.decode = decode
+        self.on_partial = on_partial
+        self.interval = interval
+        
+        self.buffer = np.empty(int(max_duration * config.SAMPLE_RATE), dtype=np.float32)
+        self.length = 0
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="StreamingTranscriber", daemon=True)
+        
+        self.partials = []
+        self.first_audio_time = None
+        self.first_partial_time = None
+        self.final_time = None
+    
+    def start(self):
+        self.thread.start()
+    
+    def feed(self, chunk):
+        """Append one int16 PCM chunk (converted once to float32)"""
+        pcm = np.frombuffer(chunk, dtype=np.int16)
+        with self.lock:
+            if self.first_audio_time is None:
+                self.first_audio_time = time.perf_counter()
+            end = self.length + pcm.size
+            if end > self.buffer.size:
+                grown = np.empty(max(end, self.buffer.size * 2), dtype=np.float32)
+                grown[:self.length] = self.buffer[:self.length]
+                self.buffer = grown
+            np.multiply(pcm, 1.0 / 32768.0, out=self.buffer[self.length:end], casting='unsafe')
+            self.length = end
+    
+    def _window(self):
+        # Samples before self.length are never rewritten, so the view is safe to decode
+        with self.lock:
+            return self.buffer[:self.length]
+    
+    def _run(self):
+        decoded = 0
+        min_new = int(0.2 * config.SAMPLE_RATE)
+        
+        while not self.done.wait(self.interval):
+            audio = self._window()
+            if audio.size - decoded < min_new:
+                continue
+            
+            try:
+                text = self.decode(audio, final=False)
+            except Exception as e:
+                logger.error(f"Partial transcription error: {e}")
+                continue
+            decoded = audio.size
+            
+            if not text or self.done.is_set():
+                continue
+            if self.partials and self.partials[-1][1] == text:
+                continue
+            
+            now = time.perf_counter()
+            if self.first_partial_time is None:
+                self.first_partial_time = now
+            self.partials.append((now, text))
+            
+            if self.on_partial:
+                self.on_partial(text)
+    
+    def stop(self):
+        """Stop partial decoding and wait for the thread (safe to call more than once)"""
+        self.done.set()
+        if self.thread.is_alive():
+            self.thread.join()
+    
+    def finish(self):
+        """End of speech: stop partial decoding and decode the full window once"""
+        self.stop()
+        text = self.decode(self._window(), final=True)
+        self.final_time = time.perf_counter()
+        return text
+    
+    def stats(self, speech_end_time=None):
+        """Latency summary for this utterance"""
+        first_partial = None
+        if self.first_partial_time is not None and self.first_audio_time is not None:
+            first_partial = self.first_partial_time - self.first_audio_time
+        
+        to_final = None
+        if self.final_time is not None and speech_end_time is not None:
+            to_final = self.final_time - speech_end_time
+        
+        return {
+            'time_to_first_partial': first_partial,
+            'time_to_final': to_final,
+            'partials': [text for _, text in self.partials]
+        }
+
 
 class SpeechToText:
     """Convert speech to text using Faster Whisper"""
     
-    def __init__(self):
+    def __init__(self, capture=None):
+        """
+        Args:
+            capture: Optional shared AudioCaptureService - commands are read from its
+                     ring buffer instead of opening a new PyAudio stream per command
+        """
         self.logger = setup_logger('SpeechToText')
+        self.capture = capture
+        
+        # ✅ Model tiers: "fast" answers short commands, "accurate" is the low-confidence fallback
+        if config.WHISPER_TIERED:
+            self.tiers = dict(config.WHISPER_TIERS)
+        else:
+            self.tiers = {"accurate": {"model_size": config.WHISPER_MODEL_SIZE, "beam_size": 5, "best_of": 5}}
+        self.primary_tier = "fast" if "fast" in self.tiers else "accurate"
+        
+        self.models = {}
+        self.model_lock = threading.Lock()
+        self.stats_lock = threading.Lock()  # decodes run on the caller's and the partial thread
+        self.tier_stats = {
+            name: {'calls': 0, 'fallbacks': 0, 'decode_seconds': 0.0, 'audio_seconds': 0.0}
+            for name in self.tiers
+        }
+        
+        # Load the primary tier now; the accurate tier loads in the background (or on first fallback)
+        self._get_model(self.primary_tier)
+        if self.primary_tier != "accurate" and config.WHISPER_PRELOAD_ACCURATE:
+            threading.Thread(target=self._preload, args=("accurate",), name="WhisperPreload", daemon=True).start()
         
-        # Initialize Faster Whisper model
-        self.model = WhisperModel(
-            config.WHISPER_MODEL_SIZE,
-            device=config.WHISPER_DEVICE,
-            compute_type=config.WHISPER_COMPUTE_TYPE
+        self.vad = VoiceActivityDetector(
+            chunk_size=capture.chunk_size if capture else config.CHUNK_SIZE
         )
         
-        self.logger.info(f"Faster Whisper model loaded: {config.WHISPER_MODEL_SIZE}")
+        # ✅ Reusable float32 buffer sized for the longest capture (grown if ever exceeded)
+        self._audio_buffer = np.empty(int(config.VAD_MAX_DURATION * config.SAMPLE_RATE), dtype=np.float32)
     
-    def record_audio(self, duration=10):
+    def record_audio(self, duration=10, start_index=None):
         """
         ✅ SIMPLE RECORDING: Just record for fixed duration
         Whisper will handle silence filtering internally
         
         Args:
             duration: Recording duration in seconds (10 = good balance)
+            start_index: Shared capture chunk index to start from - None = live
         """
+        if self.capture:
+            return self._finish_recording(self._read_capture(duration, start_index))
+        
         CHUNK = config.CHUNK_SIZE  # Usually 1024
         FORMAT = pyaudio.paInt16
         CHANNELS = 1
@@ -64,33 +224,127 @@ class SpeechToText:
         stream.close()
         p.terminate()
         
-        # Save to temporary file
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
-        wf = wave.open(temp_file.name, 'wb')
-        wf.setnchannels(CHANNELS)
-        wf.setsampwidth(p.get_sample_size(FORMAT))
-        wf.setframerate(RATE)
-        wf.writeframes(b''.join(frames))
-        wf.close()
+        self.logger.info(f"✓ Recording captured ({len(frames) * CHUNK / RATE:.1f} seconds)")
+        return self._finish_recording(frames)
+    
+    def _read_capture(self, duration, start_index=None):
+        """Fixed window from the shared capture (ends early if the capture stops)"""
+        self.logger.info(f"🎤 Recording (speak clearly, you have {duration} seconds)...")
+        frames = []
+        samples = 0
+        subscription = self.capture.subscribe(start_index)
+        try:
+            while samples < duration * config.SAMPLE_RATE:
+                chunk = subscription.read()
+                if not chunk:
+                    break
+                frames.append(chunk)
+                samples += len(chunk) // 2  # int16 mono
+        finally:
+            subscription.close()
+        self.logger.info(f"✓ Recording captured ({samples / config.SAMPLE_RATE:.1f} seconds)")
+        return frames
+    
+    def record_until_silence(self, read_chunk=None, start_index=None):
+        """
+        ✅ STREAMING RECORDING: Stop as soon as trailing silence follows speech
+        
+        Args:
+            read_chunk: Optional chunk source (callable returning bytes) - defaults
+                        to the shared capture, else a fresh PyAudio microphone stream
+            start_index: Shared capture chunk index to start from (e.g. the wake
+                         word frame) - None = live
         
-        self.logger.info(f"✓ Recording saved ({len(frames) * CHUNK / RATE:.1f} seconds)")
-        return temp_file.name
+        Returns:
+            (audio, stats) - audio as from _finish_recording, stats as returned
+            by VoiceActivityDetector.capture
+        """
+        frames, stats = self._capture_frames(read_chunk, start_index)
+        return self._finish_recording(frames), stats
     
-    def transcribe_audio(self, audio_path):
-        """Transcribe audio file to text"""
+    def _capture_frames(self, read_chunk=None, start_index=None, on_frame=None):
+        """Run VAD capture on the chosen chunk source; returns (frames, stats)"""
+        if read_chunk is not None:
+            return self.vad.capture(read_chunk, on_frame=on_frame)
+        
+        self.logger.info(f"🎤 Recording (stops after {config.VAD_SILENCE_TIMEOUT}s of silence)...")
+        
+        if self.capture:
+            subscription = self.capture.subscribe(start_index)
+            try:
+                return self.vad.capture(subscription.read, on_frame=on_frame)
+            finally:
+                subscription.close()
+        
+        p = pyaudio.PyAudio()
+        stream = p.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=config.SAMPLE_RATE,
+            input=True,
+            frames_per_buffer=config.CHUNK_SIZE
+        )
+        
         try:
-            # ✅ Simple transcription with quality settings
-            segments, info = self.model.transcribe(
-                audio_path,
-                language="en",
-                beam_size=5,
-                best_of=5,
-                temperature=0.0,
-                condition_on_previous_text=False
+            return self.vad.capture(
+                lambda: stream.read(config.CHUNK_SIZE, exception_on_overflow=False),
+                on_frame=on_frame
             )
-            
-            # Collect all segments
-            text = " ".join([segment.text for segment in segments]).strip()
+        except Exception as e:
+            self.logger.error(f"Recording error: {e}")
+            return [], {'speech_detected': False, 'duration': 0.0, 'speech_end_time': None}
+        finally:
+            stream.stop_stream()
+            stream.close()
+            p.terminate()
+    
+    def _finish_recording(self, frames):
+        """In-memory float32 audio, or a WAV dump path when STT_DEBUG_SAVE_AUDIO is set"""
+        if config.STT_DEBUG_SAVE_AUDIO:
+            return self.save_wav(frames, config.STT_DEBUG_AUDIO_DIR)
+        return self.frames_to_audio(frames)
+    
+    def frames_to_audio(self, frames):
+        """
+        Convert int16 PCM chunks to float32 [-1, 1] samples for Whisper
+        
+        Returns a view into the reused buffer - valid until the next recording.
+        """
+        total = sum(len(frame) for frame in frames) // 2
+        if total > self._audio_buffer.size:
+            self._audio_buffer = np.empty(total, dtype=np.float32)
+        
+        offset = 0
+        for frame in frames:
+            pcm = np.frombuffer(frame, dtype=np.int16)
+            np.multiply(pcm, 1.0 / 32768.0, out=self._audio_buffer[offset:offset + pcm.size], casting='unsafe')
+            offset += pcm.size
+        
+        return self._audio_buffer[:total]
+    
+    def save_wav(self, frames, directory):
+        """Dump 16-bit mono PCM frames to a timestamped WAV file (debug triage)"""
+        os.makedirs(directory, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        path = os.path.join(directory, f"command_{timestamp}.wav")
+        wf = wave.open(path, 'wb')
+        wf.setnchannels(1)
+        wf.setsampwidth(2)  # paInt16
+        wf.setframerate(config.SAMPLE_RATE)
+        wf.writeframes(b''.join(frames))
+        wf.close()
+        self.logger.info(f"Recording dumped: {path}")
+        return path
+    
+    def transcribe_audio(self, audio):
+        """
+        Transcribe audio to text
+        
+        Args:
+            audio: float32 NumPy samples at SAMPLE_RATE, or a WAV path (debug dumps)
+        """
+        try:
+            text = self._transcribe_tiered(audio)
             
             # ✅ If empty or too short, return empty (not hallucination)
             if not text or len(text) < 2:
@@ -99,17 +353,183 @@ class SpeechToText:
             
             self.logger.info(f"Transcription: {text}")
             return text
-            
+        
         except Exception as e:
             self.logger.error(f"Transcription error: {e}")
             return ""
+    
+    def _preload(self, tier):
+        try:
+            self._get_model(tier)
+        except Exception as e:
+            self.logger.error(f"Preloading the {tier} tier failed: {e}")
+    
+    def _get_model(self, tier):
+        """Load a tier's Whisper model on first use"""
+        model = self.models.get(tier)
+        if model is not None:
+            return model  # ✅ Loaded tiers never wait behind a background load
+        with self.model_lock:
+            if tier not in self.models:
+                from faster_whisper import WhisperModel  # Heavy import - deferred to first model load
+                model_size = self.tiers[tier]["model_size"]
+                start = time.perf_counter()
+                self.models[tier] = WhisperModel(
+                    model_size,
+                    device=config.WHISPER_DEVICE,
+                    compute_type=config.WHISPER_COMPUTE_TYPE
+                )
+                self.logger.info(f"Faster Whisper model loaded: {model_size} ({tier} tier, {time.perf_counter() - start:.1f}s)")
+            return self.models[tier]
+    
+    def _decode(self, audio, tier, greedy=False):
+        """
+        Run one tier's Whisper model and join all segment texts
+        
+        Returns:
+            (text, avg_logprob) - avg_logprob is the duration-weighted segment
+            average (None when there are no segments)
+        """
+        options = self.tiers[tier]
+        model = self._get_model(tier)
+        
+        start = time.perf_counter()
+        with tracer.span("whisper.decode", tier=tier, greedy=greedy):
+            segments, info = model.transcribe(
+                audio,
+                language="en",
+                beam_size=1 if greedy else options["beam_size"],
+                best_of=1 if greedy else options["best_of"],
+                temperature=0.0,
+                condition_on_previous_text=False
+            )
+            segments = list(segments)  # Decoding happens lazily while iterating
+        elapsed = time.perf_counter() - start
+        
+        with self.stats_lock:
+            stats = self.tier_stats[tier]
+            stats['calls'] += 1
+            stats['decode_seconds'] += elapsed
+            stats['audio_seconds'] += info.duration
+        
+        text = " ".join([segment.text for segment in segments]).strip()
         
+        weight = sum(segment.end - segment.start for segment in segments)
+        if not segments:
+            confidence = None
+        elif weight > 0:
+            confidence = sum(segment.avg_logprob * (segment.end - segment.start) for segment in segments) / weight
+        else:
+            confidence = sum(segment.avg_logprob for segment in segments) / len(segments)
+        
+        return text, confidence
+    
+    def _transcribe_tiered(self, audio):
+        """Fast tier for short commands, accurate tier for long or low-confidence ones"""
+        if self.primary_tier == "accurate":
+            return self._decode(audio, "accurate")[0]
+        
+        duration = audio.size / config.SAMPLE_RATE if isinstance(audio, np.ndarray) else None
+        if duration is not None and duration > config.WHISPER_FAST_MAX_SECONDS:
+            self.logger.info(f"Long command ({duration:.1f}s) → accurate tier")
+            return self._decode(audio, "accurate")[0]
+        
+        text, confidence = self._decode(audio, "fast")
+        if not text:
+            return text  # silence - the accurate tier would not find words either
+        if confidence is not None and confidence >= config.WHISPER_FALLBACK_LOGPROB:
+            return text
+        
+        self.logger.info(f"Low confidence ({'-' if confidence is None else f'{confidence:.2f}'}) → accurate tier")
+        with self.stats_lock:
+            self.tier_stats["fast"]['fallbacks'] += 1
+        return self._decode(audio, "accurate")[0]
+    
+    def _decode_window(self, audio, final):
+        """Decode callback for StreamingTranscriber - greedy fast tier for partials, tier policy for the final"""
+        if final:
+            return self._transcribe_tiered(audio)
+        return self._decode(audio, self.primary_tier, greedy=True)[0]
+    
+    def get_tier_stats(self):
+        """
+        Per-tier decode statistics
+        
+        Returns:
+            {tier: {'calls', 'fallbacks', 'decode_seconds', 'audio_seconds', 'rtf'}} -
+            rtf (real-time factor) = decode time / audio time, lower is faster
+        """
+        report = {}
+        with self.stats_lock:
+            snapshot = {tier: dict(stats) for tier, stats in self.tier_stats.items()}
+        for tier, stats in snapshot.items():
+            report[tier] = stats
+            report[tier]['rtf'] = stats['decode_seconds'] / stats['audio_seconds'] if stats['audio_seconds'] else None
+        return report
+    
+    def log_tier_stats(self):
+        for tier, stats in self.get_tier_stats().items():
+            if stats['calls']:
+                self.logger.info(
+                    f"Whisper {tier} tier ({self.tiers[tier]['model_size']}): {stats['calls']} decodes, "
+                    f"RTF {stats['rtf']:.2f}, {stats['fallbacks']} fallbacks"
+                )
+    
+    def listen_streaming(self, on_partial=None, start_index=None, read_chunk=None):
+        """
+        Record and transcribe incrementally while the user is still speaking
+        
+        Args:
+            on_partial: Callback invoked with each partial hypothesis (background thread)
+            start_index: Shared capture chunk index to start recording from
+            read_chunk: Optional chunk source (replay / benchmarks)
+        
+        Returns:
+            (text, stats) - stats holds 'time_to_first_partial', 'time_to_final'
+            (seconds, None if not reached) and 'partials'
+        """
+        transcriber = StreamingTranscriber(self._decode_window, on_partial=on_partial)
+        transcriber.start()
+        try:
+            frames, capture_stats = self._capture_frames(read_chunk, start_index, on_frame=transcriber.feed)
+            
+            if config.STT_DEBUG_SAVE_AUDIO and frames:
+                self.save_wav(frames, config.STT_DEBUG_AUDIO_DIR)
+            
+            try:
+                text = transcriber.finish() if capture_stats['speech_detected'] else ""
+            except Exception as e:
+                self.logger.error(f"Transcription error: {e}")
+                text = ""
         finally:
-            # Clean up temp file
-            if os.path.exists(audio_path):
-                os.remove(audio_path)
-    
-    def listen(self):
-        """Record and transcribe (main compatibility)"""
-        audio_path = self.record_audio(duration=10)  # ✅ Fixed 10 seconds
-        return self.transcribe_audio(audio_path)
+            # ✅ No speech or a capture error never reaches finish() - stop the partial thread anyway
+            transcriber.stop()
+        
+        stats = transcriber.stats(capture_stats['speech_end_time'])
+        if not text or len(text) < 2:
+            self.logger.info("📴 No speech detected")
+            return "", stats
+        
+        first_partial = stats['time_to_first_partial']
+        self.logger.info(
+            f"Transcription: {text} (partials: {len(stats['partials'])}, "
+            f"first partial: {'-' if first_partial is None else f'{first_partial:.2f}s'}, "
+            f"final: {stats['time_to_final']:.2f}s after end of speech)"
+        )
+        return text, stats
+    
+    def listen(self, start_index=None):
+        """
+        Record and transcribe (main compatibility)
+        
+        Args:
+            start_index: Shared capture chunk index to start recording from
+        """
+        if config.STT_CAPTURE_MODE == "vad":
+            # Shared capture when main passed one, else a local microphone stream
+            audio, stats = self.record_until_silence(start_index=start_index)
+            if not stats['speech_detected']:
+                return ""
+        else:
+            audio = self.record_audio(duration=10, start_index=start_index)  # Legacy fixed window
+        return self.transcribe_audio(audio)
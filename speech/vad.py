@@ -0,0 +1,131 @@
+"""
+Voice Activity Detection for streaming command capture
+Lightweight energy-based detector - stops recording on trailing silence
+"""
+import time
+import logging
+from collections import deque
+import numpy as np
+import config
+
+logger = logging.getLogger("VoiceActivityDetector")
+
+
+class VoiceActivityDetector:
+    """Energy-based VAD that segments one spoken command from a chunk stream"""
+
+    def __init__(self,
+                 sample_rate=config.SAMPLE_RATE,
+                 chunk_size=config.CHUNK_SIZE,
+                 energy_threshold=config.VAD_ENERGY_THRESHOLD,
+                 silence_timeout=config.VAD_SILENCE_TIMEOUT,
+                 pre_roll=config.VAD_PRE_ROLL,
+                 max_duration=config.VAD_MAX_DURATION):
+        """
+        Args:
+            sample_rate: Audio sample rate (Hz)
+            chunk_size: Samples per chunk read from the stream
+            energy_threshold: Minimum int16 RMS treated as speech
+            silence_timeout: Seconds of trailing silence that end the command
+            pre_roll: Seconds of audio kept from before speech onset
+            max_duration: Hard cap on one capture (seconds)
+        """
+        self.sample_rate = sample_rate
+        self.chunk_size = chunk_size
+        self.energy_threshold = energy_threshold
+
+        chunk_seconds = chunk_size / sample_rate
+        self.silence_chunks = max(1, int(round(silence_timeout / chunk_seconds)))
+        self.pre_roll_chunks = max(0, int(round(pre_roll / chunk_seconds)))
+        self.max_chunks = max(1, int(round(max_duration / chunk_seconds)))
+
+        self.noise_floor = None
+
+    def frame_energy(self, chunk):
+        """RMS energy of one int16 PCM chunk"""
+        samples = np.frombuffer(chunk, dtype=np.int16)
+        if samples.size == 0:
+            return 0.0
+        return float(np.sqrt(np.mean(samples.astype(np.float32) ** 2)))
+
+    def is_speech(self, chunk):
+        """Classify a chunk as speech; tracks the ambient noise floor on silence"""
+        energy = self.frame_energy(chunk)
+
+        # ✅ Adaptive: speech must clear both the fixed floor and 3x ambient noise
+        threshold = self.energy_threshold
+        if self.noise_floor is not None:
+            threshold = max(threshold, self.noise_floor * 3.0)
+
+        speech = energy > threshold
+        if not speech:
+            if self.noise_floor is None:
+                self.noise_floor = energy
+            else:
+                self.noise_floor = 0.95 * self.noise_floor + 0.05 * energy
+
+        return speech
+
+    def capture(self, read_chunk, on_frame=None):
+        """
+        Read chunks until speech is followed by trailing silence
+
+        Args:
+            read_chunk: Callable returning the next PCM chunk (bytes), or b'' at end of input
+            on_frame: Optional callback invoked with each captured chunk as it arrives
+                      (pre-roll is flushed through it at speech onset)
+
+        Returns:
+            (frames, stats) - frames is the list of captured chunks, stats holds
+            'speech_detected', 'duration' and 'speech_end_time' (perf_counter when
+            the last voiced chunk was read, None if no speech)
+        """
+        pre_roll = deque(maxlen=self.pre_roll_chunks or None)
+        frames = []
+        speech_started = False
+        silent_run = 0
+        speech_end_time = None
+
+        for _ in range(self.max_chunks):
+            chunk = read_chunk()
+            if not chunk:
+                break
+
+            speech = self.is_speech(chunk)
+
+            if not speech_started:
+                if speech:
+                    speech_started = True
+                    frames.extend(pre_roll)
+                    frames.append(chunk)
+                    speech_end_time = time.perf_counter()
+                    if on_frame:
+                        for frame in frames:
+                            on_frame(frame)
+                elif self.pre_roll_chunks:
+                    pre_roll.append(chunk)
+                continue
+
+            frames.append(chunk)
+            if on_frame:
+                on_frame(chunk)
+            if speech:
+                silent_run = 0
+                speech_end_time = time.perf_counter()
+            else:
+                silent_run += 1
+                if silent_run >= self.silence_chunks:
+                    break
+
+        stats = {
+            'speech_detected': speech_started,
+            'duration': len(frames) * self.chunk_size / self.sample_rate,
+            'speech_end_time': speech_end_time
+        }
+
+        if speech_started:
+            logger.info(f"✓ End of speech detected ({stats['duration']:.1f} seconds captured)")
+        else:
+            logger.info("📴 No speech before capture limit")
+
+        return frames, stats
@@ -7,15 +7,26 @@ import pvporcupine
 import pyaudio
 import struct
 import config
+from speech.audio_capture import CaptureEnded
 
 logger = logging.getLogger("WakeWordDetector")
 
 class WakeWordDetector:
     """Porcupine-based wake word detector"""
     
-    def __init__(self, wake_word="jarvis"):
-        """Initialize Porcupine"""
+    def __init__(self, wake_word="jarvis", capture=None):
+        """
+        Initialize Porcupine
+        
+        Args:
+            wake_word: Porcupine built-in keyword
+            capture: Optional shared AudioCaptureService - if given, no stream of our own is opened
+        """
         self.wake_word = wake_word.lower()
+        self.capture = capture
+        self.subscription = None
+        self.pending = b''
+        self.detection_index = None  # Capture chunk index just after the last wake word
         
         try:
             # Initialize Porcupine with API key
@@ -25,7 +36,7 @@ class WakeWordDetector:
                 keywords=[wake_word]
             )
             
-            self.pa = pyaudio.PyAudio()
+            self.pa = None if capture else pyaudio.PyAudio()
             self.audio_stream = None
             
             logger.info(f"✓ Porcupine initialized (keyword: '{wake_word}')")
@@ -39,14 +50,19 @@ class WakeWordDetector:
     def start(self):
         """Start Porcupine listening"""
         try:
-            logger.info("Opening audio stream...")
-            self.audio_stream = self.pa.open(
-                rate=self.porcupine.sample_rate,
-                channels=1,
-                format=pyaudio.paInt16,
-                input=True,
-                frames_per_buffer=self.porcupine.frame_length
-            )
+            if self.capture:
+                logger.info("Subscribing to shared audio capture...")
+                self.capture.start()
+                self.subscription = self.capture.subscribe()
+            else:
+                logger.info("Opening audio stream...")
+                self.audio_stream = self.pa.open(
+                    rate=self.porcupine.sample_rate,
+                    channels=1,
+                    format=pyaudio.paInt16,
+                    input=True,
+                    frames_per_buffer=self.porcupine.frame_length
+                )
             logger.info("🎤 Porcupine listening for wake word...")
             logger.info(f"✓ Audio stream started (say '{self.wake_word.upper()}' clearly)")
             
@@ -54,17 +70,45 @@ class WakeWordDetector:
             logger.critical(f"❌ Failed to start audio: {e}")
             raise RuntimeError(f"Audio stream failed: {e}")
     
+    def resume(self):
+        """Skip audio buffered while a session was active (shared capture only)"""
+        if self.subscription:
+            self.subscription.seek_live()
+            self.pending = b''
+    
+    def _read_frame(self):
+        """Read exactly one Porcupine frame of PCM bytes"""
+        frame_bytes = self.porcupine.frame_length * 2
+        
+        if not self.subscription:
+            return self.audio_stream.read(
+                self.porcupine.frame_length,
+                exception_on_overflow=False
+            )
+        
+        # Shared capture chunks may not match the Porcupine frame length
+        while len(self.pending) < frame_bytes:
+            chunk = self.subscription.read()
+            if not chunk:
+                raise CaptureEnded("Audio capture ended")
+            self.pending += chunk
+        
+        pcm, self.pending = self.pending[:frame_bytes], self.pending[frame_bytes:]
+        return pcm
+    
     def listen(self):
-        """Listen for wake word using Porcupine"""
-        if not self.audio_stream:
+        """
+        Listen for wake word using Porcupine
+        
+        Raises:
+            CaptureEnded: the shared capture stopped (the caller should shut down, not poll again)
+        """
+        if not self.audio_stream and not self.subscription:
             raise RuntimeError("Audio stream not started")
         
         try:
             # Read audio data
-            pcm = self.audio_stream.read(
-                self.porcupine.frame_length, 
-                exception_on_overflow=False
-            )
+            pcm = self._read_frame()
             
             # Unpack to PCM
             pcm = struct.unpack_from("h" * self.porcupine.frame_length, pcm)
@@ -73,11 +117,15 @@ class WakeWordDetector:
             keyword_index = self.porcupine.process(pcm)
             
             if keyword_index >= 0:
+                if self.subscription:
+                    self.detection_index = self.subscription.cursor
                 logger.info(f"🎯 WAKE WORD '{self.wake_word.upper()}' DETECTED!")
                 return True
             
             return False
                 
+        except CaptureEnded:
+            raise
         except Exception as e:
             logger.error(f"Listen error: {e}")
             return False
@@ -88,6 +136,10 @@ class WakeWordDetector:
             self.audio_stream.stop_stream()
             self.audio_stream.close()
         
+        if self.subscription:
+            self.subscription.close()
+            self.capture.stop()
+        
         if self.porcupine:
             self.porcupine.delete()
         
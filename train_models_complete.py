@@ -3,15 +3,13 @@ MASSIVE Model Training - 500+ Examples
 v2: Added ALL previous data + 400+ new IN-APP and WEB commands
 Focused on Spotify, WhatsApp, Calculator, Chrome, Gmail, etc
 """
-import pickle
 import json
-from pathlib import Path
+from models.artifact_store import ArtifactStore
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.naive_bayes import MultinomialNB
 from sklearn.pipeline import Pipeline
 import logging
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("ModelTrainer_V2")
 
 # ============================================================================
@@ -386,6 +384,7 @@ MODEL2_TRAINING_DATA = {
         {"action_type": "PRESS_KEY", "parameters": {"key": "win"}},
         {"action_type": "WAIT", "parameters": {"duration": 0.5}},
         {"action_type": "TYPE_TEXT", "parameters": {"text": "{app_name}"}},
+        {"action_type": "WAIT", "parameters": {"duration": 0.5, "until": "sleep"}},  # search results
         {"action_type": "PRESS_KEY", "parameters": {"key": "enter"}},
         {"action_type": "WAIT", "parameters": {"duration": 2}},
     ],
@@ -422,6 +421,13 @@ MODEL2_TRAINING_DATA = {
     ],
 }
 
+def create_model1_pipeline():
+    """Untrained Model 1 pipeline (TF-IDF + MultinomialNB)"""
+    return Pipeline([
+        ('tfidf', TfidfVectorizer(lowercase=True, stop_words='english', max_features=500)),
+        ('clf', MultinomialNB())
+    ])
+
 def train_model1():
     """Train Model 1: Command Classifier"""
     print("\n" + "="*80)
@@ -442,10 +448,7 @@ def train_model1():
         print(f"      {label}: {count} examples")
     
     print(f"\n🔄 Creating pipeline...")
-    pipeline = Pipeline([
-        ('tfidf', TfidfVectorizer(lowercase=True, stop_words='english', max_features=500)),
-        ('clf', MultinomialNB())
-    ])
+    pipeline = create_model1_pipeline()
     
     print(f"📚 Training...")
     pipeline.fit(texts, labels)
@@ -463,14 +466,9 @@ def train_model1():
         conf = max(pipeline.predict_proba([cmd])[0])
         print(f"   '{cmd}' → {pred} ({conf*100:.0f}%)")
     
-    weights_dir = Path("models/model_weights")
-    weights_dir.mkdir(parents=True, exist_ok=True)
-    model_path = weights_dir / "command_classifier.pkl"
+    version = ArtifactStore().save('command_classifier', pipeline, metadata={'examples': len(texts)})
     
-    with open(model_path, 'wb') as f:
-        pickle.dump(pipeline, f)
-    
-    print(f"\n✅ Model 1 saved ({len(texts)} examples trained)")
+    print(f"\n✅ Model 1 saved as command_classifier v{version} ({len(texts)} examples trained)")
     return pipeline
 
 def train_model2():
@@ -487,18 +485,14 @@ def train_model2():
     for category, steps in sorted(MODEL2_TRAINING_DATA.items()):
         print(f"      {category}: {len(steps)} steps")
     
-    weights_dir = Path("models/model_weights")
-    weights_dir.mkdir(parents=True, exist_ok=True)
-    model_path = weights_dir / "step_model.pkl"
-    
     print(f"\n💾 Saving...")
-    with open(model_path, 'wb') as f:
-        pickle.dump(MODEL2_TRAINING_DATA, f)
+    version = ArtifactStore().save('step_rules', MODEL2_TRAINING_DATA)
     
-    print(f"\n✅ Model 2 saved")
+    print(f"\n✅ Model 2 saved as step_rules v{version}")
 
 def main():
     """Train both models"""
+    logging.basicConfig(level=logging.INFO)
     print("\n\n" + "█"*80)
     print("█ EVA MODEL TRAINING v2 - MASSIVE DATASET")
     print("█ 500+ Examples - IN-APP + WEB FOCUSED")
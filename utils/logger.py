@@ -13,6 +13,7 @@ def setup_logger(name: str) -> logging.Logger:
     
     # Convert string to Path object
     log_dir = Path(config.LOG_DIR)
+    log_dir.mkdir(parents=True, exist_ok=True)
     log_file = log_dir / f"{name}.log"
     
     # File handler with UTF-8 encoding
@@ -0,0 +1,133 @@
+"""
+Startup orchestration
+Brings up the wake word path first and loads heavy components in the background
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import config
+from utils.logger import setup_logger
+
+
+class LazyComponent:
+    """Proxy for a component still loading in the background - first use waits for it"""
+    
+    def __init__(self, name, future, orchestrator):
+        object.__setattr__(self, '_name', name)
+        object.__setattr__(self, '_future', future)
+        object.__setattr__(self, '_orchestrator', orchestrator)
+    
+    def resolve(self):
+        """Block until the component is ready and return it (re-raises load errors)"""
+        future = object.__getattribute__(self, '_future')
+        if not future.done():
+            name = object.__getattribute__(self, '_name')
+            orchestrator = object.__getattribute__(self, '_orchestrator')
+            orchestrator.logger.info(f"⏳ Waiting for {name} to finish loading...")
+            start = time.perf_counter()
+            future.result()
+            orchestrator.logger.info(f"✓ {name} ready after {time.perf_counter() - start:.2f}s wait")
+        return future.result()
+    
+    def is_ready(self):
+        return object.__getattribute__(self, '_future').done()
+    
+    def __getattr__(self, item):
+        return getattr(self.resolve(), item)
+    
+    def __setattr__(self, key, value):
+        setattr(self.resolve(), key, value)
+
+
+class StartupOrchestrator:
+    """Runs component factories concurrently and records a startup timeline"""
+    
+    def __init__(self, background=config.STARTUP_BACKGROUND_LOADING, max_workers=config.STARTUP_WORKERS):
+        """
+        Args:
+            background: False = build every component inline (serial startup)
+            max_workers: Loader threads for background components
+        """
+        self.logger = setup_logger('Startup')
+        self.background = background
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="Startup") if background else None
+        
+        self.t0 = time.perf_counter()
+        self.timeline = {}  # name -> {'start': s, 'end': s, 'error': str | None}
+        self.listening_at = None
+        self.pending = 0
+        self.lock = threading.Lock()
+        self.reported = False
+    
+    def _build(self, name, factory):
+        with self.lock:
+            self.timeline[name] = {'start': time.perf_counter() - self.t0, 'end': None, 'error': None}
+        try:
+            component = factory()
+        except Exception as e:
+            self.timeline[name]['end'] = time.perf_counter() - self.t0
+            self.timeline[name]['error'] = str(e)
+            self.logger.error(f"❌ {name} failed to load: {e}")
+            raise
+        
+        self.timeline[name]['end'] = time.perf_counter() - self.t0
+        self.logger.info(f"✓ {name} ready at +{self.timeline[name]['end']:.2f}s")
+        return component
+    
+    def load_now(self, name, factory):
+        """Build a critical-path component inline"""
+        return self._build(name, factory)
+    
+    def load_background(self, name, factory):
+        """
+        Start building a component in the background
+        
+        Returns:
+            LazyComponent proxy (or the component itself when background loading is off)
+        """
+        if not self.background:
+            return self._build(name, factory)
+        
+        with self.lock:
+            self.pending += 1
+        future = self.pool.submit(self._build, name, factory)
+        future.add_done_callback(self._on_done)
+        return LazyComponent(name, future, self)
+    
+    def _on_done(self, future):
+        with self.lock:
+            self.pending -= 1
+            report = self.pending == 0 and self.listening_at is not None and not self.reported
+            if report:
+                self.reported = True
+        if report:
+            self.log_timeline()
+    
+    def mark_listening(self):
+        """Record time-to-listening (wake word stream open)"""
+        with self.lock:
+            self.listening_at = time.perf_counter() - self.t0
+            report = self.pending == 0 and not self.reported
+            if report:
+                self.reported = True
+        self.logger.info(f"🎤 Time to listening: {self.listening_at:.2f}s")
+        if report:
+            self.log_timeline()
+    
+    def log_timeline(self):
+        """Log per-component load windows, time-to-listening and time-to-fully-warm"""
+        self.logger.info("📊 Startup timeline:")
+        for name, entry in sorted(self.timeline.items(), key=lambda item: item[1]['start']):
+            end = entry['end'] if entry['end'] is not None else float('nan')
+            status = f" FAILED ({entry['error']})" if entry['error'] else ""
+            self.logger.info(f"   {name:<20} +{entry['start']:.2f}s → +{end:.2f}s ({end - entry['start']:.2f}s){status}")
+        
+        ends = [entry['end'] for entry in self.timeline.values() if entry['end'] is not None]
+        if self.listening_at is not None:
+            self.logger.info(f"   Time to listening:  {self.listening_at:.2f}s")
+        if ends:
+            self.logger.info(f"   Time to fully warm: {max(ends):.2f}s")
+    
+    def shutdown(self):
+        if self.pool:
+            self.pool.shutdown(wait=False)
@@ -0,0 +1,176 @@
+"""
+Per-stage latency tracing for the command pipeline
+Spans per stage (with nesting) grouped by command ID; export as JSON lines or Chrome trace
+"""
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+import config
+
+
+class _NullSpan:
+    """Shared no-op span used while tracing is disabled"""
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        return False
+    
+    def set(self, **attrs):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """One timed stage; nests under the span open on the same thread"""
+    
+    def __init__(self, tracer, name, attrs):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+        self.start = None
+        self.parent = None
+    
+    def set(self, **attrs):
+        """Attach attributes discovered while the span is open"""
+        self.attrs.update(attrs)
+    
+    def __enter__(self):
+        stack = self.tracer._stack()
+        self.parent = stack[-1].name if stack else None
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        self.tracer._stack().pop()
+        if exc_type is not None:
+            self.attrs['error'] = str(exc)
+        self.tracer._record({
+            'command_id': self.tracer.current_command(),
+            'name': self.name,
+            'parent': self.parent,
+            'start': self.start - self.tracer.epoch,
+            'duration': end - self.start,
+            'thread': threading.current_thread().name,
+            'attrs': self.attrs
+        })
+        return False
+
+
+class Tracer:
+    """Collects spans in memory (bounded) while enabled; near-zero cost when disabled"""
+    
+    def __init__(self, enabled=config.TRACING_ENABLED, max_spans=config.TRACE_MAX_SPANS):
+        self.enabled = enabled
+        self.spans = deque(maxlen=max_spans)
+        self.epoch = time.perf_counter()
+        self.wall_epoch = time.time()
+        self.local = threading.local()
+        self.ids = itertools.count(1)
+    
+    def _stack(self):
+        stack = getattr(self.local, 'stack', None)
+        if stack is None:
+            stack = self.local.stack = []
+        return stack
+    
+    def _record(self, span):
+        self.spans.append(span)  # deque.append is thread-safe
+    
+    def span(self, name, **attrs):
+        """Context manager timing one stage, e.g. `with tracer.span("ollama.generate"):`"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, attrs)
+    
+    def traced(self, name):
+        """Decorator form of span() for whole methods"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _Span(self, name, {}):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+    
+    def current_command(self):
+        return getattr(self.local, 'command_id', None)
+    
+    @contextmanager
+    def command(self, **attrs):
+        """Start a new command ID for this thread; yields the ID (None when disabled)"""
+        if not self.enabled:
+            yield None
+            return
+        command_id = f"cmd-{next(self.ids):05d}"
+        with self.bind(command_id):
+            with self.span("command", **attrs):
+                yield command_id
+    
+    @contextmanager
+    def bind(self, command_id):
+        """Attribute spans on this thread to an existing command (worker threads)"""
+        previous = getattr(self.local, 'command_id', None)
+        self.local.command_id = command_id
+        try:
+            yield
+        finally:
+            self.local.command_id = previous
+    
+    def export_jsonl(self, path):
+        """One JSON object per span"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            for span in list(self.spans):
+                f.write(json.dumps(span, default=str) + "\n")
+        return path
+    
+    def export_chrome_trace(self, path):
+        """Chrome trace event format (open in chrome://tracing or Perfetto)"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        thread_ids = {}
+        events = []
+        for span in list(self.spans):
+            tid = thread_ids.setdefault(span['thread'], len(thread_ids) + 1)
+            events.append({
+                'name': span['name'],
+                'cat': span['command_id'] or 'background',
+                'ph': 'X',
+                'ts': (self.wall_epoch + span['start']) * 1e6,
+                'dur': span['duration'] * 1e6,
+                'pid': os.getpid(),
+                'tid': tid,
+                'args': {'command_id': span['command_id'], 'parent': span['parent'], **span['attrs']}
+            })
+        for name, tid in thread_ids.items():
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': tid, 'args': {'name': name}})
+        
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f, default=str)
+        return path
+    
+    def export(self, directory=config.TRACE_DIR):
+        """Write both formats with a timestamped name; returns the paths (empty when disabled)"""
+        if not self.enabled or not self.spans:
+            return []
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        return [
+            self.export_jsonl(os.path.join(directory, f"trace_{stamp}.jsonl")),
+            self.export_chrome_trace(os.path.join(directory, f"trace_{stamp}.json"))
+        ]
+
+
+# Process-wide tracer - modules import this and wrap stages in tracer.span(...)
+tracer = Tracer()
@@ -4,6 +4,7 @@ OmniParser Executor - STRICT MODE (imports from util/utils.py)
 import logging
 import sys
 from pathlib import Path
+from utils.tracing import tracer
 
 logger = logging.getLogger("OmniParserExecutor")
 
@@ -92,6 +93,7 @@ class OmniParserExecutor:
             logger.critical(f"Error: {e}")
             raise RuntimeError(f"OmniParser MUST work. Error: {e}")
     
+    @tracer.traced("omniparser.parse")
     def parse_screen(self, screenshot_path, user_command):
         """Parse screenshot - MUST work"""
         try:
@@ -111,12 +113,13 @@ class OmniParserExecutor:
             
             # YOLO detection
             logger.info("Running YOLO detection...")
-            results = self.som_model.predict(
-                image,
-                conf=0.15,
-                device=self.device,
-                verbose=False
-            )
+            with tracer.span("omniparser.yolo"):
+                results = self.som_model.predict(
+                    image,
+                    conf=0.15,
+                    device=self.device,
+                    verbose=False
+                )
             
             clickable_count = 0
             for box in results[0].boxes:
@@ -142,7 +145,8 @@ class OmniParserExecutor:
             # OCR detection
             logger.info("Running OCR...")
             img_array = np.array(image)
-            ocr_result = self.ocr_model.ocr(img_array, cls=False)
+            with tracer.span("omniparser.ocr"):
+                ocr_result = self.ocr_model.ocr(img_array, cls=False)
             
             text_count = 0
             if ocr_result and ocr_result[0]:
@@ -5,6 +5,7 @@ import os
 from datetime import datetime
 import config
 from utils.logger import setup_logger
+from utils.tracing import tracer
 
 class ScreenshotHandler:
     """Capture and manage screenshots"""
@@ -13,6 +14,7 @@ class ScreenshotHandler:
         self.logger = setup_logger('ScreenshotHandler')
         self.sct = mss.mss()
         
+    @tracer.traced("screenshot.capture")
     def capture(self, monitor_number=1):
         """Capture screenshot of specified monitor"""
         try: